@@ -1,9 +1,12 @@
-import lancedb
+import pyarrow as pa
 import os
 import logging
-from typing import Generator, Dict, Any
+from datetime import datetime, timezone
+from typing import Generator, Dict, Any, Iterable, List, Optional
 import uuid
 
+from app.utils.connection import LanceDBConnection
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -11,14 +14,260 @@ logger = logging.getLogger(__name__)
 # Database path
 DB_PATH = os.getenv("DB_PATH", "data/lancedb")
 
-# Initialize connection
-db = lancedb.connect(DB_PATH)
+# Seconds before cached table handles pick up writes from other processes
+DB_CONSISTENCY_INTERVAL = float(os.getenv("DB_CONSISTENCY_INTERVAL_SECONDS", "5"))
+
+# Shared connection; every module goes through it so table handles are opened once
+db = LanceDBConnection(DB_PATH, consistency_interval=DB_CONSISTENCY_INTERVAL)
+
+# Timestamps are stored as naive UTC, matching datetime.utcnow()
+TIMESTAMP = pa.timestamp("us")
+
+# Timezone-aware UTC, for expiry columns compared against the current time
+UTC_TIMESTAMP = pa.timestamp("us", tz="UTC")
+
+# Low-cardinality labels (status, file type) are dictionary encoded
+LABEL = pa.dictionary(pa.int8(), pa.string())
+
+PERSONAL_INFO_TYPE = pa.struct([
+    pa.field("first_name", pa.string()),
+    pa.field("last_name", pa.string()),
+    pa.field("email", pa.string()),
+    pa.field("phone", pa.string()),
+    pa.field("address", pa.string()),
+    pa.field("city", pa.string()),
+    pa.field("state", pa.string()),
+    pa.field("zip_code", pa.string()),
+    pa.field("date_of_birth", pa.string()),
+    pa.field("ssn", pa.string()),
+    pa.field("marital_status", pa.string()),
+    pa.field("occupation", pa.string())
+])
+
+VEHICLE_TYPE = pa.struct([
+    pa.field("year", pa.string()),
+    pa.field("make", pa.string()),
+    pa.field("model", pa.string()),
+    pa.field("vin", pa.string()),
+    pa.field("usage", pa.string()),
+    pa.field("miles_driven", pa.string()),
+    pa.field("primary_driver", pa.string()),
+    pa.field("comp_deductible", pa.string()),
+    pa.field("coll_deductible", pa.string()),
+    pa.field("finance_info", pa.string()),
+    pa.field("gap_insurance", pa.bool_())
+])
+
+HOME_DETAILS_TYPE = pa.struct([
+    pa.field("year_built", pa.string()),
+    pa.field("square_footage", pa.string()),
+    pa.field("construction_type", pa.string()),
+    pa.field("roof_type", pa.string()),
+    pa.field("number_of_stories", pa.string()),
+    pa.field("garage_type", pa.string()),
+    pa.field("basement_type", pa.string()),
+    pa.field("security_system", pa.bool_()),
+    pa.field("swimming_pool", pa.bool_())
+])
+
+SPECIALTY_ITEM_TYPE = pa.struct([
+    pa.field("type", pa.string()),
+    pa.field("year", pa.string()),
+    pa.field("make", pa.string()),
+    pa.field("model", pa.string()),
+    pa.field("vin", pa.string()),
+    pa.field("horsepower", pa.string()),
+    pa.field("top_speed", pa.string()),
+    pa.field("market_value", pa.string()),
+    pa.field("storage_location", pa.string()),
+    pa.field("comp_deductible", pa.string()),
+    pa.field("coll_deductible", pa.string())
+])
+
+AUTO_DATA_TYPE = pa.struct([
+    pa.field("current_carrier", pa.string()),
+    pa.field("years_with_carrier", pa.int32()),
+    pa.field("expiration_date", pa.string()),
+    pa.field("current_limits", pa.string()),
+    pa.field("quoting_limits", pa.string()),
+    pa.field("vehicles_data", pa.list_(VEHICLE_TYPE))
+])
+
+# Quote requests; both submit paths in app/routes/quotes.py write this shape
+QUOTES_SCHEMA = pa.schema([
+    pa.field("id", pa.string()),
+    pa.field("agent_id", pa.string()),
+    pa.field("agent_email", pa.string()),
+    pa.field("client_name", pa.string()),
+    pa.field("client_email", pa.string()),
+    pa.field("client_phone", pa.string()),
+    pa.field("address", pa.string()),
+    pa.field("mailing_address", pa.string()),
+    pa.field("quote_types", pa.list_(pa.string())),
+    pa.field("has_auto", pa.bool_()),
+    pa.field("has_home", pa.bool_()),
+    pa.field("has_specialty", pa.bool_()),
+    pa.field("status", LABEL),
+    pa.field("created_at", TIMESTAMP),
+    pa.field("updated_at", TIMESTAMP),
+    pa.field("personal_info", PERSONAL_INFO_TYPE),
+    pa.field("vehicles", pa.list_(VEHICLE_TYPE)),
+    pa.field("home_details", HOME_DETAILS_TYPE),
+    pa.field("specialty_items", pa.list_(SPECIALTY_ITEM_TYPE)),
+    pa.field("auto_data", AUTO_DATA_TYPE),
+    pa.field("docx_path", pa.string()),
+    pa.field("pdf_path", pa.string()),
+    pa.field("documents", pa.list_(pa.string()))
+])
+
+AGENTS_SCHEMA = pa.schema([
+    pa.field("id", pa.string()),
+    pa.field("email", pa.string()),
+    pa.field("full_name", pa.string()),
+    pa.field("hashed_password", pa.string()),
+    pa.field("is_active", pa.bool_()),
+    pa.field("permissions", pa.list_(pa.string())),
+    pa.field("created_at", TIMESTAMP),
+    pa.field("last_login", TIMESTAMP)
+])
+
+# Manifest of every generated or uploaded file, one row per quote and file
+DOCUMENTS_SCHEMA = pa.schema([
+    pa.field("id", pa.string()),
+    pa.field("quote_id", pa.string()),
+    pa.field("filename", pa.string()),
+    pa.field("path", pa.string()),
+    pa.field("type", LABEL),
+    pa.field("source", LABEL),
+    pa.field("size", pa.int64()),
+    pa.field("sha256", pa.string()),
+    pa.field("created_at", TIMESTAMP)
+])
+
+# Refresh tokens, stored as keyed hashes and rotated on every use
+REFRESH_TOKENS_SCHEMA = pa.schema([
+    pa.field("id", pa.string()),
+    pa.field("token_hash", pa.string()),
+    pa.field("family_id", pa.string()),
+    pa.field("agent_email", pa.string()),
+    pa.field("created_at", UTC_TIMESTAMP),
+    pa.field("expires_at", UTC_TIMESTAMP),
+    pa.field("revoked", pa.bool_()),
+    pa.field("revoked_at", UTC_TIMESTAMP),
+    pa.field("replaced_by", pa.string())
+])
+
+TABLE_SCHEMAS = {
+    "quotes": QUOTES_SCHEMA,
+    "agents": AGENTS_SCHEMA,
+    "documents": DOCUMENTS_SCHEMA,
+    "refresh_tokens": REFRESH_TOKENS_SCHEMA
+}
+
+def coerce_value(value: Any, data_type: pa.DataType) -> Any:
+    """
+    Convert a Python value to what pyarrow expects for a column type.
+
+    ISO strings become datetimes for timestamp columns (and back for legacy
+    string columns), struct values keep only the struct's fields, and lists
+    are coerced item by item.
+    """
+    if value is None:
+        return None
+    if pa.types.is_dictionary(data_type):
+        return coerce_value(value, data_type.value_type)
+    if pa.types.is_timestamp(data_type):
+        if isinstance(value, str):
+            if not value:
+                return None
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if isinstance(value, datetime) and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+    if pa.types.is_string(data_type) and isinstance(value, datetime):
+        return value.isoformat()
+    if pa.types.is_struct(data_type):
+        if not isinstance(value, dict):
+            return None
+        return {field.name: coerce_value(value.get(field.name), field.type) for field in data_type}
+    if pa.types.is_list(data_type):
+        return [coerce_value(item, data_type.value_type) for item in value]
+    if pa.types.is_null(data_type):
+        return None
+    return value
+
+def conform_records(records: Iterable[Dict[str, Any]], schema: pa.Schema) -> pa.Table:
+    """
+    Build an Arrow table with exactly the given schema from record dicts.
+
+    Missing columns are written as nulls and keys outside the schema are
+    dropped, so every write path produces the same shape.
+    """
+    rows = [
+        {field.name: coerce_value(record.get(field.name), field.type) for field in schema}
+        for record in records
+    ]
+    return pa.Table.from_pylist(rows, schema=schema)
+
+def add_records(table, records: List[Dict[str, Any]]) -> None:
+    """Append records to a table, conformed to the table's own schema."""
+    table.add(conform_records(records, table.schema))
+
+def ensure_scalar_indexes(
+    table,
+    table_name: str,
+    columns: Iterable[str],
+    index_types: Optional[Dict[str, str]] = None
+) -> Optional[List[str]]:
+    """
+    Create any missing scalar indexes on a table.
+
+    Indexes are trained on existing rows, so nothing is built while the table
+    is empty; callers try again after their first write.
+
+    Args:
+        table: LanceDB table
+        table_name: Table name, for logging
+        columns: Columns to index; columns missing from the schema are skipped
+        index_types: Index type per column (e.g. BITMAP) where BTREE is not wanted
+
+    Returns:
+        The indexed columns, or None while the table is empty
+    """
+    if not hasattr(table, "create_scalar_index"):
+        logger.warning(f"Installed LanceDB does not support scalar indexes; {table_name} lookups will scan")
+        return []
+    if table.count_rows() == 0:
+        return None
+
+    existing = set()
+    for index in table.list_indices():
+        existing.update(index.columns)
+
+    indexed = []
+    for column in columns:
+        if column not in table.schema.names:
+            continue
+        if column not in existing:
+            try:
+                if index_types and column in index_types:
+                    table.create_scalar_index(column, index_type=index_types[column])
+                else:
+                    table.create_scalar_index(column)
+                logger.info(f"Created scalar index on {table_name}.{column}")
+            except Exception as e:
+                logger.warning(f"Could not index {table_name}.{column}: {str(e)}")
+                continue
+        indexed.append(column)
+    return indexed
 
 def get_table(table_name: str, schema=None):
     """Get or create a table in LanceDB."""
+    schema = schema or TABLE_SCHEMAS.get(table_name)
     try:
         return db[table_name]
-    except KeyError:
+    except (KeyError, ValueError, FileNotFoundError):
+        # Missing tables raise KeyError, ValueError or FileNotFoundError depending on the LanceDB release
         if schema:
             return db.create_table(table_name, schema=schema)
         # Create table without schema (schema will be inferred from data)
@@ -28,17 +277,16 @@ def init_db():
     """Initialize the database and ensure all tables exist."""
     try:
         logger.info("Ensuring LanceDB tables exist")
-        # Ensure core tables exist - schema will be defined when data is added
-        get_table("quotes")
-        get_table("agents")
-        get_table("documents")
+        # Ensure core tables exist with their declared schemas
+        for table_name in TABLE_SCHEMAS:
+            get_table(table_name)
         logger.info("LanceDB setup complete")
     except Exception as e:
         logger.error(f"Error initializing LanceDB: {str(e)}")
         raise
 
 def get_db():
-    """Get database connection."""
+    """Get the shared database connection."""
     # This is a stub to maintain API compatibility
     # with code that expects a SQLAlchemy session
     return db
@@ -5,6 +5,7 @@ from docx2pdf import convert
 import os
 from datetime import datetime
 from pathlib import Path
+from app.utils.placeholders import replace_placeholders
 
 class DocumentGenerator:
     def __init__(self, output_dir="output"):
@@ -19,18 +20,7 @@ class DocumentGenerator:
         return f"{quote_type}_{safe_name}_{timestamp}"
 
     def _replace_placeholders(self, doc, data):
-        for paragraph in doc.paragraphs:
-            for key, value in data.items():
-                if f"{{{{{key}}}}}" in paragraph.text:
-                    paragraph.text = paragraph.text.replace(f"{{{{{key}}}}}", str(value or "N/A"))
-
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    for paragraph in cell.paragraphs:
-                        for key, value in data.items():
-                            if f"{{{{{key}}}}}" in paragraph.text:
-                                paragraph.text = paragraph.text.replace(f"{{{{{key}}}}}", str(value or "N/A"))
+        replace_placeholders(doc, {key: value or "N/A" for key, value in data.items()})
 
     def generate_documents(self, quote_type, data):
         # Create filenames
@@ -1,19 +1,36 @@
 from fastapi import FastAPI, Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from pydantic import BaseModel
 import lancedb
+import asyncio
 import os
 import logging
 import pyarrow as pa
 import json
 from pathlib import Path
 
-from app.database import init_db, get_db, get_table, generate_id
+from app.database import db, init_db, get_db, get_table, generate_id, add_records
+from app.utils.quote_repository import quote_repository, quote_literal
+from app.utils.document_manifest import document_manifest
+from app.utils.agent_cache import agent_cache
+from app.utils.auth import get_agent_by_email_async, invalidate_agent, revoke_agent, decode_token, access_token_claims
+from app.utils.async_db import async_db
+from app.utils.password_hasher import password_hasher
+from app.utils.password_policy import password_policy
+from app.utils.token_cache import token_cache, revocation_list
+from app.utils.refresh_tokens import refresh_tokens, InvalidRefreshToken
+from app.utils.login_activity import login_activity
+from app.utils.quote_writer import quote_writer
+from app.utils.uploads import UploadLimitMiddleware
+from app.utils.loop_monitor import loop_monitor
+from app.utils.document_jobs import document_jobs
+from app.utils.office_converter import warm_converter_pool, shutdown_converter_pool
+from app.utils.render_cache import render_cache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -24,13 +41,14 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 # Models for token handling
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
 
 class TokenData(BaseModel):
     email: Optional[str] = None
@@ -48,12 +66,17 @@ app = FastAPI(
 )
 
 # Configure CORS
+# Refuse oversized multipart bodies before FastAPI spools them
+app.add_middleware(UploadLimitMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000", "https://twincitiescoverage.com"],  # Include your Next.js URL
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Let the frontend read pagination and download headers
+    expose_headers=["X-Next-Cursor", "Content-Range", "Accept-Ranges", "ETag"],
 )
 
 # OAuth2 scheme
@@ -61,10 +84,10 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/token")
 
 # Helper functions
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hasher.context.verify(plain_password, hashed_password)
 
 def get_password_hash(password):
-    return pwd_context.hash(password)
+    return password_hasher.context.hash(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -83,7 +106,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_token(token)
         email: str = payload.get("sub")
         if email is None:
             raise credentials_exception
@@ -91,23 +114,25 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
     except JWTError:
         raise credentials_exception
     
-    # Get user from LanceDB
-    agents_table = get_table("agents")
-    agents = agents_table.search().where(f"email = '{token_data.email}'").to_list()
+    # Get user from the agent cache, falling back to LanceDB
+    agent = await get_agent_by_email_async(token_data.email)
     
-    if not agents:
+    if agent is None or not agent.get("is_active", True):
         raise credentials_exception
     
-    return agents[0]
+    return agent
 
 # Routes
 @app.post("/api/auth/token", response_model=Token)
 async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends()):
     # Find the user in the database
-    agents_table = get_table("agents")
-    agents = agents_table.search().where(f"email = '{form_data.username}'").to_list()
+    agent = await async_db.find_agent(form_data.username)
     
-    if not agents or not verify_password(form_data.password, agents[0]["hashed_password"]):
+    if (
+        not agent
+        or not agent.get("is_active", True)
+        or not await password_hasher.verify(form_data.password, agent["hashed_password"])
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -117,24 +142,53 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
     # Create access token
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": form_data.username}, expires_delta=access_token_expires
+        data=access_token_claims(agent), expires_delta=access_token_expires
     )
     
-    # Update last login time
-    agent = agents[0]
-    agent["last_login"] = datetime.utcnow().isoformat()
-    agents_table.delete(f"email = '{agent['email']}'")
-    agents_table.add([agent])
+    # Rehash credentials made with an outdated scheme or cost
+    if password_hasher.needs_update(agent["hashed_password"]):
+        agent["hashed_password"] = await password_hasher.hash(form_data.password)
+        await async_db.replace_agent(agent)
+        invalidate_agent(agent["email"])
+    
+    # Record last login time; written to the agents table in batches
+    login_activity.record(agent["email"], datetime.utcnow().isoformat())
+    
+    # Start a new refresh token family for this login
+    refresh_token = await async_db.run(refresh_tokens.issue, agent["email"])
     
-    return {"access_token": access_token, "token_type": "bearer"}
+    return {"access_token": access_token, "token_type": "bearer", "refresh_token": refresh_token}
+
+@app.post("/api/auth/refresh", response_model=Token)
+async def refresh_access_token(body: RefreshRequest):
+    """Exchange a refresh token for a new access token and a rotated refresh token."""
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    try:
+        rotated = await async_db.run(refresh_tokens.rotate, body.refresh_token)
+    except InvalidRefreshToken:
+        raise credentials_exception
+    
+    agent = await get_agent_by_email_async(rotated["agent_email"])
+    if agent is None or not agent.get("is_active", True):
+        raise credentials_exception
+    
+    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = create_access_token(
+        data=access_token_claims(agent), expires_delta=access_token_expires
+    )
+    
+    return {"access_token": access_token, "token_type": "bearer", "refresh_token": rotated["refresh_token"]}
 
 @app.post("/api/auth/register")
 async def register_user(user: UserCreate):
     # Check if user already exists
-    agents_table = get_table("agents")
-    existing_agents = agents_table.search().where(f"email = '{user.email}'").to_list()
+    existing_agent = await async_db.find_agent(user.email)
     
-    if existing_agents:
+    if existing_agent:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
@@ -145,22 +199,67 @@ async def register_user(user: UserCreate):
         "id": generate_id(),
         "email": user.email,
         "full_name": user.full_name,
-        "hashed_password": get_password_hash(user.password),
+        "hashed_password": await password_hasher.hash(user.password),
         "is_active": True,
         "permissions": ["basic"],
         "created_at": datetime.utcnow().isoformat(),
         "last_login": None
     }
     
-    agents_table.add([new_agent])
+    await async_db.add_agent(new_agent)
+    invalidate_agent(user.email)
     
     return {"message": "User registered successfully"}
 
+async def require_admin(current_user: dict = Depends(get_current_user)):
+    """Reject agents without the admin permission."""
+    if "admin" not in (current_user.get("permissions") or []):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin permission required"
+        )
+    return current_user
+
+@app.post("/api/agents/{email}/disable")
+async def disable_agent(email: str, current_user: dict = Depends(require_admin)):
+    """Deactivate an agent and revoke its outstanding tokens (admin only)."""
+    agent = await async_db.find_agent(email)
+    if agent is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Agent not found"
+        )
+    
+    agent["is_active"] = False
+    await async_db.replace_agent(agent)
+    revoke_agent(email)
+    await async_db.run(refresh_tokens.revoke_agent, email)
+    
+    return {"message": "Agent disabled"}
+
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint."""
     return {"status": "ok", "database": "lancedb", "version": "1.0.0"}
 
+@app.get("/api/metrics")
+async def metrics(current_user: dict = Depends(require_admin)):
+    """In-process cache and worker metrics (admin only)."""
+    return {
+        "agent_cache": agent_cache.stats(),
+        "document_jobs": document_jobs.stats(),
+        "db_pool": async_db.stats(),
+        "db_tables": db.stats(),
+        "password_hasher": password_hasher.stats(),
+        "password_policy": password_policy.stats(),
+        "token_cache": token_cache.stats(),
+        "revocations": revocation_list.stats(),
+        "login_activity": login_activity.stats(),
+        "quote_writer": quote_writer.stats(),
+        "event_loop_lag": loop_monitor.stats(),
+        "render_cache": render_cache.stats()
+    }
+
 @app.get("/")
 async def root():
     """Root endpoint."""
@@ -181,16 +280,26 @@ app.include_router(quotes.router, prefix="/api/quotes", tags=["quotes"])
 @app.on_event("startup")
 async def startup_event():
     """Initialize database on startup."""
+    loop_monitor.start()
+    login_activity.start()
+    # Start the LibreOffice pool in the background so the first PDF is not a cold start
+    asyncio.get_running_loop().run_in_executor(None, warm_converter_pool)
     try:
+        # Tune password hashing cost for this host
+        password_hasher.context = await run_in_threadpool(password_policy.build_context)
+        
         # Initialize database
         init_db()
+        quote_repository.ensure_indexes()
+        document_manifest.ensure_indexes()
+        refresh_tokens.ensure_indexes()
         
         # Create an admin user if none exists
         agents_table = get_table("agents")
         admin_email = os.getenv("ADMIN_EMAIL", "admin@twincitiescoverage.com")
         admin_password = os.getenv("ADMIN_PASSWORD", "admin")
         
-        existing_admin = agents_table.search().where(f"email = '{admin_email}'").to_list()
+        existing_admin = agents_table.search().where(f"email = {quote_literal(admin_email)}").to_list()
         
         if not existing_admin:
             logger.info(f"Creating admin user: {admin_email}")
@@ -204,10 +313,25 @@ async def startup_event():
                 "created_at": datetime.utcnow().isoformat(),
                 "last_login": None
             }
-            agents_table.add([admin_user])
+            add_records(agents_table, [admin_user])
+        
+        # Tokens of agents disabled before this process started stay revoked
+        for agent in agents_table.search().where("is_active = false").to_list():
+            revoke_agent(agent["email"])
     except Exception as e:
         logger.error(f"Error initializing application: {str(e)}")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush pending writes and let in-flight document jobs finish before the worker exits."""
+    await loop_monitor.stop()
+    await run_in_threadpool(login_activity.stop)
+    await run_in_threadpool(quote_writer.stop)
+    document_jobs.shutdown(wait=True)
+    async_db.shutdown(wait=True)
+    password_hasher.shutdown(wait=True)
+    shutdown_converter_pool()
+
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     """Log all requests."""
@@ -1,24 +1,23 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from datetime import datetime, timedelta
+import os
 from typing import Optional, Dict, Any
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from pydantic import BaseModel
 
 from app.database import get_table, get_db, generate_id
-from app.utils.auth import get_current_agent
+from app.utils.auth import get_current_agent, get_agent_by_email_async, invalidate_agent, decode_token, access_token_claims
+from app.utils.async_db import async_db
+from app.utils.password_hasher import password_hasher
 
 router = APIRouter()
 
 # Security
-SECRET_KEY = "your-secret-key-here"
+SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 # Models
 class Token(BaseModel):
     access_token: str
@@ -37,10 +36,10 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/token")
 
 # Helper functions
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hasher.context.verify(plain_password, hashed_password)
 
 def get_password_hash(password):
-    return pwd_context.hash(password)
+    return password_hasher.context.hash(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -60,7 +59,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> Dict[str, Any
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_token(token)
         email: str = payload.get("sub")
         if email is None:
             raise credentials_exception
@@ -68,40 +67,47 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> Dict[str, Any
     except JWTError:
         raise credentials_exception
     
-    agents_table = get_table("agents")
-    agents = agents_table.search().where(f"email = '{token_data.email}'").to_list()
+    agent = await get_agent_by_email_async(token_data.email)
     
-    if not agents:
+    if agent is None or not agent.get("is_active", True):
         raise credentials_exception
     
-    return agents[0]
+    return agent
 
 # Routes
 @router.post("/token", response_model=Token)
 async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends()):
-    agents_table = get_table("agents")
-    agents = agents_table.search().where(f"email = '{form_data.username}'").to_list()
+    agent = await async_db.find_agent(form_data.username)
     
-    if not agents or not verify_password(form_data.password, agents[0]["hashed_password"]):
+    if (
+        not agent
+        or not agent.get("is_active", True)
+        or not await password_hasher.verify(form_data.password, agent["hashed_password"])
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Rehash credentials made with an outdated scheme or cost
+    if password_hasher.needs_update(agent["hashed_password"]):
+        agent["hashed_password"] = await password_hasher.hash(form_data.password)
+        await async_db.replace_agent(agent)
+        invalidate_agent(agent["email"])
+    
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": form_data.username}, expires_delta=access_token_expires
+        data=access_token_claims(agent), expires_delta=access_token_expires
     )
     
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.post("/register")
 async def register_user(user: UserCreate):
-    agents_table = get_table("agents")
-    existing_agents = agents_table.search().where(f"email = '{user.email}'").to_list()
+    existing_agent = await async_db.find_agent(user.email)
     
-    if existing_agents:
+    if existing_agent:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
@@ -111,13 +117,14 @@ async def register_user(user: UserCreate):
         "id": generate_id(),
         "email": user.email,
         "full_name": user.full_name,
-        "hashed_password": get_password_hash(user.password),
+        "hashed_password": await password_hasher.hash(user.password),
         "is_active": True,
         "permissions": ["basic"],
         "created_at": datetime.utcnow().isoformat(),
         "last_login": None
     }
     
-    agents_table.add([new_agent])
+    await async_db.add_agent(new_agent)
+    invalidate_agent(user.email)
     
     return {"message": "User registered successfully"} 
\ No newline at end of file
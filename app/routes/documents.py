@@ -1,13 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, Response
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, Response, Request
 from typing import List, Dict, Optional
 import os
 from pathlib import Path
+from starlette.concurrency import run_in_threadpool
 from app.utils.document_generator import generate_quote_documents
 from app.utils.pdf_generator import PDFGenerator
 from app.routes.auth import get_current_user
 from app.utils.auth import get_current_agent
-from app.utils.lancedb_utils import get_quote_by_id
+from app.utils.file_streaming import stream_file
+from app.utils.async_db import async_db
 
 router = APIRouter()
 
@@ -18,12 +19,14 @@ async def generate_documents(quote_data: dict, current_user: dict = Depends(get_
         templates_dir = os.getenv("TEMPLATES_DIR", "templates")
         output_dir = os.getenv("OUTPUT_DIR", "output")
         
-        # Generate DOCX documents
-        docx_paths = await generate_quote_documents(
+        # Generate DOCX documents (and their PDFs) per line
+        documents = await run_in_threadpool(
+            generate_quote_documents,
             quote_data=quote_data,
-            templates_dir=templates_dir,
+            template_dir=templates_dir,
             output_dir=output_dir
         )
+        docx_paths = {line: result["docx_path"] for line, result in documents.items() if result.get("docx_path")}
         
         if not docx_paths:
             raise HTTPException(
@@ -31,9 +34,12 @@ async def generate_documents(quote_data: dict, current_user: dict = Depends(get_
                 detail="No documents were generated"
             )
         
-        # Generate PDFs
-        pdf_gen = PDFGenerator(templates_dir, output_dir)
-        pdf_paths = pdf_gen.generate_pdfs_for_quote(quote_data, docx_paths)
+        # Convert the lines whose PDF was not produced during generation
+        pdf_paths = {line: result["pdf_path"] for line, result in documents.items() if result.get("pdf_path")}
+        missing = [path for line, path in docx_paths.items() if line not in pdf_paths]
+        if missing:
+            pdf_gen = PDFGenerator(templates_dir, output_dir)
+            pdf_paths.update(await run_in_threadpool(pdf_gen.generate_pdfs_for_quote, quote_data, missing))
         
         # Generate download URLs
         docx_urls = {k: f"/api/documents/download/{k}/{Path(v).name}" for k, v in docx_paths.items()}
@@ -55,6 +61,7 @@ async def generate_documents(quote_data: dict, current_user: dict = Depends(get_
 async def download_document(
     quote_type: str,
     filename: str,
+    request: Request,
     current_user: dict = Depends(get_current_user)
 ):
     try:
@@ -65,19 +72,23 @@ async def download_document(
         file_path = os.path.join(output_dir, quote_type, filename)
         
         # Check if file exists
-        if not os.path.exists(file_path):
+        if not await async_db.path_exists(file_path):
             raise HTTPException(
                 status_code=404,
                 detail="Document not found"
             )
         
-        # Return file
-        return FileResponse(
+        # Stream file
+        return await async_db.run(
+            stream_file,
+            request,
             file_path,
             media_type="application/octet-stream",
             filename=filename
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -88,35 +99,28 @@ async def download_document(
 async def get_document(
     quote_id: str,
     filename: str,
+    request: Request,
     current_agent=Depends(get_current_agent)
 ):
     """Get a document by quote ID and filename."""
     try:
         # Verify quote exists and belongs to agent
-        quote = get_quote_by_id(quote_id)
+        quote = await async_db.get_quote(quote_id)
         if not quote:
             raise HTTPException(status_code=404, detail="Quote not found")
         if quote["agent_email"] != current_agent["email"]:
             raise HTTPException(status_code=403, detail="Not authorized to access this document")
         
-        # Check if file exists
-        file_path = Path(os.path.join("output", quote_id, filename))
-        if not file_path.exists():
+        # Look the file up in the documents manifest
+        document = await async_db.get_document(quote_id, filename)
+        if not document or not await async_db.path_exists(document["path"]):
             raise HTTPException(status_code=404, detail="Document not found")
-        
-        # Read file content
-        content = file_path.read_bytes()
+        file_path = Path(document["path"])
         
         # Determine content type
         content_type = "application/pdf" if filename.endswith(".pdf") else "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
         
-        return Response(
-            content=content,
-            media_type=content_type,
-            headers={
-                "Content-Disposition": f"attachment; filename={filename}"
-            }
-        )
+        return await async_db.run(stream_file, request, file_path, media_type=content_type, filename=filename)
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -130,26 +134,25 @@ async def list_documents(
     """List all documents for a quote."""
     try:
         # Verify quote exists and belongs to agent
-        quote = get_quote_by_id(quote_id)
+        quote = await async_db.get_quote(quote_id)
         if not quote:
             raise HTTPException(status_code=404, detail="Quote not found")
         if quote["agent_email"] != current_agent["email"]:
             raise HTTPException(status_code=403, detail="Not authorized to access these documents")
         
-        # Get all files in quote directory
-        quote_dir = Path(os.path.join("output", quote_id))
-        if not quote_dir.exists():
-            return {"documents": []}
-        
-        documents = []
-        for file_path in quote_dir.glob("**/*"):
-            if file_path.is_file():
-                documents.append({
-                    "filename": file_path.name,
-                    "path": str(file_path.relative_to(quote_dir)),
-                    "size": file_path.stat().st_size,
-                    "created_at": file_path.stat().st_ctime
-                })
+        # Read the quote's files from the documents manifest
+        documents = [
+            {
+                "filename": document["filename"],
+                "path": document["path"],
+                "type": document["type"],
+                "source": document["source"],
+                "size": document["size"],
+                "sha256": document["sha256"],
+                "created_at": document["created_at"]
+            }
+            for document in await async_db.list_documents(quote_id)
+        ]
         
         return {"documents": documents}
     except HTTPException as e:
@@ -166,20 +169,17 @@ async def delete_document(
     """Delete a document."""
     try:
         # Verify quote exists and belongs to agent
-        quote = get_quote_by_id(quote_id)
+        quote = await async_db.get_quote(quote_id)
         if not quote:
             raise HTTPException(status_code=404, detail="Quote not found")
         if quote["agent_email"] != current_agent["email"]:
             raise HTTPException(status_code=403, detail="Not authorized to delete this document")
         
-        # Check if file exists
-        file_path = Path(os.path.join("output", quote_id, filename))
-        if not file_path.exists():
+        # Drop the manifest row and the quote's reference, and the file unless another quote still uses it
+        document = await async_db.delete_document(quote_id, filename)
+        if not document:
             raise HTTPException(status_code=404, detail="Document not found")
         
-        # Delete file
-        file_path.unlink()
-        
         return {"message": "Document deleted successfully"}
     except HTTPException as e:
         raise e
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query, Response
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timezone
@@ -10,6 +10,11 @@ import logging
 from enum import Enum
 
 from app.utils.lancedb_utils import insert_quote_request, get_quote_requests, update_quote_status, get_quote_by_id
+from app.utils.quote_repository import quote_repository, quote_literal, SUMMARY_FIELDS
+from app.utils.document_jobs import document_jobs
+from app.utils.quote_writer import quote_writer
+from app.utils.uploads import save_upload
+from app.utils.async_db import async_db
 from app.utils.auth import get_current_agent
 from app.routes.auth import get_current_user
 from app.database import get_db, get_table, generate_id
@@ -153,39 +158,17 @@ def submit_quote_request(
             }
         
         # Store in LanceDB
-        quotes_table = get_table("quotes")
-        quotes_table.add([quote_record])
+        quote_writer.write(quote_record)
         
-        # Generate documents
-        try:
-            generator = DocumentGenerator()
-            documents = generator.generate_quote_documents(quote_record)
-            
-            # Update quote with document paths
-            quotes_table = get_table("quotes")
-            updated_record = quote_record.copy()
-            updated_record.update({
-                "docx_path": documents.get("docx_path"),
-                "pdf_path": documents.get("pdf_path")
-            })
-            
-            # Update the record
-            quotes_table.delete(f"id = '{quote_id}'")
-            quotes_table.add([updated_record])
-            
-            return {
-                "id": quote_id,
-                "message": "Quote request created successfully",
-                "documents": documents
-            }
-        except Exception as e:
-            logger.error(f"Error generating documents: {str(e)}")
-            # Return success even if document generation fails
-            return {
-                "id": quote_id,
-                "message": "Quote request created successfully, but document generation failed",
-                "error": str(e)
-            }
+        # Generate documents in the background
+        job_id = document_jobs.submit(quote_record)
+        
+        return {
+            "id": quote_id,
+            "job_id": job_id,
+            "message": "Quote request created successfully, documents are being generated",
+            "status_url": f"/api/quotes/jobs/{job_id}"
+        }
         
     except Exception as e:
         logger.error(f"Error creating quote: {str(e)}")
@@ -196,24 +179,43 @@ def submit_quote_request(
 
 @router.get("/list", response_model=List[Dict])
 def list_quote_requests(
-    status: Optional[str] = None,
+    response: Response,
+    status_filter: Optional[str] = Query(None, alias="status"),
     quote_type: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
     current_agent: Dict[str, Any] = Depends(get_current_agent)
 ):
-    """List quote requests with optional filters."""
+    """
+    List quote requests with optional filters, newest first.
+
+    Returns summary columns unless ``fields`` names others (comma separated);
+    full records come from ``/{quote_id}``. When more quotes remain, the
+    ``X-Next-Cursor`` header holds the cursor for the next page.
+    """
     try:
-        quotes_table = get_table("quotes")
-        query = f"agent_id = '{current_agent['id']}'"
-        
-        if status:
-            query += f" AND status = '{status}'"
-        
-        if quote_type:
-            # This is a simplified approach - LanceDB's filtering on arrays is more complex
-            query += f" AND quote_types LIKE '%{quote_type}%'"
+        filters = []
+        if status_filter:
+            filters.append(f"status = {quote_literal(status_filter)}")
         
-        quotes = quotes_table.search().where(query).to_list()
+        columns = [field.strip() for field in fields.split(",") if field.strip()] if fields else SUMMARY_FIELDS
+        quotes, next_cursor = quote_repository.list_page(
+            current_agent["id"],
+            limit=limit,
+            cursor=cursor,
+            fields=columns,
+            filters=filters,
+            quote_type=quote_type
+        )
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
         return quotes
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error(f"Error listing quotes: {str(e)}")
         raise HTTPException(
@@ -221,6 +223,22 @@ def list_quote_requests(
             detail=f"Error listing quotes: {str(e)}"
         )
 
+@router.get("/jobs/{job_id}", response_model=Dict)
+def get_document_job(
+    job_id: str,
+    current_agent: Dict[str, Any] = Depends(get_current_agent)
+):
+    """Get the progress of a document generation job."""
+    job = document_jobs.get(job_id)
+    
+    if not job or job["agent_id"] != current_agent["id"]:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document job not found"
+        )
+    
+    return job
+
 @router.get("/{quote_id}", response_model=Dict)
 def get_quote_request(
     quote_id: str,
@@ -228,16 +246,15 @@ def get_quote_request(
 ):
     """Get a specific quote request."""
     try:
-        quotes_table = get_table("quotes")
-        quotes = quotes_table.search().where(f"id = '{quote_id}' AND agent_id = '{current_agent['id']}'").to_list()
+        quote = quote_repository.get(quote_id, agent_id=current_agent["id"])
         
-        if not quotes:
+        if not quote:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Quote request not found"
             )
         
-        return quotes[0]
+        return quote
     except HTTPException:
         raise
     except Exception as e:
@@ -255,24 +272,18 @@ def update_quote_request_status(
 ):
     """Update the status of a quote request."""
     try:
-        quotes_table = get_table("quotes")
-        quotes = quotes_table.search().where(f"id = '{quote_id}' AND agent_id = '{current_agent['id']}'").to_list()
-        
-        if not quotes:
+        try:
+            quote = quote_repository.update(
+                quote_id,
+                {"status": status_update.status.value},
+                agent_id=current_agent["id"]
+            )
+        except KeyError:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Quote request not found"
             )
         
-        # Update the quote record
-        quote = quotes[0]
-        quote["status"] = status_update.status
-        quote["updated_at"] = datetime.utcnow().isoformat()
-        
-        # Delete and re-add the record (LanceDB doesn't support updates directly)
-        quotes_table.delete(f"id = '{quote_id}'")
-        quotes_table.add([quote])
-        
         return {"message": "Status updated successfully", "quote": quote}
     except HTTPException:
         raise
@@ -292,39 +303,45 @@ async def upload_documents(
 ):
     """Upload additional documents for a quote request."""
     # Get quote from LanceDB
-    quotes_table = get_table("quotes")
-    quotes = quotes_table.search().where(f"id = '{quote_id}' AND agent_id = '{current_agent['id']}'").to_list()
+    quote = await async_db.get_quote(quote_id, agent_id=current_agent["id"])
     
-    if not quotes:
+    if not quote:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Quote request not found"
         )
     
     try:
-        # Save file to appropriate location
+        # Stream file to appropriate location; the quote is only updated once it is on disk
         quote_dir = Path(f"output/quotes/{quote_id}")
-        quote_dir.mkdir(parents=True, exist_ok=True)
-        file_location = quote_dir / file.filename
-        
-        with open(file_location, "wb+") as file_object:
-            file_object.write(file.file.read())
+        saved = await save_upload(
+            file,
+            quote_dir,
+            find_existing=lambda sha256: async_db.find_document_by_sha256(quote_id, sha256)
+        )
+        if not saved["duplicate"]:
+            await async_db.add_document(quote_id, saved["path"], "upload", sha256=saved["sha256"])
+        else:
+            # Identical content under a new name is listed under that name, pointing at the stored file
+            existing = await async_db.get_document(quote_id, saved["filename"])
+            if existing is None or existing["path"] != saved["path"]:
+                await async_db.add_document(
+                    quote_id, saved["path"], "upload", sha256=saved["sha256"], filename=saved["filename"]
+                )
         
         # Update quote with new document
-        quote = quotes[0]
-        documents = quote.get("documents", [])
-        documents.append(str(file_location))
-        
-        # Update the quote
-        updated_quote = quote.copy()
-        updated_quote["documents"] = documents
-        updated_quote["updated_at"] = datetime.utcnow().isoformat()
-        
-        # Delete and re-add the record
-        quotes_table.delete(f"id = '{quote_id}'")
-        quotes_table.add([updated_quote])
+        documents = quote.get("documents") or []
+        if saved["path"] not in documents:
+            documents.append(saved["path"])
+            await async_db.update_quote(quote_id, {"documents": documents})
         
-        return {"message": "File successfully uploaded"}
+        return {
+            "message": "File already uploaded" if saved["duplicate"] else "File successfully uploaded",
+            "sha256": saved["sha256"],
+            "size": saved["size"]
+        }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -356,8 +373,7 @@ async def create_quote(
         }
         
         # Store in LanceDB
-        quotes_table = get_table("quotes")
-        quotes_table.add([quote_record])
+        await async_db.add_quote(quote_record)
 
         return {
             "message": "Quote request created successfully",
@@ -374,7 +390,7 @@ async def create_quote(
 async def get_quotes(current_user: dict = Depends(get_current_user)):
     try:
         # Get quotes from LanceDB
-        quotes = get_quote_requests({"agent_email": current_user.email})
+        quotes = await async_db.find_quotes({"agent_email": current_user["email"]})
         return quotes
     except Exception as e:
         raise HTTPException(
@@ -397,8 +413,7 @@ async def submit_quote_request(
         quote_data["status"] = "pending"
         
         # Store in database
-        table = db.open_table("quotes")
-        table.add([quote_data])
+        await async_db.add_quote(quote_data)
         
         # Generate documents
         template_dir = Path(os.getenv("TEMPLATE_DIR", "templates"))
@@ -432,7 +447,7 @@ async def list_quotes(
     """List quote requests with optional filtering."""
     try:
         table = db.open_table("quotes")
-        query = f"agent_email = '{current_agent['email']}'"
+        query = f"agent_email = {quote_literal(current_agent['email'])}"
         
         if status:
             query += f" AND status = '{status}'"
@@ -0,0 +1,76 @@
+import schedule
+import time
+import logging
+from pathlib import Path
+from app.utils.db_maintenance import LanceDBCompactor
+from app.utils.refresh_tokens import refresh_tokens
+import os
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.FileHandler('compaction.log'),
+        logging.StreamHandler()
+    ]
+)
+logger = logging.getLogger(__name__)
+
+class CompactionScheduler:
+    def __init__(self, db_path: str, retention_hours: int = 24, run_at: str = "03:00"):
+        """
+        Initialize compaction scheduler.
+
+        Args:
+            db_path: Path to the LanceDB database
+            retention_hours: Number of hours of table versions to keep
+            run_at: Daily time (HH:MM) to run compaction
+        """
+        self.compactor = LanceDBCompactor(db_path, retention_hours)
+        self.run_at = run_at
+
+    def purge_refresh_tokens(self):
+        """Delete expired refresh tokens so compaction can reclaim their rows."""
+        try:
+            if "refresh_tokens" in self.compactor.db.table_names():
+                purged = refresh_tokens.purge_expired(self.compactor.db.open_table("refresh_tokens"))
+                logger.info(f"Purged {purged} expired refresh tokens")
+        except Exception as e:
+            logger.error(f"Error purging refresh tokens: {str(e)}")
+
+    def perform_compaction(self):
+        """Purge expired refresh tokens, compact all tables and log the totals."""
+        self.purge_refresh_tokens()
+        try:
+            reports = self.compactor.compact_all()
+            reclaimed = sum(report["bytes_reclaimed"] for report in reports)
+            logger.info(f"Compaction finished for {len(reports)} tables, reclaimed {reclaimed} bytes")
+        except Exception as e:
+            logger.error(f"Error during compaction: {str(e)}")
+
+    def start(self):
+        """Start the compaction scheduler."""
+        # Run after the nightly backup so the backup keeps the pre-compaction versions
+        schedule.every().day.at(self.run_at).do(self.perform_compaction)
+
+        logger.info("Compaction scheduler started")
+        logger.info(f"Next compaction scheduled for: {schedule.next_run()}")
+
+        while True:
+            schedule.run_pending()
+            time.sleep(60)  # Check every minute
+
+if __name__ == "__main__":
+    # Get settings from environment variables or use defaults
+    db_path = os.getenv("LANCE_DB_PATH", "data/lancedb")
+    retention_hours = int(os.getenv("COMPACTION_RETENTION_HOURS", "24"))
+    run_at = os.getenv("COMPACTION_TIME", "03:00")
+
+    Path(db_path).mkdir(parents=True, exist_ok=True)
+
+    scheduler = CompactionScheduler(db_path, retention_hours, run_at)
+    if os.getenv("COMPACTION_RUN_ONCE", "").lower() in ("1", "true", "yes"):
+        scheduler.perform_compaction()
+    else:
+        scheduler.start()
@@ -0,0 +1,34 @@
+import argparse
+import logging
+
+from app.database import db
+from app.utils.schema_migration import migrate_all
+from app.utils.quote_repository import quote_repository
+from app.utils.document_manifest import document_manifest
+from app.utils.refresh_tokens import refresh_tokens
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+def main():
+    parser = argparse.ArgumentParser(description="Rewrite the LanceDB tables under DB_PATH to their declared Arrow schemas")
+    parser.add_argument("--table", action="append", help="Table to migrate (repeatable, default: all)")
+    parser.add_argument("--dry-run", action="store_true", help="Report changes without writing")
+    args = parser.parse_args()
+
+    for report in migrate_all(db, tables=args.table, dry_run=args.dry_run):
+        state = "migrated" if report["migrated"] else "unchanged"
+        logger.info(
+            f"{report['table']}: {state}, {report['rows']} rows"
+            + (f", dropped {', '.join(report['dropped_columns'])}" if report["dropped_columns"] else "")
+        )
+
+    if not args.dry_run:
+        # Overwriting a table drops its indexes; rebuild them
+        quote_repository.ensure_indexes()
+        document_manifest.ensure_indexes()
+        refresh_tokens.ensure_indexes()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import copy
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+class AgentCache:
+    """Bounded LRU cache of agent records keyed by email, with a TTL per entry."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of agents kept in memory
+            ttl: Seconds an entry stays valid before it is re-read from the database
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, email: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached agent, or None on a miss or expired entry."""
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, agent = entry
+            if expires_at < time.monotonic():
+                del self._entries[email]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(email)
+            self.hits += 1
+            return copy.deepcopy(agent)
+
+    def set(self, email: str, agent: Dict[str, Any]) -> None:
+        """Store an agent record, evicting the least recently used entry if full."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[email] = (time.monotonic() + self.ttl, copy.deepcopy(agent))
+            self._entries.move_to_end(email)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, email: str) -> None:
+        """Drop an agent so the next lookup reads it from the database."""
+        with self._lock:
+            self._entries.pop(email, None)
+
+    def clear(self) -> None:
+        """Drop every cached agent."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and occupancy, for sizing the cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+# Shared cache used by the authentication dependencies
+agent_cache = AgentCache(
+    maxsize=int(os.getenv("AGENT_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("AGENT_CACHE_TTL_SECONDS", "300"))
+)
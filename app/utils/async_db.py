@@ -0,0 +1,159 @@
+import asyncio
+import functools
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from app.database import get_table, add_records
+from app.utils.quote_repository import quote_repository, quote_literal
+from app.utils.document_manifest import document_manifest
+from app.utils.quote_writer import quote_writer
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class AsyncDataAccess:
+    """Async facade over the synchronous LanceDB and file helpers.
+
+    LanceDB queries, commits and filesystem calls block, so async route
+    handlers await these methods instead of calling the helpers directly.
+    Every call runs on a dedicated, bounded thread pool: a slow scan holds one
+    of its workers rather than the event loop, and database work cannot crowd
+    out the threadpool Starlette uses for sync routes and dependencies.
+    """
+
+    def __init__(self, max_workers: int = 8):
+        """
+        Initialize the data-access layer.
+
+        Args:
+            max_workers: Number of threads available for blocking DB and file calls
+        """
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="lancedb")
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.completed = 0
+        self.failed = 0
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a blocking callable on the DB pool and await its result.
+
+        Args:
+            func: Synchronous function to call
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Whatever func returns; exceptions propagate to the caller
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self.pending += 1
+        try:
+            result = await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+        except BaseException:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self.pending -= 1
+        with self._lock:
+            self.completed += 1
+        return result
+
+    # Quotes
+
+    async def get_quote(self, quote_id: str, agent_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        return await self.run(quote_repository.get, quote_id, agent_id=agent_id)
+
+    async def add_quote(self, record: Dict[str, Any]) -> None:
+        """Insert a quote through the group-commit buffer; returns once it is committed."""
+        await asyncio.wrap_future(quote_writer.submit(record))
+
+    async def update_quote(
+        self,
+        quote_id: str,
+        changes: Dict[str, Any],
+        agent_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        return await self.run(quote_repository.update, quote_id, changes, agent_id=agent_id)
+
+    async def find_quotes(self, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Quotes matching all of the given column = value filters."""
+        where = " AND ".join(f"{key} = {quote_literal(value)}" for key, value in filters.items())
+
+        def query():
+            search = quote_repository.table.search()
+            if where:
+                search = search.where(where)
+            return search.to_list()
+
+        return await self.run(query)
+
+    # Agents
+
+    async def find_agent(self, email: str) -> Optional[Dict[str, Any]]:
+        """Read an agent straight from the table, bypassing the agent cache."""
+        def query():
+            agents = get_table("agents").search().where(f"email = {quote_literal(email)}").limit(1).to_list()
+            return agents[0] if agents else None
+
+        return await self.run(query)
+
+    async def add_agent(self, record: Dict[str, Any]) -> None:
+        await self.run(lambda: add_records(get_table("agents"), [record]))
+
+    async def replace_agent(self, record: Dict[str, Any]) -> None:
+        """Rewrite an agent row, keyed by email."""
+        def replace():
+            table = get_table("agents")
+            table.delete(f"email = {quote_literal(record['email'])}")
+            add_records(table, [record])
+
+        await self.run(replace)
+
+    # Documents
+
+    async def list_documents(self, quote_id: str) -> List[Dict[str, Any]]:
+        return await self.run(document_manifest.list, quote_id)
+
+    async def get_document(self, quote_id: str, filename: str) -> Optional[Dict[str, Any]]:
+        return await self.run(document_manifest.get, quote_id, filename)
+
+    async def find_document_by_sha256(self, quote_id: str, sha256: str) -> Optional[str]:
+        return await self.run(document_manifest.find_by_sha256, quote_id, sha256)
+
+    async def add_document(self, quote_id: str, path: str, source: str, sha256: Optional[str] = None,
+                           filename: Optional[str] = None) -> Dict[str, Any]:
+        return await self.run(document_manifest.add, quote_id, path, source, sha256=sha256, filename=filename)
+
+    async def delete_document(self, quote_id: str, filename: str) -> Optional[Dict[str, Any]]:
+        return await self.run(document_manifest.delete, quote_id, filename)
+
+    # Files
+
+    async def path_exists(self, path: Union[str, Path]) -> bool:
+        return await self.run(os.path.exists, path)
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool size and call counters."""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "pending": self.pending,
+                "completed": self.completed,
+                "failed": self.failed
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the pool, optionally waiting for queued calls."""
+        self._executor.shutdown(wait=wait)
+
+# Shared data-access layer used by the async routes
+async_db = AsyncDataAccess(max_workers=int(os.getenv("DB_THREADS", "8")))
@@ -1,11 +1,17 @@
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from app.database import get_table
+from app.utils.agent_cache import agent_cache
+from app.utils.async_db import async_db
+from app.utils.password_hasher import password_hasher
+from app.utils.quote_repository import quote_literal
+from app.utils.token_cache import token_cache, revocation_list
 import os
+import time
+import uuid
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -16,19 +22,77 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Embed agent id and permissions in access tokens so requests skip the agent lookup
+EMBED_AGENT_CLAIMS = os.getenv("JWT_EMBED_AGENT_CLAIMS", "false").lower() in ("1", "true", "yes")
 
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/token")
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hasher.context.verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     """Generate password hash."""
-    return pwd_context.hash(password)
+    return password_hasher.context.hash(password)
+
+async def get_agent_by_email_async(email: str) -> Optional[Dict[str, Any]]:
+    """Look up an agent record from the agent cache; misses are read on the DB pool."""
+    agent = agent_cache.get(email)
+    if agent is not None:
+        return agent
+    return await async_db.run(_load_agent, email)
+
+def _load_agent(email: str) -> Optional[Dict[str, Any]]:
+    """Read an agent from the table and cache it."""
+    table = get_table("agents")
+    agents = table.search().where(f"email = {quote_literal(email)}").limit(1).to_list()
+    if not agents:
+        return None
+    
+    agent_cache.set(email, agents[0])
+    return agents[0]
+
+def invalidate_agent(email: str) -> None:
+    """Forget a cached agent after its record changes (register, login, permissions)."""
+    agent_cache.invalidate(email)
+
+def revoke_agent(email: str) -> None:
+    """Reject every token already issued to an agent, e.g. when it is disabled."""
+    revocation_list.revoke_subject(email)
+    agent_cache.invalidate(email)
+
+def access_token_claims(agent: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Claims for an agent's access token.
+
+    Every token gets an issue time and ID so it can be revoked; with
+    JWT_EMBED_AGENT_CLAIMS enabled it also carries the agent id and
+    permissions, which get_current_agent then trusts without a DB lookup.
+    """
+    claims = {"sub": agent["email"], "iat": int(time.time()), "jti": uuid.uuid4().hex}
+    if EMBED_AGENT_CLAIMS:
+        claims["agent_id"] = agent.get("id")
+        claims["permissions"] = list(agent.get("permissions") or [])
+    return claims
+
+def decode_token(token: str) -> Dict[str, Any]:
+    """
+    Verify a bearer token and return its claims.
+
+    Repeat presentations of a token are served from the token cache until it
+    expires; the revocation list is checked on every call.
+
+    Raises:
+        JWTError: If the token is invalid, expired or revoked
+    """
+    claims = token_cache.get(token)
+    if claims is None:
+        claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        token_cache.set(token, claims)
+    if revocation_list.is_revoked(claims):
+        raise JWTError("Token has been revoked")
+    return claims
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a new access token."""
@@ -54,19 +118,24 @@ async def get_current_agent(token: str = Depends(oauth2_scheme)) -> Dict[str, An
     
     try:
         # Decode token
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_token(token)
         email: str = payload.get("sub")
         if email is None:
             raise credentials_exception
         
-        # Get agent from database
-        table = get_table("agents")
-        agents = table.search().where(f"email = '{email}'").to_list()
+        # Tokens carrying the agent's claims need no lookup
+        if "agent_id" in payload and "permissions" in payload:
+            return {
+                "id": payload["agent_id"],
+                "email": email,
+                "permissions": payload["permissions"]
+            }
         
-        if not agents:
-            raise credentials_exception
+        # Get agent from cache or database
+        agent = await get_agent_by_email_async(email)
         
-        agent = agents[0]
+        if agent is None or not agent.get("is_active", True):
+            raise credentials_exception
         
         # Create a mock agent object for compatibility
         return {
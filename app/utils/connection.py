@@ -0,0 +1,127 @@
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import lancedb
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class LanceDBConnection:
+    """One LanceDB connection plus a cache of open table handles.
+
+    Opening a table reads its manifest from disk, so handles are kept and
+    reused across requests. Writes made through a cached handle are visible
+    to it straight away; writes from other processes (another worker, the
+    migration or compaction scripts) are picked up by moving the handle to
+    the latest version once ``consistency_interval`` seconds have passed
+    since it was last checked. An interval of 0 checks on every access and
+    ``None`` never refreshes.
+
+    Exposes ``open_table``, ``create_table`` and ``table_names`` so it can
+    stand in wherever the code expects a LanceDB connection.
+    """
+
+    def __init__(self, uri: str, consistency_interval: Optional[float] = 5.0):
+        """
+        Initialize the connection manager.
+
+        Args:
+            uri: LanceDB database path
+            consistency_interval: Seconds before a cached handle is refreshed to the latest version
+        """
+        self.uri = uri
+        self.consistency_interval = consistency_interval
+        self._db = None
+        self._tables: Dict[str, Tuple[Any, float]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.opens = 0
+        self.refreshes = 0
+
+    @property
+    def db(self):
+        """The underlying LanceDB connection, opened on first use."""
+        if self._db is None:
+            with self._lock:
+                if self._db is None:
+                    self._db = lancedb.connect(self.uri)
+        return self._db
+
+    def _stale(self, checked_at: float, now: float) -> bool:
+        if self.consistency_interval is None:
+            return False
+        return now - checked_at >= self.consistency_interval
+
+    def _refresh(self, table_name: str, table):
+        if hasattr(table, "checkout_latest"):
+            table.checkout_latest()
+            return table
+        # Older LanceDB releases have no checkout_latest; reopen instead
+        return self.db.open_table(table_name)
+
+    def open_table(self, table_name: str):
+        """
+        Cached handle for an existing table.
+
+        Raises whatever LanceDB raises for a missing table (KeyError,
+        ValueError or FileNotFoundError depending on the release).
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._tables.get(table_name)
+
+        if entry is not None:
+            table, checked_at = entry
+            if not self._stale(checked_at, now):
+                with self._lock:
+                    self.hits += 1
+                return table
+            try:
+                table = self._refresh(table_name, table)
+            except (KeyError, ValueError, FileNotFoundError):
+                # Dropped by another process
+                self.invalidate(table_name)
+                raise
+            with self._lock:
+                self.refreshes += 1
+        else:
+            table = self.db.open_table(table_name)
+            with self._lock:
+                self.opens += 1
+
+        with self._lock:
+            self._tables[table_name] = (table, now)
+        return table
+
+    def __getitem__(self, table_name: str):
+        return self.open_table(table_name)
+
+    def create_table(self, table_name: str, data=None, schema=None, mode: str = "create"):
+        """Create (or with mode="overwrite", replace) a table and cache its handle."""
+        table = self.db.create_table(table_name, data=data, schema=schema, mode=mode)
+        with self._lock:
+            self._tables[table_name] = (table, time.monotonic())
+        return table
+
+    def table_names(self) -> List[str]:
+        return list(self.db.table_names())
+
+    def invalidate(self, table_name: Optional[str] = None) -> None:
+        """Drop one cached handle, or all of them."""
+        with self._lock:
+            if table_name is None:
+                self._tables.clear()
+            else:
+                self._tables.pop(table_name, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "tables": len(self._tables),
+                "hits": self.hits,
+                "opens": self.opens,
+                "refreshes": self.refreshes,
+                "consistency_interval": self.consistency_interval
+            }
@@ -0,0 +1,116 @@
+import logging
+from datetime import timedelta
+from pathlib import Path
+import lancedb
+from typing import Dict, List, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_TABLES = ["quotes", "agents", "documents", "refresh_tokens"]
+
+class LanceDBCompactor:
+    def __init__(self, db_path: str, retention_hours: int = 24, tables: Optional[List[str]] = None):
+        """
+        Initialize LanceDB compaction utility.
+
+        Args:
+            db_path: Path to the LanceDB database
+            retention_hours: Table versions older than this are pruned
+            tables: Names of the tables to compact
+        """
+        self.db_path = Path(db_path)
+        self.retention = timedelta(hours=retention_hours)
+        self.tables = tables or DEFAULT_TABLES
+        self.db = lancedb.connect(str(self.db_path))
+
+    def _disk_usage(self, table_name: str) -> int:
+        """Total size in bytes of a table's directory on disk."""
+        table_dir = self.db_path / f"{table_name}.lance"
+        if not table_dir.exists():
+            return 0
+        return sum(f.stat().st_size for f in table_dir.rglob("*") if f.is_file())
+
+    def _snapshot(self, table, table_name: str) -> Dict[str, int]:
+        """Collect fragment, version and size figures for a table."""
+        stats = table.stats()
+        return {
+            "fragments": stats["fragment_stats"]["num_fragments"],
+            "small_fragments": stats["fragment_stats"]["num_small_fragments"],
+            "versions": len(table.list_versions()),
+            "bytes": self._disk_usage(table_name)
+        }
+
+    def compact_table(self, table_name: str) -> Dict:
+        """
+        Merge small fragments, refresh indexes and prune old versions of a table.
+
+        Args:
+            table_name: Name of the table to compact
+
+        Returns:
+            Report with before/after figures and bytes reclaimed
+        """
+        try:
+            table = self.db.open_table(table_name)
+            before = self._snapshot(table, table_name)
+
+            if hasattr(table, "optimize"):
+                # Also folds rows written since the scalar indexes were built into them
+                table.optimize(cleanup_older_than=self.retention)
+            else:
+                table.compact_files()
+                table.cleanup_old_versions(older_than=self.retention)
+                if hasattr(table, "optimize_indices"):
+                    table.optimize_indices()
+
+            after = self._snapshot(table, table_name)
+            report = {
+                "table": table_name,
+                "before": before,
+                "after": after,
+                "bytes_reclaimed": before["bytes"] - after["bytes"]
+            }
+            logger.info(
+                f"Compacted {table_name}: fragments {before['fragments']} -> {after['fragments']}, "
+                f"versions {before['versions']} -> {after['versions']}, "
+                f"reclaimed {report['bytes_reclaimed']} bytes"
+            )
+            return report
+
+        except Exception as e:
+            logger.error(f"Error compacting table {table_name}: {str(e)}")
+            raise
+
+    def compact_all(self) -> List[Dict]:
+        """
+        Compact every configured table that exists.
+
+        Returns:
+            List of per-table reports
+        """
+        existing = set(self.db.table_names())
+        reports = []
+        for table_name in self.tables:
+            if table_name not in existing:
+                logger.info(f"Skipping compaction of missing table: {table_name}")
+                continue
+            try:
+                reports.append(self.compact_table(table_name))
+            except Exception:
+                # Keep going so one bad table does not block the others
+                continue
+        return reports
+
+# Example usage:
+"""
+# Initialize compaction utility
+compactor = LanceDBCompactor("data/lancedb", retention_hours=24)
+
+# Compact a single table
+report = compactor.compact_table("quotes")
+
+# Compact all tables
+reports = compactor.compact_all()
+"""
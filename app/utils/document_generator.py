@@ -1,11 +1,22 @@
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Union, Any
 import logging
 from datetime import datetime
 import os
 import json
-from docx import Document
 import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from app.utils.office_converter import get_converter_pool, convert_with_cli
+from app.utils.template_cache import template_cache
+from app.utils.xml_renderer import render_docx as render_docx_xml, template_placeholders
+from app.utils.render_cache import render_cache
+
+# Available DOCX rendering backends
+RENDERERS = ("docx", "xml")
+
+# Bump when rendering output changes so cached documents are not reused
+RENDERER_VERSION = 1
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -14,10 +25,12 @@ logger = logging.getLogger(__name__)
 class DocumentGenerator:
     """Class for generating quote documents."""
     
-    def __init__(self, template_dir: str = "templates", output_dir: str = "output"):
+    def __init__(self, template_dir: str = "templates", output_dir: str = "output", renderer: Optional[str] = None, max_workers: Optional[int] = None):
         """Initialize document generator."""
         self.template_dir = Path(template_dir)
         self.output_dir = Path(output_dir)
+        self.renderer = renderer or os.getenv("DOCUMENT_RENDERER", "docx")
+        self.max_workers = max_workers or int(os.getenv("DOCUMENT_LINE_WORKERS", "3"))
         self._ensure_directories_exist()
     
     def _ensure_directories_exist(self):
@@ -27,8 +40,19 @@ class DocumentGenerator:
         for quote_type in ["auto", "home", "specialty"]:
             (self.output_dir / quote_type).mkdir(parents=True, exist_ok=True)
     
-    def generate_quote_documents(self, quote_data: dict) -> Dict[str, str]:
-        """Generate documents for all quote types in quote_data."""
+    def generate_quote_documents(self, quote_data: dict, renderer: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Generate documents for all quote types in quote_data.
+        
+        renderer selects the DOCX backend: "docx" (python-docx, the default) or
+        "xml" (direct zip/XML rewrite); DOCUMENT_RENDERER sets the default.
+        
+        Returns a dict per line with docx_path, pdf_path, seconds and error. A
+        line that fails is reported with its error and the others are kept;
+        only a quote whose every line fails raises.
+        """
+        renderer = renderer or self.renderer
+        if renderer not in RENDERERS:
+            raise ValueError(f"Unknown document renderer: {renderer}")
         logger.info(f"Starting document generation for quote {quote_data.get('id')}")
         documents = {}
         
@@ -36,30 +60,41 @@ class DocumentGenerator:
             # Generate documents based on quote types
             quote_types = quote_data.get("quote_types", [])
             client_name = quote_data.get("client_name", "Unknown")
+            generators = {
+                "auto": self._generate_auto_quote,
+                "home": self._generate_home_quote,
+                "specialty": self._generate_specialty_quote
+            }
+            lines = [line for line in generators if line.upper() in quote_types]
             
-            if "AUTO" in quote_types:
-                logger.info("Generating auto quote document")
-                docx_path, pdf_path = self._generate_auto_quote(quote_data, client_name)
-                documents["auto"] = {
-                    "docx_path": docx_path,
-                    "pdf_path": pdf_path
-                }
-            
-            if "HOME" in quote_types:
-                logger.info("Generating home quote document")
-                docx_path, pdf_path = self._generate_home_quote(quote_data, client_name)
-                documents["home"] = {
+            def generate_line(line: str) -> Dict[str, Any]:
+                logger.info(f"Generating {line} quote document")
+                start = time.perf_counter()
+                try:
+                    docx_path, pdf_path = generators[line](quote_data, client_name, renderer)
+                    error = None
+                except Exception as e:
+                    docx_path, pdf_path, error = None, None, str(e)
+                return {
                     "docx_path": docx_path,
-                    "pdf_path": pdf_path
+                    "pdf_path": pdf_path,
+                    "seconds": round(time.perf_counter() - start, 3),
+                    "error": error
                 }
             
-            if "SPECIALTY" in quote_types:
-                logger.info("Generating specialty quote document")
-                docx_path, pdf_path = self._generate_specialty_quote(quote_data, client_name)
-                documents["specialty"] = {
-                    "docx_path": docx_path,
-                    "pdf_path": pdf_path
-                }
+            # Render the requested lines concurrently; results keep AUTO, HOME, SPECIALTY order
+            if lines:
+                with ThreadPoolExecutor(max_workers=min(self.max_workers, len(lines))) as executor:
+                    futures = {line: executor.submit(generate_line, line) for line in lines}
+                    for line, future in futures.items():
+                        documents[line] = future.result()
+                        if documents[line]["error"]:
+                            logger.error(f"Failed to generate {line} quote document: {documents[line]['error']}")
+                        else:
+                            logger.info(f"Generated {line} quote document in {documents[line]['seconds']}s")
+                
+                if all(result["error"] for result in documents.values()):
+                    raise RuntimeError("; ".join(f"{line}: {result['error']}" for line, result in documents.items()))
             
             logger.info(f"Document generation completed for quote {quote_data.get('id')}")
             return documents
@@ -68,15 +103,13 @@ class DocumentGenerator:
             logger.error(f"Error in document generation: {str(e)}")
             raise
     
-    def _generate_auto_quote(self, quote_data: dict, client_name: str) -> tuple:
+    def _generate_auto_quote(self, quote_data: dict, client_name: str, renderer: Optional[str] = None) -> tuple:
         """Generate auto quote document."""
         try:
             template_path = self.template_dir / "auto_quote_template.docx"
             if not template_path.exists():
                 logger.error(f"Auto quote template not found: {template_path}")
                 return None, None
-                
-            doc = Document(template_path)
             
             # Prepare personal info data
             personal_info = quote_data.get("personal_info", {})
@@ -102,41 +135,19 @@ class DocumentGenerator:
                     "quoting_limits": auto_data.get("quoting_limits", "N/A")
                 })
             
-            # Replace placeholders in document
-            self._replace_placeholders(doc, replacements)
-            
-            # Save document
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            sanitized_name = "".join(x for x in client_name if x.isalnum() or x.isspace()).replace(" ", "_")
-            output_filename = f"auto_{sanitized_name}_{timestamp}.docx"
-            output_path = self.output_dir / "auto" / output_filename
-            logger.info(f"Saving document to: {output_path}")
-            doc.save(str(output_path))
-            
-            # Convert to PDF
-            pdf_path = output_path.with_suffix(".pdf")
-            try:
-                self._convert_to_pdf(str(output_path), str(pdf_path))
-                logger.info(f"PDF saved to: {pdf_path}")
-            except Exception as e:
-                logger.warning(f"PDF conversion failed: {str(e)}")
-                pdf_path = None
-            
-            return str(output_path), str(pdf_path) if pdf_path else None
+            return self._render_line("auto", template_path, replacements, client_name, renderer)
             
         except Exception as e:
             logger.error(f"Error generating auto quote document: {str(e)}")
             raise
     
-    def _generate_home_quote(self, quote_data: dict, client_name: str) -> tuple:
+    def _generate_home_quote(self, quote_data: dict, client_name: str, renderer: Optional[str] = None) -> tuple:
         """Generate home quote document."""
         try:
             template_path = self.template_dir / "home_quote_template.docx"
             if not template_path.exists():
                 logger.error(f"Home quote template not found: {template_path}")
                 return None, None
-                
-            doc = Document(template_path)
             
             # Prepare replacement dictionary
             replacements = {
@@ -163,41 +174,19 @@ class DocumentGenerator:
                     "swimming_pool": "Yes" if home_details.get("swimming_pool") else "No"
                 })
             
-            # Replace placeholders in document
-            self._replace_placeholders(doc, replacements)
-            
-            # Save document
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            sanitized_name = "".join(x for x in client_name if x.isalnum() or x.isspace()).replace(" ", "_")
-            output_filename = f"home_{sanitized_name}_{timestamp}.docx"
-            output_path = self.output_dir / "home" / output_filename
-            logger.info(f"Saving document to: {output_path}")
-            doc.save(str(output_path))
-            
-            # Convert to PDF
-            pdf_path = output_path.with_suffix(".pdf")
-            try:
-                self._convert_to_pdf(str(output_path), str(pdf_path))
-                logger.info(f"PDF saved to: {pdf_path}")
-            except Exception as e:
-                logger.warning(f"PDF conversion failed: {str(e)}")
-                pdf_path = None
-            
-            return str(output_path), str(pdf_path) if pdf_path else None
+            return self._render_line("home", template_path, replacements, client_name, renderer)
             
         except Exception as e:
             logger.error(f"Error generating home quote document: {str(e)}")
             raise
     
-    def _generate_specialty_quote(self, quote_data: dict, client_name: str) -> tuple:
+    def _generate_specialty_quote(self, quote_data: dict, client_name: str, renderer: Optional[str] = None) -> tuple:
         """Generate specialty quote document."""
         try:
             template_path = self.template_dir / "specialty_quote_template.docx"
             if not template_path.exists():
                 logger.error(f"Specialty quote template not found: {template_path}")
                 return None, None
-                
-            doc = Document(template_path)
             
             # Prepare replacement dictionary
             replacements = {
@@ -227,71 +216,73 @@ class DocumentGenerator:
                     f"{item_prefix}coll_deductible": item.get("coll_deductible", "N/A")
                 })
             
-            # Replace placeholders in document
-            self._replace_placeholders(doc, replacements)
-            
-            # Save document
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            sanitized_name = "".join(x for x in client_name if x.isalnum() or x.isspace()).replace(" ", "_")
-            output_filename = f"specialty_{sanitized_name}_{timestamp}.docx"
-            output_path = self.output_dir / "specialty" / output_filename
-            logger.info(f"Saving document to: {output_path}")
-            doc.save(str(output_path))
-            
-            # Convert to PDF
-            pdf_path = output_path.with_suffix(".pdf")
-            try:
-                self._convert_to_pdf(str(output_path), str(pdf_path))
-                logger.info(f"PDF saved to: {pdf_path}")
-            except Exception as e:
-                logger.warning(f"PDF conversion failed: {str(e)}")
-                pdf_path = None
-            
-            return str(output_path), str(pdf_path) if pdf_path else None
+            return self._render_line("specialty", template_path, replacements, client_name, renderer)
             
         except Exception as e:
             logger.error(f"Error generating specialty quote document: {str(e)}")
             raise
     
-    def _replace_placeholders(self, doc: Document, replacements: Dict[str, str]):
-        """Replace placeholders in document with actual values."""
-        logger.info("Replacing placeholders in document")
-        logger.debug(f"Data keys available: {list(replacements.keys())}")
+    def _render_line(self, line: str, template_path: Path, replacements: Dict[str, str], client_name: str, renderer: Optional[str] = None) -> tuple:
+        """Render one line of business to DOCX and PDF, reusing an identical earlier render."""
+        renderer = renderer or self.renderer
+        cache_key = render_cache.key(
+            template_path,
+            replacements,
+            f"{renderer}:{RENDERER_VERSION}",
+            placeholders=self._placeholders(template_path, renderer)
+        )
+        cached = render_cache.get(cache_key)
+        if cached:
+            logger.info(f"Reusing cached {line} quote document: {cached[0]}")
+            return cached
         
-        for paragraph in doc.paragraphs:
-            placeholder_keys = []
-            for key in replacements.keys():
-                if f"{{{{{key}}}}}" in paragraph.text:
-                    placeholder_keys.append(key)
-            
-            if placeholder_keys:
-                logger.debug(f"Found placeholders in paragraph: {placeholder_keys}")
-                for key in placeholder_keys:
-                    value = replacements[key]
-                    placeholder = f"{{{{{key}}}}}"
-                    paragraph.text = paragraph.text.replace(placeholder, str(value))
-                    logger.debug(f"Replaced '{key}' with '{value}'")
-                logger.debug(f"Paragraph changed from '{paragraph.text}' to '{paragraph.text}'")
+        # Render and save document
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        sanitized_name = "".join(x for x in client_name if x.isalnum() or x.isspace()).replace(" ", "_")
+        output_filename = f"{line}_{sanitized_name}_{timestamp}.docx"
+        output_path = self.output_dir / line / output_filename
+        logger.info(f"Saving document to: {output_path}")
+        self._render(template_path, replacements, output_path, renderer)
+        
+        # Convert to PDF
+        pdf_path = output_path.with_suffix(".pdf")
+        try:
+            self._convert_to_pdf(str(output_path), str(pdf_path))
+            logger.info(f"PDF saved to: {pdf_path}")
+        except Exception as e:
+            logger.warning(f"PDF conversion failed: {str(e)}")
+            pdf_path = None
         
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    for paragraph in cell.paragraphs:
-                        placeholder_keys = []
-                        for key in replacements.keys():
-                            if f"{{{{{key}}}}}" in paragraph.text:
-                                placeholder_keys.append(key)
-                        
-                        if placeholder_keys:
-                            for key in placeholder_keys:
-                                value = replacements[key]
-                                placeholder = f"{{{{{key}}}}}"
-                                paragraph.text = paragraph.text.replace(placeholder, str(value))
+        # Only complete pairs are cached so a later render can still produce the PDF
+        if pdf_path and pdf_path.exists():
+            render_cache.put(cache_key, str(output_path), str(pdf_path))
         
-        logger.info("Placeholder replacement completed successfully")
-
+        return str(output_path), str(pdf_path) if pdf_path else None
+    
+    def _placeholders(self, template_path: Path, renderer: Optional[str] = None) -> List[str]:
+        """Placeholder keys the selected renderer fills in a template."""
+        if (renderer or self.renderer) == "xml":
+            return template_placeholders(template_path)
+        return template_cache.get(template_path).placeholders
+    
+    def _render(self, template_path: Path, replacements: Dict[str, str], output_path: Path, renderer: Optional[str] = None):
+        """Fill a template and write it to output_path with the selected renderer."""
+        if (renderer or self.renderer) == "xml":
+            render_docx_xml(template_path, output_path, replacements)
+        else:
+            template_cache.render(template_path, replacements).save(str(output_path))
+    
     def _convert_to_pdf(self, docx_path: str, pdf_path: str):
-        """Convert DOCX to PDF using docx2pdf or LibreOffice as fallback."""
+        """Convert DOCX to PDF using the warm LibreOffice pool, docx2pdf or a one-off LibreOffice."""
+        pool = get_converter_pool()
+        if pool is not None:
+            try:
+                pool.convert(docx_path, pdf_path)
+                logger.info(f"LibreOffice pool PDF conversion successful: {pdf_path}")
+                return
+            except Exception as e:
+                logger.warning(f"LibreOffice pool conversion failed: {str(e)}, trying one-off conversion")
+        
         try:
             # First try with docx2pdf (requires MS Word)
             from docx2pdf import convert
@@ -300,11 +291,8 @@ class DocumentGenerator:
             logger.warning(f"docx2pdf conversion failed: docx2pdf is not implemented for linux as it requires Microsoft Word to be installed, trying LibreOffice")
             
             # Fallback to LibreOffice
-            cmd = ['libreoffice', '--headless', '--convert-to', 'pdf', '--outdir', 
-                   os.path.dirname(pdf_path), docx_path]
-            
             try:
-                subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+                convert_with_cli(docx_path, pdf_path)
                 logger.info(f"LibreOffice PDF conversion successful: {pdf_path}")
             except subprocess.CalledProcessError as e:
                 logger.error(f"LibreOffice conversion failed: {e}")
@@ -313,10 +301,10 @@ class DocumentGenerator:
                 logger.error("LibreOffice not found, cannot convert to PDF")
                 raise
 
-def generate_quote_documents(quote_data: Dict, template_dir: Optional[Path] = None, output_dir: Optional[Path] = None) -> Dict[str, str]:
+def generate_quote_documents(quote_data: Dict, template_dir: Optional[Path] = None, output_dir: Optional[Path] = None, renderer: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
     """Generate documents for a quote request."""
     template_dir = template_dir or os.getenv("TEMPLATE_DIR", "templates")
     output_dir = output_dir or os.getenv("OUTPUT_DIR", "output")
     
     generator = DocumentGenerator(template_dir, output_dir)
-    return generator.generate_quote_documents(quote_data) 
\ No newline at end of file
+    return generator.generate_quote_documents(quote_data, renderer=renderer) 
\ No newline at end of file
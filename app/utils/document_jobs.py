@@ -0,0 +1,144 @@
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+from app.database import generate_id
+from app.utils.document_generator import DocumentGenerator
+from app.utils.quote_repository import quote_repository
+from app.utils.document_manifest import document_manifest
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class JobStatus:
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+def primary_document_paths(documents: Dict[str, Dict[str, Optional[str]]]) -> Dict[str, Optional[str]]:
+    """Pick the DOCX/PDF paths stored on the quote row from a per-line documents dict."""
+    for line in ("auto", "home", "specialty"):
+        paths = documents.get(line) or {}
+        if paths.get("docx_path"):
+            return {"docx_path": paths.get("docx_path"), "pdf_path": paths.get("pdf_path")}
+    return {"docx_path": None, "pdf_path": None}
+
+class DocumentJobQueue:
+    """Runs quote document generation on a bounded worker pool.
+
+    Submissions enqueue a job and return its id immediately; workers render the
+    documents, write ``docx_path``/``pdf_path`` back to the quote and record the
+    outcome so callers can poll :meth:`get`.
+    """
+
+    def __init__(self, max_workers: int = 2, history_size: int = 1000):
+        """
+        Initialize the job queue.
+
+        Args:
+            max_workers: Number of concurrent generation workers
+            history_size: Number of finished jobs kept for status polling
+        """
+        self.max_workers = max_workers
+        self.history_size = history_size
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="docgen")
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, quote_record: Dict[str, Any]) -> str:
+        """
+        Enqueue document generation for a stored quote.
+
+        Args:
+            quote_record: Quote record as written to the quotes table
+
+        Returns:
+            ID of the queued job
+        """
+        job_id = generate_id()
+        job = {
+            "id": job_id,
+            "quote_id": quote_record["id"],
+            "agent_id": quote_record.get("agent_id"),
+            "status": JobStatus.QUEUED,
+            "created_at": datetime.utcnow().isoformat(),
+            "started_at": None,
+            "finished_at": None,
+            "documents": None,
+            "error": None
+        }
+        with self._lock:
+            self._jobs[job_id] = job
+            self._trim_history()
+
+        self._executor.submit(self._run, job_id, dict(quote_record))
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a snapshot of a job, or None if it is unknown or expired."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def _update(self, job_id: str, **fields) -> None:
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields)
+
+    def _trim_history(self) -> None:
+        """Drop the oldest finished jobs once the history is full."""
+        finished = [
+            job_id for job_id, job in self._jobs.items()
+            if job["status"] in (JobStatus.COMPLETED, JobStatus.FAILED)
+        ]
+        for job_id in finished[:max(0, len(self._jobs) - self.history_size)]:
+            del self._jobs[job_id]
+
+    def _run(self, job_id: str, quote_record: Dict[str, Any]) -> None:
+        self._update(job_id, status=JobStatus.RUNNING, started_at=datetime.utcnow().isoformat())
+        try:
+            generator = DocumentGenerator()
+            documents = generator.generate_quote_documents(quote_record)
+
+            quote_repository.update(quote_record["id"], primary_document_paths(documents))
+            document_manifest.add_many(
+                quote_record["id"],
+                [path for paths in documents.values() for path in (paths.get("docx_path"), paths.get("pdf_path")) if path],
+                "generated"
+            )
+
+            self._update(
+                job_id,
+                status=JobStatus.COMPLETED,
+                documents=documents,
+                finished_at=datetime.utcnow().isoformat()
+            )
+            logger.info(f"Document job {job_id} completed for quote {quote_record['id']}")
+        except Exception as e:
+            logger.error(f"Document job {job_id} failed: {str(e)}")
+            self._update(
+                job_id,
+                status=JobStatus.FAILED,
+                error=str(e),
+                finished_at=datetime.utcnow().isoformat()
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        """Job counts by status."""
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job["status"]] = counts.get(job["status"], 0) + 1
+        return {"max_workers": self.max_workers, "jobs": counts}
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting jobs and optionally wait for running ones to finish."""
+        self._executor.shutdown(wait=wait)
+
+# Shared queue used by the quote routes
+document_jobs = DocumentJobQueue(max_workers=int(os.getenv("DOCUMENT_WORKERS", "2")))
@@ -0,0 +1,173 @@
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+from app.database import get_table, generate_id, add_records, ensure_scalar_indexes, DOCUMENTS_SCHEMA
+from app.utils.quote_repository import quote_literal, quote_repository
+from app.utils.uploads import file_sha256
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class DocumentManifest:
+    """Index of a quote's files in the LanceDB ``documents`` table.
+
+    Every generated or uploaded file is recorded with its path, size, hash,
+    type and creation time, so listing a quote's documents is one indexed
+    query on ``quote_id`` rather than a directory walk.
+    """
+
+    def __init__(self, table_name: str = "documents"):
+        """
+        Initialize the manifest.
+
+        Args:
+            table_name: Name of the LanceDB table holding the manifest
+        """
+        self.table_name = table_name
+        self._indexed = False
+
+    @property
+    def table(self):
+        return get_table(self.table_name, schema=DOCUMENTS_SCHEMA)
+
+    def ensure_indexes(self) -> None:
+        """Create the scalar index on quote_id; deferred to the first write on an empty table."""
+        if ensure_scalar_indexes(self.table, self.table_name, ("quote_id",)) is not None:
+            self._indexed = True
+
+    def _index_after_write(self) -> None:
+        if self._indexed:
+            return
+        try:
+            self.ensure_indexes()
+        except Exception as e:
+            logger.warning(f"Could not build indexes on {self.table_name}: {str(e)}")
+
+    def _record(self, quote_id: str, path: str, source: str, sha256: Optional[str] = None,
+                filename: Optional[str] = None) -> Dict[str, Any]:
+        file_path = Path(path)
+        filename = filename or file_path.name
+        return {
+            "id": generate_id(),
+            "quote_id": quote_id,
+            "filename": filename,
+            "path": str(file_path),
+            "type": Path(filename).suffix.lstrip(".").lower(),
+            "source": source,
+            "size": file_path.stat().st_size,
+            "sha256": sha256 or file_sha256(file_path),
+            "created_at": datetime.utcnow().isoformat()
+        }
+
+    def add(self, quote_id: str, path: str, source: str, sha256: Optional[str] = None,
+            filename: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Record a file for a quote.
+
+        Args:
+            quote_id: ID of the quote the file belongs to
+            path: Path to the file on disk
+            source: "generated" or "upload"
+            sha256: Content hash, computed from the file if not given
+            filename: Name the file is listed under, if not the path's own
+                (a duplicate upload pointing at an already stored file)
+
+        Returns:
+            The manifest row
+        """
+        record = self._record(quote_id, path, source, sha256, filename)
+        add_records(self.table, [record])
+        self._index_after_write()
+        return record
+
+    def add_many(self, quote_id: str, paths: List[str], source: str) -> List[Dict[str, Any]]:
+        """Record several files for a quote in a single commit."""
+        records = [self._record(quote_id, path, source) for path in paths]
+        if records:
+            add_records(self.table, records)
+            self._index_after_write()
+        return records
+
+    def list(self, quote_id: str) -> List[Dict[str, Any]]:
+        """All files recorded for a quote, oldest first."""
+        rows = self.table.search().where(f"quote_id = {quote_literal(quote_id)}").to_list()
+        return sorted(rows, key=lambda row: row["created_at"])
+
+    def get(self, quote_id: str, filename: str) -> Optional[Dict[str, Any]]:
+        """The most recent file with this name recorded for a quote."""
+        rows = self.table.search().where(
+            f"quote_id = {quote_literal(quote_id)} AND filename = {quote_literal(filename)}"
+        ).to_list()
+        return max(rows, key=lambda row: row["created_at"]) if rows else None
+
+    def find_by_sha256(self, quote_id: str, sha256: str) -> Optional[str]:
+        """Path of a stored file of the quote with this content hash, if one is still on disk."""
+        rows = self.table.search().where(
+            f"quote_id = {quote_literal(quote_id)} AND sha256 = {quote_literal(sha256)}"
+        ).to_list()
+        for row in sorted(rows, key=lambda row: row["created_at"], reverse=True):
+            if Path(row["path"]).exists():
+                return row["path"]
+        return None
+
+    def remove(self, record_id: str) -> None:
+        """Drop a manifest row."""
+        self.table.delete(f"id = {quote_literal(record_id)}")
+
+    def references(self, path: str) -> int:
+        """Number of manifest rows pointing at a path (cached renders can be shared between quotes)."""
+        return self.table.count_rows(f"path = {quote_literal(path)}")
+
+    def delete(self, quote_id: str, filename: str) -> Optional[Dict[str, Any]]:
+        """
+        Delete a file from a quote.
+
+        Drops the quote's reference to the path (``documents`` and, if they
+        point at it, ``docx_path``/``pdf_path``), then the manifest row, then
+        unlinks the file unless another manifest row still references it. If
+        a step after the quote update fails, the quote and manifest row are
+        restored so the file stays listed and deletable.
+
+        Args:
+            quote_id: ID of the quote
+            filename: Name of the file
+
+        Returns:
+            The removed manifest row, or None if the quote has no such file
+        """
+        document = self.get(quote_id, filename)
+        if document is None:
+            return None
+        path = document["path"]
+
+        quote = quote_repository.get(quote_id)
+        changes: Dict[str, Any] = {}
+        if quote is not None:
+            documents = quote.get("documents") or []
+            if path in documents:
+                changes["documents"] = [item for item in documents if item != path]
+            for column in ("docx_path", "pdf_path"):
+                if quote.get(column) == path:
+                    changes[column] = None
+            if changes:
+                quote_repository.update(quote_id, changes)
+
+        removed = False
+        try:
+            self.remove(document["id"])
+            removed = True
+            if self.references(path) == 0 and os.path.exists(path):
+                os.unlink(path)
+        except Exception:
+            if removed:
+                add_records(self.table, [document])
+            if changes:
+                quote_repository.update(quote_id, {column: quote.get(column) for column in changes})
+            raise
+        return document
+
+# Shared manifest instance
+document_manifest = DocumentManifest()
@@ -0,0 +1,152 @@
+import os
+import re
+from email.utils import formatdate
+from pathlib import Path
+from typing import Iterator, Optional, Tuple, Union
+from urllib.parse import quote
+from fastapi import HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+
+# Default read size for streamed downloads
+CHUNK_SIZE = int(os.getenv("DOCUMENT_CHUNK_SIZE", str(64 * 1024)))
+
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+def file_etag(stat: os.stat_result) -> str:
+    """Strong ETag derived from inode, size and modification time."""
+    return f'"{stat.st_ino:x}-{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    return etag in (tag.strip() for tag in header.split(","))
+
+def content_disposition(filename: str) -> str:
+    """
+    ``attachment`` Content-Disposition value for a download name.
+
+    Header values must be latin-1, so non-ASCII names (client names in
+    generated documents) are sent RFC 5987 encoded in ``filename*``,
+    alongside an ASCII ``filename`` for older clients.
+    """
+    fallback = filename.encode("ascii", "replace").decode("ascii").replace("\\", "_").replace('"', "_")
+    encoded = quote(filename)
+    if encoded == filename:
+        return f'attachment; filename="{fallback}"'
+    return f'attachment; filename="{fallback}"; filename*=utf-8\'\'{encoded}'
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range ``Range`` header.
+
+    Args:
+        header: Value of the Range header, if any
+        size: Size of the file in bytes
+
+    Returns:
+        Inclusive (start, end) byte positions, or None to serve the whole file
+        (no header, or one that is malformed or invalid such as ``bytes=5-3``)
+
+    Raises:
+        HTTPException: 416 if a valid range cannot be satisfied
+    """
+    if not header:
+        return None
+    match = RANGE_PATTERN.match(header.strip())
+    if not match:
+        # Multiple or malformed ranges: fall back to the full body
+        return None
+
+    first, last = match.groups()
+    if first == "" and last == "":
+        return None
+    if first == "":
+        length = int(last)
+        if length == 0:
+            raise HTTPException(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                headers={"Content-Range": f"bytes */{size}"}
+            )
+        start, end = max(0, size - length), size - 1
+    else:
+        start = int(first)
+        if last and int(last) < start:
+            # Invalid range (RFC 9110 §14.2): ignore the header
+            return None
+        end = min(int(last), size - 1) if last else size - 1
+
+    if start >= size:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+    return start, end
+
+def iter_file(path: Path, start: int, end: int, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield bytes start..end (inclusive) of a file in fixed-size chunks."""
+    remaining = end - start + 1
+    with open(path, "rb") as file_object:
+        file_object.seek(start)
+        while remaining > 0:
+            chunk = file_object.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+def stream_file(
+    request: Request,
+    path: Union[str, Path],
+    media_type: str,
+    filename: Optional[str] = None,
+    chunk_size: int = CHUNK_SIZE
+) -> Response:
+    """
+    Build a streaming response for a file with Range and conditional GET support.
+
+    Repeat downloads presenting a matching ``If-None-Match`` get an empty 304,
+    and ``Range`` requests (honoured only while ``If-Range`` still matches)
+    get a 206 with just the requested bytes.
+
+    Args:
+        request: Incoming request, for its conditional and Range headers
+        path: Path to the file
+        media_type: Content type of the response
+        filename: Download name for Content-Disposition
+        chunk_size: Bytes read from disk per chunk
+    """
+    path = Path(path)
+    stat = path.stat()
+    etag = file_etag(stat)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(stat.st_mtime, usegmt=True),
+        "Accept-Ranges": "bytes"
+    }
+    if filename:
+        headers["Content-Disposition"] = content_disposition(filename)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    if not if_range or if_range.strip() == etag:
+        byte_range = parse_range(request.headers.get("range"), stat.st_size)
+
+    if byte_range is None:
+        start, end = 0, stat.st_size - 1
+        status_code = status.HTTP_200_OK
+    else:
+        start, end = byte_range
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+        headers["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+
+    headers["Content-Length"] = str(max(0, end - start + 1))
+    return StreamingResponse(
+        iter_file(path, start, end, chunk_size),
+        status_code=status_code,
+        media_type=media_type,
+        headers=headers
+    )
@@ -1,19 +1,8 @@
-import lancedb
-import os
 from datetime import datetime
 from typing import Dict, List, Optional
 from app.database import get_table, generate_id
-
-# Initialize LanceDB connection
-DB_PATH = os.getenv("DB_PATH", "data/lancedb")
-db = lancedb.connect(DB_PATH)
-
-def get_table(table_name: str):
-    """Get or create a table in LanceDB."""
-    try:
-        return db[table_name]
-    except KeyError:
-        return db.create_table(table_name)
+from app.utils.quote_repository import quote_repository
+from app.utils.quote_writer import quote_writer
 
 def insert_lead(lead_data: Dict):
     """Insert a new lead into the leads table."""
@@ -35,8 +24,6 @@ def get_leads(filters: Optional[Dict] = None) -> List[Dict]:
 
 def insert_quote_request(quote_data: Dict) -> Dict:
     """Insert a new quote request into the quotes table."""
-    table = get_table("quotes")
-    
     # Add metadata
     quote_data["id"] = generate_id()
     quote_data["created_at"] = datetime.utcnow().isoformat()
@@ -44,7 +31,7 @@ def insert_quote_request(quote_data: Dict) -> Dict:
     quote_data["status"] = quote_data.get("status", "pending")
     
     # Store in LanceDB
-    table.add([quote_data])
+    quote_writer.write(quote_data)
     
     return quote_data
 
@@ -61,24 +48,11 @@ def get_quote_requests(filters: Optional[Dict] = None) -> List[Dict]:
 
 def update_quote_status(quote_id: str, status: str) -> Dict:
     """Update the status of a quote request."""
-    table = get_table("quotes")
-    quotes = table.search().where(f"id = '{quote_id}'").to_list()
-    
-    if not quotes:
+    try:
+        return quote_repository.update(quote_id, {"status": status})
+    except KeyError:
         raise ValueError(f"Quote with ID {quote_id} not found")
-    
-    quote = quotes[0]
-    quote["status"] = status
-    quote["updated_at"] = datetime.utcnow().isoformat()
-    
-    # Delete and re-add the record (LanceDB doesn't support updates directly)
-    table.delete(f"id = '{quote_id}'")
-    table.add([quote])
-    
-    return quote
 
 def get_quote_by_id(quote_id: str) -> Optional[Dict]:
     """Get a quote request by its ID."""
-    table = get_table("quotes")
-    quotes = table.search().where(f"id = '{quote_id}'").to_list()
-    return quotes[0] if quotes else None 
\ No newline at end of file
+    return quote_repository.get(quote_id)
\ No newline at end of file
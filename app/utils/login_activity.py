@@ -0,0 +1,129 @@
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional
+
+import pyarrow as pa
+
+from app.database import get_table, coerce_value, conform_records
+from app.utils.agent_cache import agent_cache
+from app.utils.quote_repository import quote_literal
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class LoginActivityBuffer:
+    """Collects agent ``last_login`` timestamps and writes them in batches.
+
+    Rewriting the agent row on every login creates a table version per
+    login. Logins are recorded in memory instead (repeat logins by the same
+    agent collapse to the latest timestamp) and a background thread applies
+    them every ``flush_interval`` seconds as a single merge of just the
+    ``last_login`` column, or sooner once ``max_pending`` agents are
+    waiting. Pending timestamps are flushed on shutdown.
+    """
+
+    def __init__(self, table_name: str = "agents", flush_interval: float = 30.0, max_pending: int = 500):
+        """
+        Initialize the buffer.
+
+        Args:
+            table_name: Name of the agents table
+            flush_interval: Seconds between background flushes
+            max_pending: Number of pending agents that triggers an early flush
+        """
+        self.table_name = table_name
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.flushes = 0
+        self.written = 0
+
+    def record(self, email: str, timestamp: str) -> None:
+        """Queue a login timestamp for an agent."""
+        with self._lock:
+            self._pending[email] = timestamp
+            if len(self._pending) >= self.max_pending:
+                self._wake.set()
+
+    def flush(self) -> int:
+        """
+        Write all pending timestamps in one batch.
+
+        Returns:
+            Number of agents updated
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+
+            try:
+                table = get_table(self.table_name)
+                emails = ", ".join(quote_literal(email) for email in pending)
+                matched = table.search().where(f"email IN ({emails})").select(["email"]).limit(len(pending)).to_list()
+                agents = [{"email": row["email"], "last_login": pending[row["email"]]} for row in matched]
+
+                # Write only last_login so a concurrent change to the agent (e.g. disabling it) is kept
+                if agents and hasattr(table, "merge_insert"):
+                    schema = pa.schema([table.schema.field("email"), table.schema.field("last_login")])
+                    table.merge_insert("email").when_matched_update_all().execute(conform_records(agents, schema))
+                else:
+                    last_login_type = table.schema.field("last_login").type
+                    for agent in agents:
+                        table.update(
+                            where=f"email = {quote_literal(agent['email'])}",
+                            values={"last_login": coerce_value(agent["last_login"], last_login_type)}
+                        )
+            except Exception as e:
+                # Put the timestamps back unless newer logins superseded them
+                with self._lock:
+                    for email, timestamp in pending.items():
+                        self._pending.setdefault(email, timestamp)
+                logger.error(f"Error flushing login activity: {str(e)}")
+                return 0
+
+            for agent in agents:
+                agent_cache.invalidate(agent["email"])
+            self.flushes += 1
+            self.written += len(agents)
+            return len(agents)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def start(self) -> None:
+        """Start the background flush thread."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="login-activity", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread and flush what is still pending."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pending = len(self._pending)
+        return {"pending": pending, "flushes": self.flushes, "written": self.written}
+
+# Shared buffer fed by the login route
+login_activity = LoginActivityBuffer(
+    flush_interval=float(os.getenv("LOGIN_FLUSH_INTERVAL_SECONDS", "30")),
+    max_pending=int(os.getenv("LOGIN_FLUSH_MAX_PENDING", "500"))
+)
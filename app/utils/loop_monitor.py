@@ -0,0 +1,93 @@
+import asyncio
+import logging
+import os
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class EventLoopMonitor:
+    """Measures event-loop lag by timing a periodic sleep.
+
+    A task sleeps for ``interval`` seconds and records how much later than
+    scheduled it woke up. Any blocking call on the loop shows up as lag;
+    samples above ``warn_threshold`` are logged, and registered listeners are
+    called with every sample so they can forward it to other metrics sinks.
+    """
+
+    def __init__(self, interval: float = 0.5, warn_threshold: float = 0.1, window: int = 600):
+        """
+        Initialize the monitor.
+
+        Args:
+            interval: Seconds between lag samples
+            warn_threshold: Lag in seconds above which a warning is logged
+            window: Number of recent samples kept for percentiles
+        """
+        self.interval = interval
+        self.warn_threshold = warn_threshold
+        self._samples: "deque[float]" = deque(maxlen=window)
+        self._listeners: List[Callable[[float], None]] = []
+        self._task: Optional[asyncio.Task] = None
+        self.max_lag = 0.0
+        self.slow_ticks = 0
+
+    def add_listener(self, callback: Callable[[float], None]) -> None:
+        """Register a callback receiving each lag sample in seconds."""
+        self._listeners.append(callback)
+
+    def record(self, lag: float) -> None:
+        """Record one lag sample and notify listeners."""
+        self._samples.append(lag)
+        self.max_lag = max(self.max_lag, lag)
+        if lag > self.warn_threshold:
+            self.slow_ticks += 1
+            logger.warning(f"Event loop lag {lag * 1000:.1f}ms exceeds {self.warn_threshold * 1000:.0f}ms")
+        for callback in self._listeners:
+            try:
+                callback(lag)
+            except Exception as e:
+                logger.error(f"Event loop lag listener failed: {str(e)}")
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            scheduled = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.record(max(0.0, loop.time() - scheduled))
+
+    def start(self) -> None:
+        """Start sampling on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop sampling."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Lag summary over the recent window, in milliseconds."""
+        samples = sorted(self._samples)
+        if not samples:
+            return {"samples": 0, "last_ms": 0.0, "mean_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0, "slow_ticks": 0}
+        return {
+            "samples": len(samples),
+            "last_ms": self._samples[-1] * 1000,
+            "mean_ms": sum(samples) / len(samples) * 1000,
+            "p99_ms": samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000,
+            "max_ms": self.max_lag * 1000,
+            "slow_ticks": self.slow_ticks
+        }
+
+# Shared monitor started with the app
+loop_monitor = EventLoopMonitor(
+    interval=float(os.getenv("LOOP_LAG_INTERVAL_SECONDS", "0.5")),
+    warn_threshold=float(os.getenv("LOOP_LAG_WARN_MS", "100")) / 1000
+)
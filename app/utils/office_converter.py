@@ -0,0 +1,334 @@
+import logging
+import os
+import queue
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional, List
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# The UNO bindings ship with LibreOffice rather than on PyPI; point
+# LIBREOFFICE_PYTHONPATH at them (e.g. /usr/lib/python3/dist-packages)
+if os.getenv("LIBREOFFICE_PYTHONPATH"):
+    sys.path.append(os.getenv("LIBREOFFICE_PYTHONPATH"))
+
+try:
+    import uno
+    from com.sun.star.beans import PropertyValue
+except ImportError:
+    uno = None
+
+LIBREOFFICE_BIN = os.getenv("LIBREOFFICE_BIN", "libreoffice")
+
+def _property(name: str, value) -> "PropertyValue":
+    prop = PropertyValue()
+    prop.Name = name
+    prop.Value = value
+    return prop
+
+def convert_with_cli(docx_path: str, pdf_path: str, timeout: Optional[float] = None) -> None:
+    """
+    Convert DOCX to PDF with a one-off headless LibreOffice process.
+
+    Each call gets a throwaway user profile so several conversions can run at
+    once; LibreOffice refuses to start a second instance on a profile in use.
+
+    Args:
+        docx_path: Path to the DOCX file
+        pdf_path: Path of the PDF to produce (written next to it by LibreOffice)
+        timeout: Seconds to wait for the conversion
+    """
+    profile_dir = tempfile.mkdtemp(prefix="tcc-office-")
+    cmd = [
+        LIBREOFFICE_BIN, f"-env:UserInstallation={Path(profile_dir).as_uri()}",
+        '--headless', '--convert-to', 'pdf', '--outdir', os.path.dirname(pdf_path), docx_path
+    ]
+    try:
+        subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=timeout)
+    finally:
+        shutil.rmtree(profile_dir, ignore_errors=True)
+
+def _free_port() -> int:
+    """Ask the OS for an unused local TCP port."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+class OfficeInstance:
+    """A long-lived headless LibreOffice process reachable over a UNO socket."""
+
+    def __init__(self, port: Optional[int], profile_dir: Path, startup_timeout: float = 30.0):
+        """
+        Initialize an office instance.
+
+        Args:
+            port: Local TCP port the instance accepts UNO connections on; None
+                picks a free port each time the instance starts
+            profile_dir: User profile directory dedicated to this instance
+            startup_timeout: Seconds to wait for the instance to accept connections
+        """
+        self.fixed_port = port
+        self.port = port
+        self.profile_dir = Path(profile_dir)
+        self.startup_timeout = startup_timeout
+        self.process: Optional[subprocess.Popen] = None
+        self.desktop = None
+        self.conversions = 0
+
+    def start(self) -> None:
+        """
+        Launch the office process and connect to its desktop.
+
+        Raises:
+            RuntimeError: If the UNO bindings are missing or the instance does not come up;
+                a process that was launched is killed first
+        """
+        if uno is None:
+            raise RuntimeError("The LibreOffice UNO bindings are not importable")
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        self.port = self.fixed_port if self.fixed_port is not None else _free_port()
+        cmd = [
+            LIBREOFFICE_BIN,
+            f"-env:UserInstallation={self.profile_dir.resolve().as_uri()}",
+            f"--accept=socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext",
+            "--headless", "--invisible", "--nologo", "--nodefault", "--norestore", "--nolockcheck"
+        ]
+        self.process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self.conversions = 0
+        try:
+            self.desktop = self._connect()
+        except BaseException:
+            self.kill()
+            raise
+        logger.info(f"Office instance on port {self.port} started")
+
+    def _connect(self):
+        """Wait for the launched process to accept UNO connections and return its desktop."""
+        local_context = uno.getComponentContext()
+        resolver = local_context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local_context
+        )
+        deadline = time.monotonic() + self.startup_timeout
+        while True:
+            try:
+                context = resolver.resolve(
+                    f"uno:socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext"
+                )
+                return context.ServiceManager.createInstanceWithContext(
+                    "com.sun.star.frame.Desktop", context
+                )
+            except Exception:
+                if self.process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError(f"Office instance on port {self.port} failed to start")
+                time.sleep(0.25)
+
+    def is_healthy(self) -> bool:
+        """Check that the process is running and its desktop still answers."""
+        if self.process is None or self.process.poll() is not None or self.desktop is None:
+            return False
+        try:
+            self.desktop.getComponents()
+            return True
+        except Exception:
+            return False
+
+    def convert(self, docx_path: str, pdf_path: str) -> None:
+        """Convert a DOCX file to PDF in this instance."""
+        document = self.desktop.loadComponentFromURL(
+            uno.systemPathToFileUrl(os.path.abspath(docx_path)), "_blank", 0,
+            (_property("Hidden", True),)
+        )
+        if document is None:
+            raise RuntimeError(f"Office could not open {docx_path}")
+        try:
+            document.storeToURL(
+                uno.systemPathToFileUrl(os.path.abspath(pdf_path)),
+                (_property("FilterName", "writer_pdf_Export"),)
+            )
+        finally:
+            document.close(True)
+        self.conversions += 1
+
+    def stop(self) -> None:
+        """Shut the office process down, killing it if it does not exit."""
+        if self.desktop is not None:
+            try:
+                self.desktop.terminate()
+            except Exception:
+                pass
+            self.desktop = None
+        if self.process is not None:
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+            self.process = None
+
+    def kill(self) -> None:
+        """Kill the office process without asking it to shut down."""
+        self.desktop = None
+        if self.process is not None:
+            if self.process.poll() is None:
+                self.process.kill()
+            self.process.wait()
+            self.process = None
+
+    def restart(self) -> None:
+        self.stop()
+        self.start()
+
+class OfficeConverterPool:
+    """Pool of warm LibreOffice instances for DOCX to PDF conversion.
+
+    Each instance has its own profile directory and port and serves one
+    conversion at a time. Instances are health-checked before use and
+    recycled after a failure or after ``max_conversions`` documents.
+
+    Every uvicorn/gunicorn worker builds its own pool, so by default ports
+    are picked free from the OS and profile directories carry the worker's
+    PID; a fixed ``base_port`` is only safe with a single worker.
+    """
+
+    def __init__(self, size: int = 2, base_port: Optional[int] = None, profile_root: Optional[str] = None,
+                 max_conversions: int = 200, startup_timeout: float = 30.0):
+        """
+        Initialize the converter pool.
+
+        Args:
+            size: Number of office instances
+            base_port: First UNO port; instance i listens on base_port + i.
+                None picks a free port for each instance
+            profile_root: Directory holding one profile directory per instance
+            max_conversions: Conversions after which an instance is restarted
+            startup_timeout: Seconds to wait for an instance to start
+        """
+        profile_root = Path(profile_root or Path(tempfile.gettempdir()) / "tcc-office-profiles")
+        self.size = size
+        self.max_conversions = max_conversions
+        self._instances: List[OfficeInstance] = [
+            OfficeInstance(
+                base_port + i if base_port is not None else None,
+                profile_root / f"instance-{os.getpid()}-{i}",
+                startup_timeout
+            )
+            for i in range(size)
+        ]
+        self._idle: "queue.Queue[OfficeInstance]" = queue.Queue()
+        for instance in self._instances:
+            self._idle.put(instance)
+        self.recycled = 0
+
+    def convert(self, docx_path: str, pdf_path: str, timeout: Optional[float] = None) -> None:
+        """
+        Convert a DOCX file to PDF on the next free instance.
+
+        Args:
+            docx_path: Path to the DOCX file
+            pdf_path: Path of the PDF to produce
+            timeout: Seconds to wait for a free instance
+
+        Raises:
+            TimeoutError: If no instance frees up in time
+        """
+        try:
+            instance = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError("No office instance available for conversion")
+
+        try:
+            if not instance.is_healthy():
+                if instance.process is not None:
+                    logger.warning(f"Office instance on port {instance.port} is unhealthy, restarting")
+                    self.recycled += 1
+                instance.restart()
+            try:
+                instance.convert(docx_path, pdf_path)
+            except Exception:
+                # A failed conversion can leave the instance wedged; start fresh next time
+                instance.stop()
+                self.recycled += 1
+                raise
+            if instance.conversions >= self.max_conversions:
+                instance.stop()
+                self.recycled += 1
+        finally:
+            self._idle.put(instance)
+
+    def warm(self) -> None:
+        """
+        Start every instance that is not already running.
+
+        All instances are taken out of the idle queue first and each is put
+        back once started, so a conversion arriving meanwhile waits for a
+        started instance instead of racing the warm-up. Failures are logged
+        and left to the health check on first use.
+        """
+        instances = [self._idle.get() for _ in range(self.size)]
+        for instance in instances:
+            try:
+                if not instance.is_healthy():
+                    instance.restart()
+            except Exception as e:
+                logger.warning(f"Office instance failed to start during warm-up: {str(e)}")
+            finally:
+                self._idle.put(instance)
+
+    def shutdown(self) -> None:
+        """Stop every office instance."""
+        for instance in self._instances:
+            instance.stop()
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "idle": self._idle.qsize(),
+            "running": sum(1 for i in self._instances if i.process is not None),
+            "recycled": self.recycled
+        }
+
+_pool: Optional[OfficeConverterPool] = None
+_pool_lock = threading.Lock()
+
+def get_converter_pool() -> Optional[OfficeConverterPool]:
+    """
+    Return the shared converter pool, creating it on first use.
+
+    Returns None when the UNO bindings are not importable or the pool is
+    disabled with OFFICE_POOL_SIZE=0, in which case callers should fall back
+    to :func:`convert_with_cli`.
+    """
+    global _pool
+    size = int(os.getenv("OFFICE_POOL_SIZE", "2"))
+    if uno is None or size <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = OfficeConverterPool(
+                size=size,
+                base_port=int(os.getenv("OFFICE_BASE_PORT")) if os.getenv("OFFICE_BASE_PORT") else None,
+                profile_root=os.getenv("OFFICE_PROFILE_DIR"),
+                max_conversions=int(os.getenv("OFFICE_MAX_CONVERSIONS", "200"))
+            )
+        return _pool
+
+def warm_converter_pool() -> None:
+    """Start the shared pool's office instances ahead of the first conversion."""
+    pool = get_converter_pool()
+    if pool is not None:
+        pool.warm()
+
+def shutdown_converter_pool() -> None:
+    """Stop the shared converter pool if it was started."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
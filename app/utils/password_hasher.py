@@ -0,0 +1,158 @@
+import asyncio
+import bisect
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Sequence
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the latency histogram buckets, in milliseconds
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+class LatencyHistogram:
+    """Cumulative-bucket latency histogram (Prometheus style)."""
+
+    def __init__(self, buckets_ms: Sequence[float] = LATENCY_BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self._counts = [0] * (len(self.buckets_ms) + 1)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_ms = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Record one duration."""
+        milliseconds = seconds * 1000
+        with self._lock:
+            self._counts[bisect.bisect_left(self.buckets_ms, milliseconds)] += 1
+            self.count += 1
+            self.total_ms += milliseconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Cumulative counts per upper bound, plus count and sum."""
+        with self._lock:
+            buckets = {}
+            running = 0
+            for bound, count in zip(self.buckets_ms, self._counts):
+                running += count
+                buckets[f"le_{bound}"] = running
+            buckets["le_inf"] = running + self._counts[-1]
+            return {"buckets": buckets, "count": self.count, "sum_ms": self.total_ms}
+
+class PasswordHasher:
+    """Runs password hashing and verification on a bounded worker pool.
+
+    bcrypt costs hundreds of milliseconds of CPU per call; done inline in an
+    async endpoint it stalls every request on the worker. Calls here run on a
+    small thread pool (bcrypt releases the GIL while hashing) behind a queue
+    limit: once ``max_queue`` calls are waiting or running, new ones are
+    rejected with a 503 so a login burst is shed instead of starving quote
+    traffic.
+    """
+
+    def __init__(self, context: CryptContext, max_workers: int = 2, max_queue: int = 32):
+        """
+        Initialize the hasher.
+
+        Args:
+            context: Passlib context that performs the hashing
+            max_workers: Number of concurrent hash/verify calls
+            max_queue: Calls allowed in flight (running plus waiting) before rejecting
+        """
+        self.context = context
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="passwords")
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.rejected = 0
+        self.histograms = {
+            "hash": LatencyHistogram(),
+            "verify": LatencyHistogram(),
+            "queue_wait": LatencyHistogram()
+        }
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self.in_flight >= self.max_queue:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many authentication requests, please retry shortly",
+                    headers={"Retry-After": "1"}
+                )
+            self.in_flight += 1
+
+    def _release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    async def _submit(self, operation: str, func: Callable[..., Any], *args) -> Any:
+        self._acquire()
+        try:
+            submitted = time.perf_counter()
+
+            def timed():
+                started = time.perf_counter()
+                self.histograms["queue_wait"].observe(started - submitted)
+                try:
+                    return func(*args)
+                finally:
+                    self.histograms[operation].observe(time.perf_counter() - started)
+
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, timed)
+        finally:
+            self._release()
+
+    async def hash(self, password: str) -> str:
+        """
+        Hash a password on the worker pool.
+
+        Raises:
+            HTTPException: 503 if the queue is full
+        """
+        return await self._submit("hash", self.context.hash, password)
+
+    async def verify(self, password: str, hashed_password: Optional[str]) -> bool:
+        """
+        Verify a password against its hash on the worker pool.
+
+        Raises:
+            HTTPException: 503 if the queue is full
+        """
+        if not hashed_password:
+            return False
+        return await self._submit("verify", self.context.verify, password, hashed_password)
+
+    def needs_update(self, hashed_password: Optional[str]) -> bool:
+        """Whether a stored hash uses an outdated scheme or cost and should be rehashed."""
+        return bool(hashed_password) and self.context.needs_update(hashed_password)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue state, rejections and latency histograms."""
+        with self._lock:
+            state = {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "in_flight": self.in_flight,
+                "rejected": self.rejected
+            }
+        state["latency"] = {name: histogram.snapshot() for name, histogram in self.histograms.items()}
+        return state
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker pool."""
+        self._executor.shutdown(wait=wait)
+
+# Shared hasher used by the login and register routes
+password_hasher = PasswordHasher(
+    CryptContext(schemes=["bcrypt"], deprecated="auto"),
+    max_workers=int(os.getenv("PASSWORD_WORKERS", str(min(4, os.cpu_count() or 1)))),
+    max_queue=int(os.getenv("PASSWORD_QUEUE_LIMIT", "32"))
+)
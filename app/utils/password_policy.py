@@ -0,0 +1,158 @@
+import logging
+import math
+import os
+import time
+from typing import Any, Dict, Optional
+from passlib.context import CryptContext
+from passlib.hash import argon2, bcrypt
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+SCHEMES = ("bcrypt", "argon2")
+
+# Cost bounds; tuning never goes below the floor even on slow hosts
+BCRYPT_ROUNDS_RANGE = (10, 16)
+ARGON2_TIME_COST_RANGE = (2, 12)
+
+BENCHMARK_PASSWORD = "benchmark-password"
+
+def _time_hash(handler, samples: int = 3, **settings) -> float:
+    """Fastest of a few hash timings, in seconds."""
+    configured = handler.using(**settings)
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        configured.hash(BENCHMARK_PASSWORD)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+def _clamp(value: int, bounds) -> int:
+    return max(bounds[0], min(bounds[1], value))
+
+def tune_bcrypt_rounds(target_seconds: float, bounds=BCRYPT_ROUNDS_RANGE) -> int:
+    """
+    Pick the bcrypt rounds whose hash time is closest to the target without exceeding it.
+
+    Each extra round doubles the work, so one measurement at the floor is enough.
+
+    Args:
+        target_seconds: Desired verify latency
+        bounds: (min, max) rounds
+
+    Returns:
+        Number of rounds
+    """
+    measured = _time_hash(bcrypt, rounds=bounds[0])
+    if measured >= target_seconds:
+        return bounds[0]
+    return _clamp(bounds[0] + int(math.floor(math.log2(target_seconds / measured))), bounds)
+
+def tune_argon2_time_cost(
+    target_seconds: float,
+    memory_cost: int,
+    parallelism: int,
+    bounds=ARGON2_TIME_COST_RANGE
+) -> int:
+    """
+    Pick the argon2 time cost for a target latency at a fixed memory cost.
+
+    Argon2 time grows linearly with the number of passes.
+
+    Args:
+        target_seconds: Desired verify latency
+        memory_cost: Memory per hash in KiB
+        parallelism: Lanes per hash
+        bounds: (min, max) time cost
+
+    Returns:
+        Time cost (passes over memory)
+    """
+    measured = _time_hash(argon2, time_cost=bounds[0], memory_cost=memory_cost, parallelism=parallelism)
+    return _clamp(int(bounds[0] * target_seconds / measured), bounds)
+
+class PasswordPolicy:
+    """Chooses the password hashing scheme and cost for this host.
+
+    The cost is benchmarked at startup so a verify takes about
+    ``target_ms`` on the current hardware, and is used as the minimum: hashes
+    made with an older scheme or a lower cost report ``needs_update`` and are
+    rehashed on the agent's next successful login.
+    """
+
+    def __init__(
+        self,
+        scheme: str = "bcrypt",
+        target_ms: float = 250,
+        cost: Optional[int] = None,
+        argon2_memory_cost: int = 65536,
+        argon2_parallelism: int = 2
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            scheme: Preferred scheme, "bcrypt" or "argon2"
+            target_ms: Target verify latency used when benchmarking
+            cost: Fixed bcrypt rounds / argon2 time cost; skips benchmarking
+            argon2_memory_cost: Argon2 memory per hash in KiB
+            argon2_parallelism: Argon2 lanes per hash
+        """
+        if scheme not in SCHEMES:
+            raise ValueError(f"Unknown password scheme '{scheme}', expected one of {SCHEMES}")
+        if scheme == "argon2" and not argon2.has_backend():
+            logger.warning("argon2 requested but argon2-cffi is not installed, using bcrypt")
+            scheme = "bcrypt"
+        self.scheme = scheme
+        self.target_ms = target_ms
+        self.cost = cost
+        self.argon2_memory_cost = argon2_memory_cost
+        self.argon2_parallelism = argon2_parallelism
+        self.benchmark_ms: Optional[float] = None
+
+    def tune(self) -> int:
+        """Benchmark the host and set the cost, unless one was configured."""
+        if self.cost is None:
+            started = time.perf_counter()
+            if self.scheme == "argon2":
+                self.cost = tune_argon2_time_cost(
+                    self.target_ms / 1000, self.argon2_memory_cost, self.argon2_parallelism
+                )
+            else:
+                self.cost = tune_bcrypt_rounds(self.target_ms / 1000)
+            self.benchmark_ms = (time.perf_counter() - started) * 1000
+            logger.info(f"Password policy: {self.scheme} cost {self.cost} for a {self.target_ms:.0f}ms target")
+        return self.cost
+
+    def build_context(self) -> CryptContext:
+        """CryptContext hashing with the preferred scheme and flagging everything else for update."""
+        cost = self.tune()
+        other = "bcrypt" if self.scheme == "argon2" else "argon2"
+        settings: Dict[str, Any] = {}
+        if self.scheme == "argon2":
+            settings.update(
+                argon2__rounds=cost,
+                argon2__min_rounds=cost,
+                argon2__memory_cost=self.argon2_memory_cost,
+                argon2__parallelism=self.argon2_parallelism
+            )
+        else:
+            settings.update(bcrypt__rounds=cost, bcrypt__min_rounds=cost)
+        return CryptContext(schemes=[self.scheme, other], default=self.scheme, deprecated=[other], **settings)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "scheme": self.scheme,
+            "cost": self.cost,
+            "target_ms": self.target_ms,
+            "benchmark_ms": self.benchmark_ms
+        }
+
+# Shared policy, applied to the password hasher at startup
+password_policy = PasswordPolicy(
+    scheme=os.getenv("PASSWORD_SCHEME", "bcrypt"),
+    target_ms=float(os.getenv("PASSWORD_TARGET_MS", "250")),
+    cost=int(os.environ["PASSWORD_COST"]) if os.getenv("PASSWORD_COST") else None,
+    argon2_memory_cost=int(os.getenv("ARGON2_MEMORY_KIB", "65536")),
+    argon2_parallelism=int(os.getenv("ARGON2_PARALLELISM", "2"))
+)
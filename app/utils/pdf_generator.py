@@ -3,8 +3,11 @@ import logging
 from pathlib import Path
 from docx2pdf import convert
 from datetime import datetime, timedelta
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Any
+from concurrent.futures import ThreadPoolExecutor
 import shutil
+import time
+from app.utils.office_converter import get_converter_pool
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -46,9 +49,13 @@ class PDFGenerator:
             pdf_dir = self.output_dir / docx_path.parent.name
             pdf_dir.mkdir(parents=True, exist_ok=True)
             
-            # Generate PDF
+            # Generate PDF, on a warm LibreOffice instance when the pool is available
             pdf_path = pdf_dir / output_filename
-            convert(docx_path, pdf_path)
+            pool = get_converter_pool()
+            if pool is not None:
+                pool.convert(str(docx_path), str(pdf_path))
+            else:
+                convert(docx_path, pdf_path)
             
             logger.info(f"PDF generated successfully: {pdf_path}")
             return str(pdf_path)
@@ -57,6 +64,37 @@ class PDFGenerator:
             logger.error(f"Error generating PDF: {str(e)}")
             raise
     
+    def generate_pdfs_batch(self, docx_paths: List[str], max_workers: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Convert many DOCX files to PDF with bounded concurrency.
+        
+        Failures are recorded per file instead of aborting the batch.
+        
+        Args:
+            docx_paths: Paths to the DOCX files
+            max_workers: Maximum concurrent conversions (defaults to PDF_BATCH_WORKERS)
+            
+        Returns:
+            Dictionary mapping each DOCX path to its pdf_path, seconds and error
+        """
+        max_workers = max_workers or int(os.getenv("PDF_BATCH_WORKERS", "4"))
+        
+        def convert_one(docx_path: str) -> Dict[str, Any]:
+            start = time.perf_counter()
+            try:
+                pdf_path = self.generate_pdf(docx_path)
+                return {"pdf_path": pdf_path, "seconds": time.perf_counter() - start, "error": None}
+            except Exception as e:
+                return {"pdf_path": None, "seconds": time.perf_counter() - start, "error": str(e)}
+        
+        unique_paths = list(dict.fromkeys(str(p) for p in docx_paths))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = dict(zip(unique_paths, executor.map(convert_one, unique_paths)))
+        
+        failures = sum(1 for result in results.values() if result["error"])
+        logger.info(f"Batch PDF conversion finished: {len(results) - failures} converted, {failures} failed")
+        return results
+    
     def generate_pdfs_for_quote(self, quote_data: Dict, docx_paths: List[str]) -> Dict[str, str]:
         """
         Generate PDFs for all quote types in a request.
@@ -70,14 +108,15 @@ class PDFGenerator:
         """
         try:
             pdf_paths = {}
+            results = self.generate_pdfs_batch(docx_paths)
             
-            for docx_path in docx_paths:
+            for docx_path, result in results.items():
+                if result["error"]:
+                    raise RuntimeError(f"PDF conversion failed for {docx_path}: {result['error']}")
+                
                 # Extract quote type from path
                 quote_type = Path(docx_path).parent.name
-                
-                # Generate PDF
-                pdf_path = self.generate_pdf(docx_path)
-                pdf_paths[quote_type] = pdf_path
+                pdf_paths[quote_type] = result["pdf_path"]
             
             return pdf_paths
             
@@ -147,6 +186,10 @@ pdf_paths = pdf_gen.generate_pdfs_for_quote(
     ["output/auto/quote_20240101.docx", "output/home/quote_20240101.docx"]
 )
 
+# Convert a day's worth of documents, four at a time
+results = pdf_gen.generate_pdfs_batch(docx_files, max_workers=4)
+failed = {path: r["error"] for path, r in results.items() if r["error"]}
+
 # Clean up old files
 pdf_gen.cleanup_old_files(retention_days=7)
 
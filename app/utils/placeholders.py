@@ -0,0 +1,91 @@
+import re
+from bisect import bisect_right
+from typing import Dict, Any, Iterator
+
+# Matches {{key}}; keys in quote-request-form/placeholders.txt may contain hyphens
+PLACEHOLDER_PATTERN = re.compile(r"\{\{([\w\-]+)\}\}")
+
+def substitute_text(text: str, replacements: Dict[str, Any]) -> str:
+    """Fill every known ``{{key}}`` in a string in one regex pass; unknown keys are left as-is."""
+    def fill(match):
+        key = match.group(1)
+        return str(replacements[key]) if key in replacements else match.group(0)
+    return PLACEHOLDER_PATTERN.sub(fill, text)
+
+def fill_paragraph(paragraph, replacements: Dict[str, Any]) -> int:
+    """
+    Fill the placeholders of a python-docx paragraph in place.
+
+    Word often splits ``{{key}}`` across several runs. The run texts are joined,
+    scanned once, and each match is written into the run where it starts, with
+    the rest of the token cut from the following runs, so run formatting
+    outside the placeholders is preserved.
+
+    Args:
+        paragraph: python-docx Paragraph
+        replacements: Placeholder keys mapped to their values
+
+    Returns:
+        Number of placeholders filled
+    """
+    runs = paragraph.runs
+    texts = [run.text for run in runs]
+    starts = []
+    position = 0
+    for text in texts:
+        starts.append(position)
+        position += len(text)
+
+    matches = [m for m in PLACEHOLDER_PATTERN.finditer("".join(texts)) if m.group(1) in replacements]
+    if not matches:
+        # Placeholders outside plain runs (e.g. inside hyperlinks) are only visible in paragraph.text
+        text = paragraph.text
+        filled = substitute_text(text, replacements)
+        if filled != text:
+            paragraph.text = filled
+            return 1
+        return 0
+
+    # Work right to left so earlier run offsets stay valid
+    for match in reversed(matches):
+        value = str(replacements[match.group(1)])
+        first = bisect_right(starts, match.start()) - 1
+        last = bisect_right(starts, match.end() - 1) - 1
+        head = match.start() - starts[first]
+        tail = match.end() - starts[last]
+        if first == last:
+            texts[first] = texts[first][:head] + value + texts[first][tail:]
+        else:
+            texts[first] = texts[first][:head] + value
+            for index in range(first + 1, last):
+                texts[index] = ""
+            texts[last] = texts[last][tail:]
+
+    for run, text in zip(runs, texts):
+        if run.text != text:
+            run.text = text
+    return len(matches)
+
+def iter_paragraphs(doc) -> Iterator:
+    """Yield body paragraphs followed by the paragraphs of every table cell."""
+    yield from doc.paragraphs
+    for table in doc.tables:
+        for row in table.rows:
+            for cell in row.cells:
+                yield from cell.paragraphs
+
+def replace_placeholders(doc, replacements: Dict[str, Any]) -> int:
+    """
+    Fill placeholders throughout a python-docx Document.
+
+    Cost is one regex pass per paragraph regardless of how many keys the
+    mapping holds.
+
+    Args:
+        doc: python-docx Document
+        replacements: Placeholder keys mapped to their values
+
+    Returns:
+        Number of placeholders filled
+    """
+    return sum(fill_paragraph(paragraph, replacements) for paragraph in iter_paragraphs(doc))
@@ -0,0 +1,294 @@
+import base64
+import json
+import logging
+from datetime import datetime
+import pyarrow as pa
+from typing import Dict, List, Optional, Any, Iterable, Sequence, Tuple
+
+from app.database import get_table, add_records, conform_records, ensure_scalar_indexes
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Quote lines, each mirrored in a has_<line> boolean column
+QUOTE_LINES = ("AUTO", "HOME", "SPECIALTY")
+
+# Columns that single-quote lookups and list pages filter on
+INDEXED_COLUMNS = ("id", "agent_id", "created_at", "has_auto", "has_home", "has_specialty", "quote_types")
+
+# Scalar index type for columns that should not get the default BTREE
+INDEX_TYPES = {
+    "has_auto": "BITMAP",
+    "has_home": "BITMAP",
+    "has_specialty": "BITMAP",
+    "quote_types": "LABEL_LIST"
+}
+
+# Columns returned by list views unless others are requested
+SUMMARY_FIELDS = ("id", "client_name", "client_email", "quote_types", "status", "created_at", "updated_at")
+
+
+def quote_literal(value: Any) -> str:
+    """Render a value as a SQL string literal for LanceDB filters."""
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def timestamp_literal(value: Any) -> str:
+    """Render a datetime or ISO string as a timestamp literal for LanceDB filters."""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    return f"timestamp {quote_literal(value)}"
+
+
+def with_quote_line_flags(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a quote record with has_auto/has_home/has_specialty derived from quote_types."""
+    lines = {str(line).upper() for line in record.get("quote_types") or []}
+    return {**record, **{f"has_{line.lower()}": line in lines for line in QUOTE_LINES}}
+
+
+def quote_type_filter(quote_type: str, schema: pa.Schema) -> str:
+    """
+    SQL condition matching quotes that include a quote line.
+
+    Uses the indexed has_<line> column, or array_has on quote_types for
+    tables that predate those columns.
+
+    Raises:
+        ValueError: If the quote type is unknown
+    """
+    line = quote_type.upper()
+    if line not in QUOTE_LINES:
+        raise ValueError(f"Unknown quote type '{quote_type}'")
+    column = f"has_{line.lower()}"
+    if column in schema.names:
+        return f"{column} = true"
+    return f"array_has(quote_types, {quote_literal(line)})"
+
+
+def encode_cursor(created_at: Any, quote_id: str) -> str:
+    """Opaque page cursor for the (created_at, id) keyset position."""
+    if isinstance(created_at, datetime):
+        created_at = created_at.isoformat()
+    return base64.urlsafe_b64encode(json.dumps([created_at, quote_id]).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    Decode a page cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        created_at, quote_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    return str(created_at), str(quote_id)
+
+
+class QuoteRepository:
+    """Access layer for the LanceDB ``quotes`` table.
+
+    Lookups go through scalar indexes on ``id`` and ``agent_id`` and edits are
+    written with a single merge-insert keyed on ``id`` instead of a delete
+    followed by an add, so each edit produces one table version.
+    """
+
+    def __init__(self, table_name: str = "quotes"):
+        """
+        Initialize the repository.
+
+        Args:
+            table_name: Name of the LanceDB table holding quotes
+        """
+        self.table_name = table_name
+        self._indexed = False
+
+    @property
+    def table(self):
+        return get_table(self.table_name)
+
+    def ensure_indexes(self) -> List[str]:
+        """
+        Create the scalar indexes used for lookups and list filters.
+
+        Safe to call on every startup. On an empty table nothing is built yet;
+        the first write through the repository builds them instead.
+
+        Returns:
+            List of indexed columns
+        """
+        indexed = ensure_scalar_indexes(self.table, self.table_name, INDEXED_COLUMNS, INDEX_TYPES)
+        if indexed is None:
+            return []
+        self._indexed = True
+        return indexed
+
+    def _index_after_write(self) -> None:
+        if self._indexed:
+            return
+        try:
+            self.ensure_indexes()
+        except Exception as e:
+            logger.warning(f"Could not build indexes on {self.table_name}: {str(e)}")
+
+    def _where(self, quote_id: str, agent_id: Optional[str] = None) -> str:
+        where = f"id = {quote_literal(quote_id)}"
+        if agent_id is not None:
+            where += f" AND agent_id = {quote_literal(agent_id)}"
+        return where
+
+    def get(self, quote_id: str, agent_id: Optional[str] = None) -> Optional[Dict]:
+        """
+        Fetch a single quote by primary key.
+
+        Args:
+            quote_id: ID of the quote
+            agent_id: Optional owning agent; quotes owned by others are not returned
+
+        Returns:
+            The quote record, or None if it does not exist
+        """
+        rows = self.table.search().where(self._where(quote_id, agent_id)).limit(1).to_list()
+        return rows[0] if rows else None
+
+    def list_page(
+        self,
+        agent_id: str,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        fields: Sequence[str] = SUMMARY_FIELDS,
+        filters: Optional[Iterable[str]] = None,
+        quote_type: Optional[str] = None
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Fetch one page of an agent's quotes, newest first.
+
+        Pages are keyed on (created_at, id), so each page filters past the
+        previous one instead of skipping rows, and only the requested columns
+        are read. LanceDB scans have no ORDER BY, so the projected rows that
+        pass the keyset filter are sorted in Arrow before the page is cut.
+
+        Args:
+            agent_id: Owning agent
+            limit: Maximum number of quotes to return
+            cursor: Cursor returned with the previous page
+            fields: Columns to return
+            filters: Extra SQL conditions, ANDed together
+            quote_type: Only quotes that include this quote line
+
+        Returns:
+            The page of quotes and the cursor for the next page, if any
+
+        Raises:
+            ValueError: If the cursor, a field or the quote type is unknown
+        """
+        table = self.table
+        unknown = [field for field in fields if field not in table.schema.names]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+        conditions = [f"agent_id = {quote_literal(agent_id)}", *(filters or [])]
+        if quote_type:
+            conditions.append(quote_type_filter(quote_type, table.schema))
+        if cursor:
+            created_at, quote_id = decode_cursor(cursor)
+            literal = timestamp_literal if pa.types.is_timestamp(table.schema.field("created_at").type) else quote_literal
+            conditions.append(
+                f"(created_at < {literal(created_at)} OR "
+                f"(created_at = {literal(created_at)} AND id < {quote_literal(quote_id)}))"
+            )
+
+        columns = list(dict.fromkeys([*fields, "created_at", "id"]))
+        rows = (
+            table.search()
+            .where(" AND ".join(conditions))
+            .select(columns)
+            .to_arrow()
+            .sort_by([("created_at", "descending"), ("id", "descending")])
+            .slice(0, limit + 1)
+            .to_pylist()
+        )
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+        return [{field: row[field] for field in fields} for row in rows], next_cursor
+
+    def add(self, records: Iterable[Dict]) -> None:
+        """Append new quotes in a single commit, conformed to the table schema."""
+        add_records(self.table, [with_quote_line_flags(record) for record in records])
+        self._index_after_write()
+
+    def upsert(self, records: Iterable[Dict]) -> None:
+        """
+        Insert or replace quotes keyed on ``id`` in a single commit.
+
+        Args:
+            records: Full quote records to write
+        """
+        records = [with_quote_line_flags(record) for record in records]
+        if not records:
+            return
+
+        table = self.table
+        data = conform_records(records, table.schema)
+        if hasattr(table, "merge_insert"):
+            (
+                table.merge_insert("id")
+                .when_matched_update_all()
+                .when_not_matched_insert_all()
+                .execute(data)
+            )
+        else:
+            # Older LanceDB releases have no merge-insert; fall back to a batched rewrite
+            ids = ", ".join(quote_literal(record["id"]) for record in records)
+            table.delete(f"id IN ({ids})")
+            table.add(data)
+        self._index_after_write()
+
+    def update(self, quote_id: str, changes: Dict[str, Any], agent_id: Optional[str] = None) -> Dict:
+        """
+        Apply changes to an existing quote and bump ``updated_at``.
+
+        Args:
+            quote_id: ID of the quote to update
+            changes: Column values to set
+            agent_id: Optional owning agent the quote must belong to
+
+        Returns:
+            The updated quote record
+
+        Raises:
+            KeyError: If the quote does not exist
+        """
+        quote = self.get(quote_id, agent_id)
+        if quote is None:
+            raise KeyError(quote_id)
+
+        changes = {**changes, "updated_at": datetime.utcnow().isoformat()}
+        if "quote_types" in changes:
+            changes = with_quote_line_flags(changes)
+
+        # Only the changed columns are merged, so concurrent updates to other
+        # columns (document paths, status) are not reverted. table.update is
+        # not used because it cannot set list columns to an empty list.
+        table = self.table
+        if hasattr(table, "merge_insert"):
+            columns = ["id", *(column for column in changes if column in table.schema.names and column != "id")]
+            schema = pa.schema([table.schema.field(column) for column in columns])
+            (
+                table.merge_insert("id")
+                .when_matched_update_all()
+                .execute(conform_records([{**changes, "id": quote_id}], schema))
+            )
+        else:
+            self.upsert([{**quote, **changes}])
+
+        quote.update(changes)
+        return quote
+
+
+# Shared repository instance
+quote_repository = QuoteRepository()
@@ -0,0 +1,159 @@
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.utils.quote_repository import QuoteRepository, quote_repository
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+class QuoteWriteBuffer:
+    """Group-commits quote inserts.
+
+    Each ``table.add`` is its own Lance commit with its own data file, so
+    one-row inserts during a submission spike leave a one-row fragment and
+    a manifest version per quote. Submitted records are queued instead and
+    a single writer thread commits them together: a batch closes once
+    ``max_batch`` records are waiting or ``max_delay`` seconds after its
+    first record arrived. Records that queue up while a commit is in flight
+    go into the next batch, so batches grow with load.
+
+    ``submit`` returns a future that resolves once the record's batch has
+    been committed. If a batch fails, its records are retried one at a time
+    so each caller gets its own outcome.
+    """
+
+    def __init__(self, repository: QuoteRepository, max_batch: int = 256, max_delay: float = 0.005):
+        """
+        Initialize the buffer.
+
+        Args:
+            repository: Quote repository the batches are written through
+            max_batch: Maximum number of records per commit
+            max_delay: Seconds a batch waits for more records after its first one
+        """
+        self.repository = repository
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.batches = 0
+        self.written = 0
+        self.failed = 0
+        self.largest_batch = 0
+
+    def submit(self, record: Dict[str, Any]) -> Future:
+        """
+        Queue a quote for insertion.
+
+        Returns:
+            Future resolved when the quote is committed, or failed with the write error
+        """
+        future: Future = Future()
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="quote-writer", daemon=True)
+                self._thread.start()
+            self._queue.put((record, future))
+        return future
+
+    def write(self, record: Dict[str, Any], timeout: Optional[float] = None) -> None:
+        """Queue a quote and block until its batch is committed."""
+        self.submit(record).result(timeout=timeout)
+
+    def _collect(self, first) -> Tuple[List[Tuple[Dict[str, Any], Future]], bool]:
+        """Gather a batch starting with ``first``; also reports whether a stop was requested."""
+        batch = [first]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _commit(self, batch: List[Tuple[Dict[str, Any], Future]]) -> None:
+        # Skip callers that gave up before the commit started
+        batch = [(record, future) for record, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        try:
+            self.repository.add([record for record, _ in batch])
+        except Exception as e:
+            if len(batch) > 1:
+                logger.warning(f"Batch of {len(batch)} quotes failed ({str(e)}), retrying individually")
+                for record, future in batch:
+                    self._commit_one(record, future)
+                return
+            with self._lock:
+                self.failed += 1
+            batch[0][1].set_exception(e)
+            return
+
+        with self._lock:
+            self.batches += 1
+            self.written += len(batch)
+            self.largest_batch = max(self.largest_batch, len(batch))
+        for _, future in batch:
+            future.set_result(None)
+
+    def _commit_one(self, record: Dict[str, Any], future: Future) -> None:
+        try:
+            self.repository.add([record])
+        except Exception as e:
+            with self._lock:
+                self.failed += 1
+            future.set_exception(e)
+            return
+        with self._lock:
+            self.batches += 1
+            self.written += 1
+        future.set_result(None)
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch, stopping = self._collect(item)
+            self._commit(batch)
+            if stopping:
+                return
+
+    def stop(self) -> None:
+        """Commit everything already queued and stop the writer thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and thread.is_alive():
+            self._queue.put(_STOP)
+            thread.join()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "pending": self._queue.qsize(),
+                "batches": self.batches,
+                "written": self.written,
+                "failed": self.failed,
+                "largest_batch": self.largest_batch,
+                "mean_batch": round(self.written / self.batches, 2) if self.batches else 0.0
+            }
+
+# Shared buffer that all quote submissions go through
+quote_writer = QuoteWriteBuffer(
+    quote_repository,
+    max_batch=int(os.getenv("QUOTE_WRITE_BATCH_SIZE", "256")),
+    max_delay=float(os.getenv("QUOTE_WRITE_DELAY_MS", "5")) / 1000
+)
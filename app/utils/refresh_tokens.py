@@ -0,0 +1,197 @@
+import hashlib
+import hmac
+import logging
+import os
+import secrets
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+import pyarrow as pa
+
+from app.database import get_table, generate_id, add_records, coerce_value, ensure_scalar_indexes, REFRESH_TOKENS_SCHEMA
+from app.utils.quote_repository import quote_literal, timestamp_literal
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "14"))
+
+class InvalidRefreshToken(Exception):
+    """The refresh token is unknown, expired or already used."""
+
+def _utc(value: Any) -> datetime:
+    """A stored timestamp as an aware UTC datetime (tables not yet migrated hold ISO strings)."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+class RefreshTokenStore:
+    """Rotating refresh tokens in the LanceDB ``refresh_tokens`` table.
+
+    Tokens are random strings handed to the client once; only an HMAC of the
+    token is stored, indexed for a single-row lookup. Each use revokes the
+    presented token and issues a successor in the same family. Presenting a
+    token that was already rotated means it leaked, so the whole family is
+    revoked and the agent has to log in with their password again.
+    """
+
+    def __init__(self, secret_key: str, table_name: str = "refresh_tokens", ttl: timedelta = timedelta(days=14)):
+        """
+        Initialize the store.
+
+        Args:
+            secret_key: Key for the token HMAC
+            table_name: Name of the LanceDB table holding the tokens
+            ttl: Lifetime of each issued token
+        """
+        self.secret_key = secret_key.encode()
+        self.table_name = table_name
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._indexed = False
+
+    @property
+    def table(self):
+        return get_table(self.table_name, schema=REFRESH_TOKENS_SCHEMA)
+
+    def ensure_indexes(self) -> None:
+        """Create the scalar index on token_hash; deferred to the first issued token on an empty table."""
+        if ensure_scalar_indexes(self.table, self.table_name, ("token_hash",)) is not None:
+            self._indexed = True
+
+    def _index_after_write(self) -> None:
+        if self._indexed:
+            return
+        try:
+            self.ensure_indexes()
+        except Exception as e:
+            logger.warning(f"Could not build indexes on {self.table_name}: {str(e)}")
+
+    def _hash(self, token: str) -> str:
+        return hmac.new(self.secret_key, token.encode(), hashlib.sha256).hexdigest()
+
+    def _update(self, where: str, values: Dict[str, Any]) -> None:
+        table = self.table
+        values = {
+            column: coerce_value(value, table.schema.field(column).type)
+            for column, value in values.items()
+            if column in table.schema.names
+        }
+        if hasattr(table, "update"):
+            table.update(where=where, values=values)
+            return
+
+        # Older LanceDB releases have no update; rewrite the matching rows
+        rows = table.search().where(where).to_list()
+        if rows:
+            table.delete(where)
+            add_records(table, [{**row, **values} for row in rows])
+
+    def issue(self, agent_email: str, family_id: Optional[str] = None) -> str:
+        """
+        Create a refresh token for an agent.
+
+        Args:
+            agent_email: Email of the agent the token authenticates
+            family_id: Rotation family; a new family starts at each password login
+
+        Returns:
+            The plaintext token, which is not stored
+        """
+        token = secrets.token_urlsafe(32)
+        now = datetime.now(timezone.utc)
+        record = {
+            "id": generate_id(),
+            "token_hash": self._hash(token),
+            "family_id": family_id or generate_id(),
+            "agent_email": agent_email,
+            "created_at": now,
+            "expires_at": now + self.ttl,
+            "revoked": False,
+            "replaced_by": ""
+        }
+        add_records(self.table, [record])
+        self._index_after_write()
+        return token
+
+    def _find(self, token: str) -> Optional[Dict[str, Any]]:
+        rows = self.table.search().where(f"token_hash = {quote_literal(self._hash(token))}").limit(1).to_list()
+        return rows[0] if rows else None
+
+    def rotate(self, token: str) -> Dict[str, str]:
+        """
+        Exchange a refresh token for its successor.
+
+        Args:
+            token: Plaintext refresh token presented by the client
+
+        Returns:
+            Dict with the agent_email and the new refresh_token
+
+        Raises:
+            InvalidRefreshToken: If the token is unknown, expired or already used
+        """
+        with self._lock:
+            record = self._find(token)
+            if record is None:
+                raise InvalidRefreshToken("Unknown refresh token")
+            if record["revoked"]:
+                logger.warning(f"Refresh token reuse for {record['agent_email']}, revoking its family")
+                self.revoke_family(record["family_id"])
+                raise InvalidRefreshToken("Refresh token already used")
+            if _utc(record["expires_at"]) <= datetime.now(timezone.utc):
+                raise InvalidRefreshToken("Refresh token expired")
+
+            new_token = self.issue(record["agent_email"], family_id=record["family_id"])
+            self._update(
+                f"id = {quote_literal(record['id'])}",
+                {"revoked": True, "revoked_at": datetime.now(timezone.utc), "replaced_by": self._hash(new_token)}
+            )
+            return {"agent_email": record["agent_email"], "refresh_token": new_token}
+
+    def revoke(self, token: str) -> None:
+        """Revoke a single token, e.g. on logout."""
+        self._revoke(f"token_hash = {quote_literal(self._hash(token))}")
+
+    def _revoke(self, where: str) -> None:
+        self._update(where, {"revoked": True, "revoked_at": datetime.now(timezone.utc)})
+
+    def revoke_family(self, family_id: str) -> None:
+        self._revoke(f"family_id = {quote_literal(family_id)} AND revoked = false")
+
+    def revoke_agent(self, agent_email: str) -> None:
+        """Revoke every refresh token of an agent."""
+        self._revoke(f"agent_email = {quote_literal(agent_email)} AND revoked = false")
+
+    def purge_expired(self, table=None) -> int:
+        """
+        Delete expired tokens.
+
+        Rotated tokens are kept until they expire so a replay can still be
+        detected; after that they are dead weight.
+
+        Args:
+            table: Table to purge, for jobs with their own connection (defaults to this store's table)
+
+        Returns:
+            Number of tokens removed
+        """
+        table = table if table is not None else self.table
+        now = datetime.now(timezone.utc)
+        if pa.types.is_timestamp(table.schema.field("expires_at").type):
+            where = f"expires_at <= {timestamp_literal(now)}"
+        else:
+            where = f"expires_at <= {quote_literal(now.replace(tzinfo=None).isoformat())}"
+        count = table.count_rows(where)
+        if count:
+            table.delete(where)
+        return count
+
+# Shared store used by the auth routes
+refresh_tokens = RefreshTokenStore(
+    os.getenv("SECRET_KEY", "your-secret-key-here"),
+    ttl=timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+)
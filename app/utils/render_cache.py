@@ -0,0 +1,131 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Iterable, Optional, Tuple, Union
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class RenderCache:
+    """Content-addressed index of rendered DOCX/PDF pairs.
+
+    Entries are keyed by a hash of the template bytes, the values of the
+    placeholders the template uses and the renderer version, so an unchanged
+    quote maps
+    back to the files already produced for it. The rendered files stay owned
+    by the quotes that reference them; eviction only drops index entries, and
+    entries whose files have been cleaned up count as misses.
+    """
+
+    def __init__(self, max_bytes: int = 512 * 1024 * 1024):
+        """
+        Initialize the render cache.
+
+        Args:
+            max_bytes: Total size of the DOCX/PDF files the cache may reference
+        """
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._template_digests: Dict[str, Tuple[int, str]] = {}
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _template_digest(self, template_path: Path) -> str:
+        """SHA-256 of the template bytes, rehashed only when its mtime changes."""
+        key = str(template_path.resolve())
+        mtime_ns = template_path.stat().st_mtime_ns
+        cached = self._template_digests.get(key)
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+        digest = hashlib.sha256(template_path.read_bytes()).hexdigest()
+        self._template_digests[key] = (mtime_ns, digest)
+        return digest
+
+    def key(
+        self,
+        template_path: Union[str, Path],
+        replacements: Dict[str, Any],
+        renderer: str,
+        placeholders: Optional[Iterable[str]] = None
+    ) -> str:
+        """
+        Compute the cache key for a render.
+
+        Args:
+            template_path: Path to the DOCX template
+            replacements: Placeholder keys mapped to their values
+            renderer: Renderer name and version, e.g. "docx:1"
+            placeholders: Keys the template contains; values for any other key
+                (timestamps, fields of other lines) do not affect the output
+                and are left out of the key. Defaults to every replacement.
+        """
+        if placeholders is None:
+            placeholders = replacements
+        normalized = json.dumps(
+            {k: str(replacements[k]) if k in replacements else None for k in placeholders},
+            sort_keys=True
+        )
+        digest = hashlib.sha256()
+        digest.update(self._template_digest(Path(template_path)).encode())
+        digest.update(normalized.encode())
+        digest.update(renderer.encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[str, str]]:
+        """Return the (docx_path, pdf_path) for a key, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not all(os.path.exists(p) for p in (entry["docx_path"], entry["pdf_path"])):
+                self._drop(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry["docx_path"], entry["pdf_path"]
+
+    def put(self, key: str, docx_path: str, pdf_path: str) -> None:
+        """Record a rendered pair, evicting least recently used entries over the size budget."""
+        size = os.path.getsize(docx_path) + os.path.getsize(pdf_path)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = {"docx_path": docx_path, "pdf_path": pdf_path, "size": size}
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self.total_bytes -= entry["size"]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and size, for tuning the budget."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+# Shared cache used by the document generator
+render_cache = RenderCache(max_bytes=int(os.getenv("RENDER_CACHE_MAX_MB", "512")) * 1024 * 1024)
@@ -0,0 +1,86 @@
+import logging
+from typing import Any, Dict, List, Optional
+
+import pyarrow as pa
+
+from app.database import TABLE_SCHEMAS, conform_records
+from app.utils.quote_repository import with_quote_line_flags
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Columns written by older code paths under a different name: {table: {new: old}}
+LEGACY_COLUMNS = {
+    "quotes": {"created_at": "submitted_at"},
+    "agents": {"full_name": "name"}
+}
+
+# Columns derived from other columns, recomputed for every migrated row
+ROW_TRANSFORMS = {
+    "quotes": with_quote_line_flags
+}
+
+def _open(db, table_name: str):
+    try:
+        return db.open_table(table_name)
+    except (KeyError, ValueError, FileNotFoundError):
+        return None
+
+def migrate_table(db, table_name: str, schema: pa.Schema, dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Rewrite a table so it has exactly the declared schema.
+
+    Every row is read, coerced to the target types (ISO strings to
+    timestamps, labels to dictionary columns, nested dicts to the declared
+    structs) and written back with an overwrite commit. The previous version
+    stays in the table history until compaction cleans it up.
+
+    Args:
+        db: LanceDB connection
+        table_name: Name of the table to migrate
+        schema: Target schema
+        dry_run: Report what would change without writing
+
+    Returns:
+        Report with the row count, dropped columns and whether the table was rewritten
+    """
+    report = {"table": table_name, "rows": 0, "dropped_columns": [], "migrated": False}
+    table = _open(db, table_name)
+    if table is None:
+        if not dry_run:
+            db.create_table(table_name, schema=schema)
+        report["migrated"] = not dry_run
+        return report
+
+    if table.schema.equals(schema):
+        report["rows"] = table.count_rows()
+        return report
+
+    rows = table.to_arrow().to_pylist()
+    report["rows"] = len(rows)
+    report["dropped_columns"] = [name for name in table.schema.names if name not in schema.names]
+
+    for new, old in LEGACY_COLUMNS.get(table_name, {}).items():
+        for row in rows:
+            if row.get(new) is None and row.get(old) is not None:
+                row[new] = row[old]
+
+    transform = ROW_TRANSFORMS.get(table_name)
+    if transform:
+        rows = [transform(row) for row in rows]
+
+    data = conform_records(rows, schema)
+    if dry_run:
+        return report
+
+    db.create_table(table_name, data=data, schema=schema, mode="overwrite")
+    report["migrated"] = True
+    logger.info(f"Migrated {table_name}: {len(rows)} rows, dropped columns {report['dropped_columns']}")
+    return report
+
+def migrate_all(db, tables: Optional[List[str]] = None, dry_run: bool = False) -> List[Dict[str, Any]]:
+    """Migrate every table with a declared schema (or just the named ones)."""
+    return [
+        migrate_table(db, table_name, TABLE_SCHEMAS[table_name], dry_run=dry_run)
+        for table_name in (tables or TABLE_SCHEMAS)
+    ]
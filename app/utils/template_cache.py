@@ -0,0 +1,99 @@
+import copy
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+from docx import Document
+from docx.oxml.ns import qn
+from docx.text.paragraph import Paragraph
+from app.utils.placeholders import PLACEHOLDER_PATTERN, fill_paragraph
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+W_P = qn("w:p")
+
+class CompiledTemplate:
+    """A parsed DOCX template plus the locations of its ``{{placeholder}}`` slots.
+
+    A slot is the position of its ``w:p`` element in document order, so a
+    render finds every slot with one walk of the copied body instead of
+    going through python-docx's paragraph and table proxies per slot.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Parse a template and record which paragraphs hold which placeholders.
+
+        Args:
+            path: Path to the DOCX template
+        """
+        self.path = Path(path)
+        self.mtime_ns = self.path.stat().st_mtime_ns
+        self.document = Document(str(self.path))
+        self.slots: List[Tuple[int, Tuple[str, ...]]] = []
+
+        # Covers body paragraphs and paragraphs in (nested) table cells
+        for index, element in enumerate(self.document.element.body.iter(W_P)):
+            keys = tuple(dict.fromkeys(PLACEHOLDER_PATTERN.findall(Paragraph(element, None).text)))
+            if keys:
+                self.slots.append((index, keys))
+
+    @property
+    def placeholders(self) -> List[str]:
+        """Every placeholder key the template uses."""
+        return list(dict.fromkeys(key for _, keys in self.slots for key in keys))
+
+    def render(self, replacements: Dict[str, str]):
+        """
+        Fill the recorded slots on a fresh copy of the template.
+
+        Args:
+            replacements: Placeholder keys mapped to their values
+
+        Returns:
+            A new python-docx Document; the compiled template is left untouched
+        """
+        document = copy.deepcopy(self.document)
+        slots = [(index, keys) for index, keys in self.slots if any(key in replacements for key in keys)]
+        if slots:
+            elements = list(document.element.body.iter(W_P))
+            for index, _ in slots:
+                fill_paragraph(Paragraph(elements[index], document), replacements)
+        return document
+
+class TemplateCache:
+    """Compiled DOCX templates keyed by path, recompiled when the file's mtime changes."""
+
+    def __init__(self):
+        self._templates: Dict[str, CompiledTemplate] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: Union[str, Path]) -> CompiledTemplate:
+        """
+        Return the compiled form of a template, compiling it on first use.
+
+        Args:
+            path: Path to the DOCX template
+        """
+        path = Path(path)
+        key = str(path.resolve())
+        mtime_ns = path.stat().st_mtime_ns
+        with self._lock:
+            compiled = self._templates.get(key)
+            if compiled is None or compiled.mtime_ns != mtime_ns:
+                logger.info(f"Compiling template: {path}")
+                compiled = CompiledTemplate(path)
+                self._templates[key] = compiled
+            return compiled
+
+    def render(self, path: Union[str, Path], replacements: Dict[str, str]):
+        """Render a template with the given replacements."""
+        return self.get(path).render(replacements)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._templates.clear()
+
+# Shared cache used by the document generator
+template_cache = TemplateCache()
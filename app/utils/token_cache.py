@@ -0,0 +1,121 @@
+import hmac
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+def token_signature(token: str) -> str:
+    """The signature segment of a compact JWT."""
+    return token.rsplit(".", 1)[-1]
+
+class TokenCache:
+    """Verified JWT claims keyed by token signature, kept until the token expires.
+
+    A bearer token is presented on every request; caching its decoded claims
+    skips the base64 decode and HMAC check on repeat presentations. Entries
+    are dropped at the token's ``exp`` and the least recently used entry goes
+    first once ``maxsize`` is reached.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of tokens to keep
+        """
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[str, Dict[str, Any], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Return the cached claims for a token, or None if unknown or expired."""
+        key = token_signature(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            # The full token must match too, so a reused signature cannot pass with another payload
+            if entry is None or not hmac.compare_digest(entry[0], token) or entry[2] <= time.time():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(entry[1])
+
+    def set(self, token: str, claims: Dict[str, Any]) -> None:
+        """Cache verified claims; tokens without an exp claim are not cached."""
+        expires_at = claims.get("exp")
+        if not isinstance(expires_at, (int, float)):
+            return
+        with self._lock:
+            self._entries[token_signature(token)] = (token, dict(claims), float(expires_at))
+            self._entries.move_to_end(token_signature(token))
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+class RevocationList:
+    """In-memory token revocations, checked with dict lookups.
+
+    Agents are revoked by subject: every token issued to them up to the
+    revocation time is rejected, which is how disabling an agent takes effect
+    before their tokens expire. Single tokens can be revoked by ``jti``.
+    """
+
+    def __init__(self):
+        self._subjects: Dict[str, float] = {}
+        self._tokens: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def revoke_subject(self, subject: str, revoked_at: Optional[float] = None) -> None:
+        """Reject all tokens for a subject issued up to revoked_at (default now)."""
+        with self._lock:
+            self._subjects[subject] = revoked_at if revoked_at is not None else time.time()
+
+    def restore_subject(self, subject: str) -> None:
+        with self._lock:
+            self._subjects.pop(subject, None)
+
+    def revoke_token(self, jti: str, expires_at: float) -> None:
+        """Reject a single token until it expires."""
+        with self._lock:
+            self._tokens[jti] = expires_at
+            now = time.time()
+            for expired in [key for key, expiry in self._tokens.items() if expiry <= now]:
+                del self._tokens[expired]
+
+    def is_revoked(self, claims: Dict[str, Any]) -> bool:
+        """Whether a verified token has been revoked."""
+        with self._lock:
+            jti = claims.get("jti")
+            if jti is not None and jti in self._tokens:
+                return True
+            revoked_at = self._subjects.get(claims.get("sub"))
+            # Tokens without an issue time cannot be ordered against the revocation
+            return revoked_at is not None and claims.get("iat", 0) <= revoked_at
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"subjects": len(self._subjects), "tokens": len(self._tokens)}
+
+# Shared cache and revocation list used by the auth dependencies
+token_cache = TokenCache(maxsize=int(os.getenv("TOKEN_CACHE_SIZE", "4096")))
+revocation_list = RevocationList()
@@ -0,0 +1,161 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Any, Optional
+from fastapi import HTTPException, UploadFile, status
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+
+# Upload limits
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_MB", "25")) * 1024 * 1024
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+
+# Allowance for multipart boundaries, part headers and small form fields
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+def file_sha256(path: Path, chunk_size: int = UPLOAD_CHUNK_SIZE) -> str:
+    """SHA-256 of a file on disk, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file_object:
+        for chunk in iter(lambda: file_object.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class UploadLimitMiddleware:
+    """Rejects multipart request bodies over the upload limit before they are read.
+
+    FastAPI spools the whole multipart body to memory or disk before an
+    upload route runs, so the size check in ``save_upload`` alone cannot stop
+    an oversized upload from being received. Multipart requests must declare
+    a ``Content-Length`` (411 otherwise) no larger than the limit plus
+    multipart overhead (413 otherwise); the server never reads more than the
+    declared length.
+    """
+
+    def __init__(self, app, max_bytes: int = MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: ASGI application to wrap
+            max_bytes: Largest accepted multipart body
+        """
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            headers = Headers(scope=scope)
+            if headers.get("content-type", "").startswith("multipart/form-data"):
+                length = headers.get("content-length")
+                response = None
+                if length is None:
+                    response = JSONResponse(
+                        {"detail": "Uploads must declare a Content-Length"},
+                        status_code=status.HTTP_411_LENGTH_REQUIRED
+                    )
+                elif not length.isdigit() or int(length) > self.max_bytes:
+                    response = JSONResponse(
+                        {"detail": f"Request exceeds the {MAX_UPLOAD_BYTES // (1024 * 1024)} MB upload limit"},
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+                    )
+                if response is not None:
+                    await response(scope, receive, send)
+                    return
+        await self.app(scope, receive, send)
+
+def _claim_name(temp_path: Path, destination: Path) -> Path:
+    """
+    Move a finished upload to destination without replacing an existing file.
+
+    A taken name gets a numeric suffix ("license (1).pdf"). Hard-linking
+    fails instead of overwriting, so concurrent uploads cannot clobber
+    each other.
+    """
+    candidate = destination
+    counter = 1
+    while True:
+        try:
+            os.link(temp_path, candidate)
+            break
+        except FileExistsError:
+            candidate = destination.with_name(f"{destination.stem} ({counter}){destination.suffix}")
+            counter += 1
+    temp_path.unlink()
+    return candidate
+
+def _discard(path: Path) -> None:
+    if path.exists():
+        path.unlink()
+
+async def save_upload(
+    upload: UploadFile,
+    directory: Path,
+    max_bytes: int = MAX_UPLOAD_BYTES,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+    find_existing: Optional[Callable[[str], Awaitable[Optional[str]]]] = None
+) -> Dict[str, Any]:
+    """
+    Copy an upload to disk in fixed-size chunks.
+
+    The body is written to a temporary file in the target directory while its
+    size is checked and its SHA-256 computed, then moved into place, so a
+    partially written or oversized upload never appears under its final name.
+    Every filesystem call runs in the threadpool to keep the event loop free.
+    A different file already using the name is kept and the upload is stored
+    under a numbered name instead.
+
+    Args:
+        upload: Incoming upload
+        directory: Directory to store the file in
+        max_bytes: Largest accepted upload
+        chunk_size: Bytes read and written per chunk
+        find_existing: Async lookup of a content hash returning the path of an
+            identical stored file, if any; the upload is then discarded and
+            that path returned
+
+    Returns:
+        Dict with the upload's filename, path, size, sha256 and whether it
+        was a duplicate
+
+    Raises:
+        HTTPException: 413 if the upload exceeds max_bytes
+    """
+    await run_in_threadpool(directory.mkdir, parents=True, exist_ok=True)
+    filename = Path(upload.filename or "upload").name
+    destination = directory / filename
+
+    digest = hashlib.sha256()
+    size = 0
+    fd, temp_name = await run_in_threadpool(tempfile.mkstemp, prefix=".upload-", dir=directory)
+    temp_path = Path(temp_name)
+    try:
+        with os.fdopen(fd, "wb") as temp_file:
+            while True:
+                chunk = await upload.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"File exceeds the {max_bytes // (1024 * 1024)} MB upload limit"
+                    )
+                digest.update(chunk)
+                await run_in_threadpool(temp_file.write, chunk)
+            await run_in_threadpool(os.fsync, temp_file.fileno())
+
+        sha256 = digest.hexdigest()
+        if find_existing is not None:
+            existing = await find_existing(sha256)
+            if existing is not None:
+                await run_in_threadpool(temp_path.unlink)
+                return {"filename": filename, "path": existing, "size": size, "sha256": sha256, "duplicate": True}
+
+        path = await run_in_threadpool(_claim_name, temp_path, destination)
+        return {"filename": path.name, "path": str(path), "size": size, "sha256": sha256, "duplicate": False}
+    except BaseException:
+        await run_in_threadpool(_discard, temp_path)
+        raise
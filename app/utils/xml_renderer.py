@@ -0,0 +1,122 @@
+import logging
+import re
+import zipfile
+from bisect import bisect_right
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, List, Tuple, Union
+from lxml import etree
+
+from app.utils.placeholders import PLACEHOLDER_PATTERN
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+NAMESPACES = {"w": W_NS}
+XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+
+# Parts that carry document text; everything else is copied byte-for-byte
+TEXT_PARTS = re.compile(r"^word/(document|header\d*|footer\d*)\.xml$")
+
+def _fill_paragraph(paragraph, replacements: Dict[str, Any]) -> int:
+    """Fill placeholders across the ``w:t`` elements of one ``w:p``, mirroring fill_paragraph."""
+    nodes = paragraph.xpath("./w:r/w:t | ./w:hyperlink/w:r/w:t", namespaces=NAMESPACES)
+    if not nodes:
+        return 0
+    texts = [node.text or "" for node in nodes]
+
+    joined = "".join(texts)
+    if "{{" not in joined:
+        return 0
+    matches = [m for m in PLACEHOLDER_PATTERN.finditer(joined) if m.group(1) in replacements]
+    if not matches:
+        return 0
+
+    starts = []
+    position = 0
+    for text in texts:
+        starts.append(position)
+        position += len(text)
+
+    for match in reversed(matches):
+        value = str(replacements[match.group(1)])
+        first = bisect_right(starts, match.start()) - 1
+        last = bisect_right(starts, match.end() - 1) - 1
+        head = match.start() - starts[first]
+        tail = match.end() - starts[last]
+        if first == last:
+            texts[first] = texts[first][:head] + value + texts[first][tail:]
+        else:
+            texts[first] = texts[first][:head] + value
+            for index in range(first + 1, last):
+                texts[index] = ""
+            texts[last] = texts[last][tail:]
+
+    for node, text in zip(nodes, texts):
+        if (node.text or "") != text:
+            node.text = text
+            node.set(XML_SPACE, "preserve")
+    return len(matches)
+
+def render_part(xml: bytes, replacements: Dict[str, Any]) -> bytes:
+    """
+    Fill placeholders in one WordprocessingML part.
+
+    Args:
+        xml: Raw part bytes (document, header or footer)
+        replacements: Placeholder keys mapped to their values
+
+    Returns:
+        The rewritten part, or the original bytes if nothing changed
+    """
+    if b"{{" not in xml:
+        return xml
+    root = etree.fromstring(xml)
+    filled = sum(_fill_paragraph(p, replacements) for p in root.iter(f"{{{W_NS}}}p"))
+    if not filled:
+        return xml
+    return etree.tostring(root, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+@lru_cache(maxsize=64)
+def _scan_placeholders(path: str, mtime_ns: int) -> Tuple[str, ...]:
+    keys = []
+    with zipfile.ZipFile(path) as source:
+        for name in source.namelist():
+            if not TEXT_PARTS.match(name):
+                continue
+            data = source.read(name)
+            if b"{{" not in data:
+                continue
+            for paragraph in etree.fromstring(data).iter(f"{{{W_NS}}}p"):
+                nodes = paragraph.xpath("./w:r/w:t | ./w:hyperlink/w:r/w:t", namespaces=NAMESPACES)
+                keys.extend(PLACEHOLDER_PATTERN.findall("".join(node.text or "" for node in nodes)))
+    return tuple(dict.fromkeys(keys))
+
+def template_placeholders(template_path: Union[str, Path]) -> List[str]:
+    """Every placeholder key render_docx can fill in a template, headers and footers included."""
+    path = Path(template_path).resolve()
+    return list(_scan_placeholders(str(path), path.stat().st_mtime_ns))
+
+def render_docx(template_path: Union[str, Path], output_path: Union[str, Path], replacements: Dict[str, Any]) -> str:
+    """
+    Render a DOCX template straight from its zip, without python-docx.
+
+    Text parts are rewritten one at a time; media, styles and every other
+    entry are copied byte-for-byte with their original compression.
+
+    Args:
+        template_path: Path to the DOCX template
+        output_path: Path of the DOCX to write
+        replacements: Placeholder keys mapped to their values
+
+    Returns:
+        Path to the rendered document
+    """
+    with zipfile.ZipFile(template_path) as source, zipfile.ZipFile(output_path, "w") as target:
+        for info in source.infolist():
+            data = source.read(info)
+            if TEXT_PARTS.match(info.filename):
+                data = render_part(data, replacements)
+            target.writestr(info, data)
+    return str(output_path)
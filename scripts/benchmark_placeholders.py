@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: per-key placeholder replacement vs the single-pass engine.
+
+Builds an in-memory document with one paragraph per placeholder (keys taken
+from quote-request-form/placeholders.txt) and times filling it as the number
+of placeholders grows.
+
+    python scripts/benchmark_placeholders.py
+"""
+import copy
+import re
+import sys
+import time
+from pathlib import Path
+
+from docx import Document
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from app.utils.placeholders import replace_placeholders  # noqa: E402
+
+PLACEHOLDERS_FILE = Path(__file__).resolve().parent.parent / "quote-request-form" / "placeholders.txt"
+SIZES = [10, 50, 100, 200, 360]
+REPEATS = 5
+
+def load_keys():
+    keys = re.findall(r"\{\{([\w\-]+)\}\}", PLACEHOLDERS_FILE.read_text())
+    return list(dict.fromkeys(keys))
+
+def legacy_replace(doc, replacements):
+    """The per-key loop DocumentGenerator used before the single-pass engine."""
+    for paragraph in doc.paragraphs:
+        for key in replacements.keys():
+            if f"{{{{{key}}}}}" in paragraph.text:
+                paragraph.text = paragraph.text.replace(f"{{{{{key}}}}}", str(replacements[key]))
+
+def build_document(keys):
+    doc = Document()
+    for index, key in enumerate(keys):
+        paragraph = doc.add_paragraph("Value: ")
+        # Split every other token across runs, as Word does after edits
+        if index % 2:
+            paragraph.add_run("{{" + key[:1])
+            paragraph.add_run(key[1:] + "}}")
+        else:
+            paragraph.add_run("{{" + key + "}}")
+    return doc
+
+def best_time(func, template, replacements):
+    timings = []
+    for _ in range(REPEATS):
+        doc = copy.deepcopy(template)
+        start = time.perf_counter()
+        func(doc, replacements)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main():
+    keys = load_keys()
+    print(f"{'placeholders':>12} {'legacy ms':>10} {'single-pass ms':>15} {'speedup':>8}")
+    for size in SIZES:
+        subset = keys[:size]
+        replacements = {key: f"value-{key}" for key in keys}
+        template = build_document(subset)
+        legacy = best_time(legacy_replace, template, replacements)
+        single = best_time(replace_placeholders, template, replacements)
+        print(f"{len(subset):>12} {legacy * 1000:>10.2f} {single * 1000:>15.2f} {legacy / single:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
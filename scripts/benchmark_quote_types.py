@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: quote-type filters on the quotes table.
+
+Builds a throwaway LanceDB table of synthetic quotes (100k by default) and
+times the ways /api/quotes/list can select one quote line: the old
+``quote_types LIKE`` scan, ``array_has`` on the list column with and without
+a LABEL_LIST index, and the ``has_auto`` flag column with and without a
+BITMAP index.
+
+    python scripts/benchmark_quote_types.py [rows]
+"""
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import lancedb
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from app.database import QUOTES_SCHEMA, conform_records  # noqa: E402
+from app.utils.quote_repository import QUOTE_LINES, with_quote_line_flags  # noqa: E402
+
+ROWS = 100_000
+REPEATS = 5
+
+FILTERS = [
+    ("LIKE on quote_types (legacy)", "CAST(quote_types AS STRING) LIKE '%AUTO%'"),
+    ("array_has(quote_types)", "array_has(quote_types, 'AUTO')"),
+    ("has_auto = true", "has_auto = true"),
+]
+
+def build_table(db, rows):
+    random.seed(0)
+    records = []
+    for i in range(rows):
+        lines = [line for line in QUOTE_LINES if random.random() < 0.4] or ["AUTO"]
+        records.append(with_quote_line_flags({
+            "id": f"q{i:07d}",
+            "agent_id": f"a{i % 50}",
+            "status": "pending",
+            "quote_types": lines,
+            "created_at": "2024-01-01T00:00:00"
+        }))
+    return db.create_table("quotes", data=conform_records(records, QUOTES_SCHEMA), schema=QUOTES_SCHEMA)
+
+def time_filter(table, where):
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        matched = table.search().where(where).select(["id"]).limit(None).to_arrow().num_rows
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), matched
+
+def run(table, label):
+    print(f"\n{label}")
+    for name, where in FILTERS:
+        try:
+            ms, matched = time_filter(table, where)
+            print(f"  {name:<32} {ms:9.1f} ms  {matched} rows")
+        except Exception as e:
+            print(f"  {name:<32} unsupported ({e.__class__.__name__})")
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else ROWS
+    db_dir = tempfile.mkdtemp()
+    try:
+        table = build_table(lancedb.connect(db_dir), rows)
+        print(f"{rows} quotes, median of {REPEATS} runs")
+        run(table, "No scalar indexes")
+        table.create_scalar_index("quote_types", index_type="LABEL_LIST")
+        table.create_scalar_index("has_auto", index_type="BITMAP")
+        run(table, "LABEL_LIST on quote_types, BITMAP on has_auto")
+    finally:
+        shutil.rmtree(db_dir)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: cached compiled template vs reparsing the DOCX per render.
+
+Builds a template with one placeholder per key in
+quote-request-form/placeholders.txt (about 360), half as body paragraphs and
+half in table cells, and times producing a filled document both ways.
+
+    python scripts/benchmark_template_cache.py
+"""
+import re
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from docx import Document
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from app.utils.placeholders import replace_placeholders  # noqa: E402
+from app.utils.template_cache import TemplateCache  # noqa: E402
+
+PLACEHOLDERS_FILE = Path(__file__).resolve().parent.parent / "quote-request-form" / "placeholders.txt"
+REPEATS = 10
+
+def load_keys():
+    keys = re.findall(r"\{\{([\w\-]+)\}\}", PLACEHOLDERS_FILE.read_text())
+    return list(dict.fromkeys(keys))
+
+def build_template(path, keys):
+    doc = Document()
+    half = len(keys) // 2
+    for key in keys[:half]:
+        doc.add_paragraph(f"{key}: {{{{{key}}}}}")
+    table = doc.add_table(rows=len(keys) - half, cols=2)
+    for row, key in zip(table.rows, keys[half:]):
+        row.cells[0].text = key
+        row.cells[1].text = f"{{{{{key}}}}}"
+    doc.save(str(path))
+
+def reparse(path, replacements):
+    doc = Document(str(path))
+    replace_placeholders(doc, replacements)
+    return doc
+
+def best_time(func):
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main():
+    keys = load_keys()
+    replacements = {key: f"value-{key}" for key in keys}
+    temp_dir = Path(tempfile.mkdtemp())
+    try:
+        path = temp_dir / "template.docx"
+        build_template(path, keys)
+        cache = TemplateCache()
+        cache.get(path)
+        parsed = best_time(lambda: reparse(path, replacements))
+        cached = best_time(lambda: cache.render(path, replacements))
+        print(f"{len(keys)} placeholders, best of {REPEATS}")
+        print(f"  Document(path) + fill  {parsed * 1000:8.1f} ms")
+        print(f"  template_cache.render  {cached * 1000:8.1f} ms  ({parsed / cached:.1f}x)")
+    finally:
+        shutil.rmtree(temp_dir)
+
+if __name__ == "__main__":
+    main()
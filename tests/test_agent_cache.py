@@ -0,0 +1,76 @@
+import unittest
+import asyncio
+import shutil
+import tempfile
+import time
+from unittest.mock import patch
+import lancedb
+from app.utils.agent_cache import AgentCache, agent_cache
+from app.utils.auth import get_agent_by_email_async
+
+class TestAgentCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = AgentCache(maxsize=2, ttl=60)
+        self.agent = {"id": "1", "email": "agent@example.com", "permissions": ["basic"]}
+
+    def test_hit_and_miss_counters(self):
+        """Test that lookups are counted as hits or misses."""
+        self.assertIsNone(self.cache.get("agent@example.com"))
+        self.cache.set("agent@example.com", self.agent)
+        self.assertEqual(self.cache.get("agent@example.com"), self.agent)
+        stats = self.cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    def test_returns_copies(self):
+        """Test that callers cannot mutate the cached record."""
+        self.cache.set("agent@example.com", self.agent)
+        self.cache.get("agent@example.com")["permissions"].append("admin")
+        self.assertEqual(self.cache.get("agent@example.com")["permissions"], ["basic"])
+
+    def test_lru_eviction(self):
+        """Test that the least recently used agent is evicted when full."""
+        self.cache.set("a@example.com", self.agent)
+        self.cache.set("b@example.com", self.agent)
+        self.cache.get("a@example.com")
+        self.cache.set("c@example.com", self.agent)
+        self.assertIsNone(self.cache.get("b@example.com"))
+        self.assertIsNotNone(self.cache.get("a@example.com"))
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+
+    def test_ttl_expiry(self):
+        """Test that entries expire after the TTL."""
+        cache = AgentCache(maxsize=2, ttl=0.01)
+        cache.set("agent@example.com", self.agent)
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("agent@example.com"))
+
+    def test_invalidate(self):
+        """Test that invalidated agents are re-read."""
+        self.cache.set("agent@example.com", self.agent)
+        self.cache.invalidate("agent@example.com")
+        self.assertIsNone(self.cache.get("agent@example.com"))
+
+class TestAgentLookup(unittest.TestCase):
+    def setUp(self):
+        self.db_dir = tempfile.mkdtemp()
+        db = lancedb.connect(self.db_dir)
+        db.create_table("agents", data=[{"id": "1", "email": "o'brien@example.com", "permissions": ["basic"]}])
+        patcher = patch("app.utils.auth.get_table", side_effect=db.open_table)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        agent_cache.clear()
+        self.addCleanup(agent_cache.clear)
+
+    def tearDown(self):
+        shutil.rmtree(self.db_dir)
+
+    def test_email_with_apostrophe(self):
+        """Test that an address containing a quote is looked up, not spliced into the filter."""
+        agent = asyncio.run(get_agent_by_email_async("o'brien@example.com"))
+        self.assertEqual(agent["id"], "1")
+        self.assertIsNone(asyncio.run(get_agent_by_email_async("x' OR '1'='1")))
+
+if __name__ == '__main__':
+    unittest.main()
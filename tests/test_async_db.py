@@ -0,0 +1,67 @@
+import asyncio
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+import lancedb
+from app.utils.async_db import AsyncDataAccess
+
+class TestAsyncDataAccess(unittest.TestCase):
+    def setUp(self):
+        self.db_dir = tempfile.mkdtemp()
+        self.db = lancedb.connect(self.db_dir)
+        self.db.create_table("quotes", data=[
+            {"id": "q1", "agent_id": "a1", "agent_email": "a@example.com", "status": "pending", "updated_at": ""},
+            {"id": "q2", "agent_id": "a2", "agent_email": "b@example.com", "status": "pending", "updated_at": ""}
+        ])
+        self.db.create_table("agents", data=[{"email": "o'neil@example.com", "last_login": ""}])
+        for target in ("app.utils.quote_repository.get_table", "app.utils.async_db.get_table"):
+            patcher = patch(target, side_effect=self.db.open_table)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.data = AsyncDataAccess(max_workers=2)
+        self.addCleanup(self.data.shutdown)
+
+    def tearDown(self):
+        shutil.rmtree(self.db_dir)
+
+    def test_run_uses_pool_threads(self):
+        """Test that blocking calls run off the event loop thread."""
+        loop_thread = threading.get_ident()
+        worker_thread = asyncio.run(self.data.run(threading.get_ident))
+        self.assertNotEqual(worker_thread, loop_thread)
+        self.assertEqual(self.data.stats()["completed"], 1)
+
+    def test_errors_propagate(self):
+        """Test that exceptions from the pool reach the awaiting caller."""
+        with self.assertRaises(ZeroDivisionError):
+            asyncio.run(self.data.run(lambda: 1 / 0))
+        self.assertEqual(self.data.stats()["failed"], 1)
+        self.assertEqual(self.data.stats()["pending"], 0)
+
+    def test_quote_queries(self):
+        """Test that quote lookups and filters go through the pool."""
+        async def scenario():
+            quote = await self.data.get_quote("q1", agent_id="a1")
+            quotes = await self.data.find_quotes({"agent_email": "b@example.com"})
+            return quote, quotes
+
+        quote, quotes = asyncio.run(scenario())
+        self.assertEqual(quote["id"], "q1")
+        self.assertEqual([q["id"] for q in quotes], ["q2"])
+
+    def test_replace_agent_escapes_email(self):
+        """Test that agent rewrites quote the email literal."""
+        async def scenario():
+            agent = await self.data.find_agent("o'neil@example.com")
+            agent["last_login"] = "now"
+            await self.data.replace_agent(agent)
+            return await self.data.find_agent("o'neil@example.com")
+
+        agent = asyncio.run(scenario())
+        self.assertEqual(agent["last_login"], "now")
+        self.assertEqual(self.db.open_table("agents").count_rows(), 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+import lancedb
+from app.utils.connection import LanceDBConnection
+
+class TestLanceDBConnection(unittest.TestCase):
+    def setUp(self):
+        self.db_dir = tempfile.mkdtemp()
+        lancedb.connect(self.db_dir).create_table("quotes", data=[{"id": "q1"}])
+        self.clock = 1000.0
+        patcher = patch("app.utils.connection.time.monotonic", side_effect=lambda: self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.connection = LanceDBConnection(self.db_dir, consistency_interval=5)
+
+    def tearDown(self):
+        shutil.rmtree(self.db_dir)
+
+    def external_write(self):
+        """Append a row through a separate connection, as another process would."""
+        lancedb.connect(self.db_dir).open_table("quotes").add([{"id": "q2"}])
+
+    def test_handles_are_reused(self):
+        """Test that repeated opens return the cached handle."""
+        table = self.connection.open_table("quotes")
+        self.assertIs(self.connection["quotes"], table)
+        self.assertEqual(self.connection.stats()["opens"], 1)
+        self.assertEqual(self.connection.stats()["hits"], 1)
+
+    def test_own_writes_are_visible_immediately(self):
+        """Test that writes through the cached handle need no refresh."""
+        self.connection.open_table("quotes").add([{"id": "q2"}])
+        self.assertEqual(self.connection.open_table("quotes").count_rows(), 2)
+
+    def test_external_writes_after_consistency_interval(self):
+        """Test that other writers become visible once the interval elapses."""
+        self.connection.open_table("quotes")
+        self.external_write()
+        self.clock += 1
+        self.assertEqual(self.connection.open_table("quotes").count_rows(), 1)
+        self.clock += 5
+        self.assertEqual(self.connection.open_table("quotes").count_rows(), 2)
+        self.assertEqual(self.connection.stats()["refreshes"], 1)
+
+    def test_zero_interval_is_strongly_consistent(self):
+        """Test that an interval of 0 refreshes on every access."""
+        self.connection.consistency_interval = 0
+        self.connection.open_table("quotes")
+        self.external_write()
+        self.assertEqual(self.connection.open_table("quotes").count_rows(), 2)
+
+    def test_overwrite_replaces_cached_handle(self):
+        """Test that recreating a table updates the cache."""
+        self.connection.open_table("quotes")
+        self.connection.create_table("quotes", data=[{"id": "q9"}], mode="overwrite")
+        rows = self.connection.open_table("quotes").search().to_list()
+        self.assertEqual([row["id"] for row in rows], ["q9"])
+
+    def test_missing_table_raises(self):
+        """Test that missing tables are not cached."""
+        with self.assertRaises((KeyError, ValueError, FileNotFoundError)):
+            self.connection.open_table("missing")
+        self.assertEqual(self.connection.stats()["tables"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
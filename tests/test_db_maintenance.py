@@ -0,0 +1,38 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+import lancedb
+from app.utils.db_maintenance import LanceDBCompactor
+
+class TestLanceDBCompactor(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.db_path = self.temp_dir / "db"
+        db = lancedb.connect(str(self.db_path))
+        table = db.create_table("quotes", data=[{"id": "q0", "status": "draft"}])
+        for i in range(1, 6):
+            table.add([{"id": f"q{i}", "status": "draft"}])
+        table.update(where="id = 'q0'", values={"status": "submitted"})
+        self.rows = sorted(table.search().to_list(), key=lambda row: row["id"])
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_compacts_and_prunes_versions(self):
+        """Test that compaction merges fragments and prunes versions without changing the data."""
+        compactor = LanceDBCompactor(str(self.db_path), retention_hours=0, tables=["quotes", "agents"])
+        reports = compactor.compact_all()
+
+        self.assertEqual([report["table"] for report in reports], ["quotes"])
+        before, after = reports[0]["before"], reports[0]["after"]
+        self.assertGreater(before["fragments"], 1)
+        self.assertEqual(after["fragments"], 1)
+        self.assertLess(after["versions"], before["versions"])
+        self.assertGreater(reports[0]["bytes_reclaimed"], 0)
+
+        table = lancedb.connect(str(self.db_path)).open_table("quotes")
+        self.assertEqual(sorted(table.search().to_list(), key=lambda row: row["id"]), self.rows)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+import lancedb
+import pyarrow as pa
+from app.database import DOCUMENTS_SCHEMA, QUOTES_SCHEMA
+from app.utils.document_jobs import DocumentJobQueue, JobStatus
+
+class TestDocumentJobQueue(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.db = lancedb.connect(str(self.temp_dir / "db"))
+        self.db.create_table("documents", schema=DOCUMENTS_SCHEMA)
+        self.db.create_table("quotes", data=pa.Table.from_pylist(
+            [{"id": "q1", "agent_id": "a1", "quote_types": ["AUTO"]}], schema=QUOTES_SCHEMA
+        ))
+        for target in ("app.utils.document_manifest.get_table", "app.utils.quote_repository.get_table"):
+            patcher = patch(target, side_effect=lambda name, schema=None: self.db.open_table(name))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.docx_path = self.temp_dir / "auto_quote.docx"
+        self.pdf_path = self.temp_dir / "auto_quote.pdf"
+        self.docx_path.write_bytes(b"docx")
+        self.pdf_path.write_bytes(b"pdf")
+        patcher = patch("app.utils.document_jobs.DocumentGenerator")
+        self.generator = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        self.generator.generate_quote_documents.return_value = {
+            "auto": {"docx_path": str(self.docx_path), "pdf_path": str(self.pdf_path)}
+        }
+        self.queue = DocumentJobQueue(max_workers=1, history_size=2)
+        self.addCleanup(self.queue.shutdown)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def wait(self, job_id, timeout=10):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            job = self.queue.get(job_id)
+            if job["status"] in (JobStatus.COMPLETED, JobStatus.FAILED):
+                return job
+            time.sleep(0.01)
+        self.fail(f"Job {job_id} did not finish")
+
+    def quote(self):
+        return self.db.open_table("quotes").search().where("id = 'q1'").to_list()[0]
+
+    def test_submit_and_poll(self):
+        """Test that a submitted job is pollable and completes with its documents."""
+        job_id = self.queue.submit({"id": "q1", "agent_id": "a1"})
+        self.assertIn(self.queue.get(job_id)["status"], (JobStatus.QUEUED, JobStatus.RUNNING, JobStatus.COMPLETED))
+        job = self.wait(job_id)
+        self.assertEqual(job["status"], JobStatus.COMPLETED)
+        self.assertEqual(job["documents"]["auto"]["pdf_path"], str(self.pdf_path))
+        self.assertIsNotNone(job["finished_at"])
+        self.assertIsNone(self.queue.get("unknown"))
+
+    def test_writes_paths_back_to_quote(self):
+        """Test that the generated paths land on the quote and in the manifest."""
+        self.wait(self.queue.submit({"id": "q1", "agent_id": "a1"}))
+        quote = self.quote()
+        self.assertEqual((quote["docx_path"], quote["pdf_path"]), (str(self.docx_path), str(self.pdf_path)))
+        self.assertEqual(quote["quote_types"], ["AUTO"])
+        filenames = sorted(row["filename"] for row in self.db.open_table("documents").search().to_list())
+        self.assertEqual(filenames, ["auto_quote.docx", "auto_quote.pdf"])
+
+    def test_failure_status(self):
+        """Test that a generator error marks the job failed and leaves the quote alone."""
+        self.generator.generate_quote_documents.side_effect = RuntimeError("template missing")
+        job = self.wait(self.queue.submit({"id": "q1", "agent_id": "a1"}))
+        self.assertEqual(job["status"], JobStatus.FAILED)
+        self.assertEqual(job["error"], "template missing")
+        self.assertIsNone(self.quote()["docx_path"])
+        self.assertEqual(self.queue.stats()["jobs"], {JobStatus.FAILED: 1})
+
+    def test_history_is_trimmed(self):
+        """Test that the oldest finished jobs are dropped beyond history_size."""
+        job_ids = []
+        for _ in range(3):
+            job_ids.append(self.queue.submit({"id": "q1", "agent_id": "a1"}))
+            self.wait(job_ids[-1])
+        self.assertIsNone(self.queue.get(job_ids[0]))
+        self.assertIsNotNone(self.queue.get(job_ids[1]))
+        self.assertIsNotNone(self.queue.get(job_ids[2]))
+
+if __name__ == '__main__':
+    unittest.main()
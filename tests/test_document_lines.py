@@ -0,0 +1,78 @@
+import shutil
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from app.utils.document_generator import DocumentGenerator
+from app.utils.render_cache import RenderCache
+
+class TestParallelLineRendering(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        template_dir = self.temp_dir / "templates"
+        template_dir.mkdir()
+        for line in ("auto", "home", "specialty"):
+            (template_dir / f"{line}_quote_template.docx").write_bytes(f"{line} template".encode())
+        self.generator = DocumentGenerator(str(template_dir), str(self.temp_dir / "output"), max_workers=3)
+        self.quote = {"id": "q1", "client_name": "Test Client", "quote_types": ["AUTO", "HOME", "SPECIALTY"]}
+        self.failing_lines = set()
+        # Every line must reach the converter before any can finish, so a serial run times out
+        self.barrier = threading.Barrier(3, timeout=5)
+
+        for patcher in (
+            patch("app.utils.document_generator.render_cache", RenderCache()),
+            patch.object(DocumentGenerator, "_placeholders", return_value=[]),
+            patch.object(DocumentGenerator, "_render", side_effect=self._render),
+            patch.object(DocumentGenerator, "_convert_to_pdf", side_effect=self._convert)
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _render(self, template_path, replacements, output_path, renderer=None):
+        if output_path.parent.name in self.failing_lines:
+            raise RuntimeError(f"{output_path.parent.name} template is corrupt")
+        output_path.write_bytes(b"docx")
+
+    def _convert(self, docx_path, pdf_path):
+        self.barrier.wait()
+        Path(pdf_path).write_bytes(b"%PDF")
+
+    def test_lines_render_concurrently(self):
+        """Test that all lines render at once and report their paths and timings."""
+        documents = self.generator.generate_quote_documents(self.quote)
+        self.assertEqual(list(documents), ["auto", "home", "specialty"])
+        for line, result in documents.items():
+            self.assertIsNone(result["error"])
+            self.assertTrue(Path(result["docx_path"]).exists())
+            self.assertTrue(result["pdf_path"].endswith(".pdf"))
+            self.assertIsInstance(result["seconds"], float)
+            self.assertEqual(Path(result["docx_path"]).parent.name, line)
+
+    def test_failing_line_keeps_others(self):
+        """Test that one failed line is reported while the other lines are kept."""
+        self.failing_lines.add("home")
+        self.barrier = threading.Barrier(2, timeout=5)
+        documents = self.generator.generate_quote_documents(self.quote)
+        self.assertEqual(documents["home"]["error"], "home template is corrupt")
+        self.assertIsNone(documents["home"]["docx_path"])
+        self.assertIn("seconds", documents["home"])
+        for line in ("auto", "specialty"):
+            self.assertIsNone(documents[line]["error"])
+            self.assertTrue(Path(documents[line]["pdf_path"]).exists())
+
+    def test_all_lines_failing_raises(self):
+        """Test that a quote with no successful line raises."""
+        self.failing_lines.update({"auto", "home", "specialty"})
+        with self.assertRaises(RuntimeError):
+            self.generator.generate_quote_documents(self.quote)
+
+    def test_no_requested_lines(self):
+        """Test that a quote without lines generates nothing."""
+        self.assertEqual(self.generator.generate_quote_documents({"id": "q2", "quote_types": []}), {})
+
+if __name__ == '__main__':
+    unittest.main()
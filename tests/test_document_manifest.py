@@ -0,0 +1,135 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+import lancedb
+import pyarrow as pa
+from app.database import DOCUMENTS_SCHEMA, QUOTES_SCHEMA
+from app.utils.document_manifest import DocumentManifest
+
+class TestDocumentManifest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.db = lancedb.connect(str(self.temp_dir / "db"))
+        self.db.create_table("documents", schema=DOCUMENTS_SCHEMA)
+        self.db.create_table("quotes", schema=QUOTES_SCHEMA)
+        for target in ("app.utils.document_manifest.get_table", "app.utils.quote_repository.get_table"):
+            patcher = patch(target, side_effect=lambda name, schema=None: self.db.open_table(name))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.manifest = DocumentManifest()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _file(self, name, content=b"content"):
+        path = self.temp_dir / name
+        path.write_bytes(content)
+        return str(path)
+
+    def test_find_by_sha256(self):
+        """Test that stored content is found by hash, scoped to the quote and to files still on disk."""
+        record = self.manifest.add("q1", self._file("license.pdf"), "upload")
+        self.assertEqual(self.manifest.find_by_sha256("q1", record["sha256"]), record["path"])
+        self.assertIsNone(self.manifest.find_by_sha256("q2", record["sha256"]))
+        Path(record["path"]).unlink()
+        self.assertIsNone(self.manifest.find_by_sha256("q1", record["sha256"]))
+
+    def test_duplicate_listed_under_its_own_name(self):
+        """Test that a row for a duplicate upload points at the stored file under the new name."""
+        original = self.manifest.add("q1", self._file("license.pdf"), "upload")
+        alias = self.manifest.add("q1", original["path"], "upload", sha256=original["sha256"], filename="license-copy.pdf")
+        self.assertEqual((alias["filename"], alias["path"], alias["type"]), ("license-copy.pdf", original["path"], "pdf"))
+        self.assertEqual(sorted(row["filename"] for row in self.manifest.list("q1")), ["license-copy.pdf", "license.pdf"])
+
+        self.manifest.delete("q1", "license-copy.pdf")
+        self.assertTrue(Path(original["path"]).exists())
+        self.manifest.delete("q1", "license.pdf")
+        self.assertFalse(Path(original["path"]).exists())
+
+    def test_add_many_is_one_commit(self):
+        """Test that several files are recorded with a single table version."""
+        version = self.db.open_table("documents").version
+        paths = [self._file("auto.docx"), self._file("auto.pdf", b"pdf")]
+        records = self.manifest.add_many("q1", paths, "generated")
+        self.assertEqual([record["type"] for record in records], ["docx", "pdf"])
+        self.assertEqual(self.manifest.add_many("q1", [], "generated"), [])
+        self.assertEqual(sorted(row["filename"] for row in self.manifest.list("q1")), ["auto.docx", "auto.pdf"])
+        table = self.db.open_table("documents")
+        self.assertEqual(table.count_rows(), 2)
+        self.assertEqual(table.stats()["fragment_stats"]["num_fragments"], 1)
+
+    def test_get_returns_newest(self):
+        """Test that re-recording a filename makes get return the latest row."""
+        path = self._file("license.pdf")
+        first = self.manifest.add("q1", path, "upload")
+        self._file("license.pdf", b"newer")
+        second = self.manifest.add("q1", path, "upload")
+        self.assertNotEqual(first["sha256"], second["sha256"])
+        self.assertEqual(self.manifest.get("q1", "license.pdf")["id"], second["id"])
+        self.assertIsNone(self.manifest.get("q2", "license.pdf"))
+
+    def test_delete_updates_quote_and_unlinks(self):
+        """Test that deleting drops the row, the quote's references and the file."""
+        path = self._file("auto.pdf")
+        other = self._file("auto.docx")
+        self.db.open_table("quotes").add(
+            pa.Table.from_pylist([{"id": "q1", "documents": [path, other], "pdf_path": path, "docx_path": other}], schema=QUOTES_SCHEMA)
+        )
+        self.manifest.add("q1", path, "generated")
+
+        self.assertIsNotNone(self.manifest.delete("q1", "auto.pdf"))
+        quote = self.db.open_table("quotes").search().where("id = 'q1'").to_list()[0]
+        self.assertEqual(quote["documents"], [other])
+        self.assertIsNone(quote["pdf_path"])
+        self.assertEqual(quote["docx_path"], other)
+        self.assertFalse(Path(path).exists())
+        self.assertIsNone(self.manifest.delete("q1", "auto.pdf"))
+
+    def _quote(self):
+        return self.db.open_table("quotes").search().where("id = 'q1'").to_list()[0]
+
+    def test_delete_only_document(self):
+        """Test that deleting a quote's only document empties its list and removes the file."""
+        path = self._file("auto.pdf")
+        self.db.open_table("quotes").add(
+            pa.Table.from_pylist([{"id": "q1", "documents": [path], "pdf_path": path}], schema=QUOTES_SCHEMA)
+        )
+        self.manifest.add("q1", path, "generated")
+
+        self.assertIsNotNone(self.manifest.delete("q1", "auto.pdf"))
+        quote = self._quote()
+        self.assertEqual((quote["documents"], quote["pdf_path"]), ([], None))
+        self.assertEqual(self.manifest.list("q1"), [])
+        self.assertFalse(Path(path).exists())
+
+    def test_delete_restores_state_on_failure(self):
+        """Test that a failed unlink puts the manifest row and quote references back."""
+        path = self._file("auto.pdf")
+        self.db.open_table("quotes").add(
+            pa.Table.from_pylist([{"id": "q1", "documents": [path], "pdf_path": path}], schema=QUOTES_SCHEMA)
+        )
+        record = self.manifest.add("q1", path, "generated")
+
+        with patch("app.utils.document_manifest.os.unlink", side_effect=PermissionError("busy")):
+            with self.assertRaises(PermissionError):
+                self.manifest.delete("q1", "auto.pdf")
+        quote = self._quote()
+        self.assertEqual((quote["documents"], quote["pdf_path"]), ([path], path))
+        self.assertEqual(self.manifest.get("q1", "auto.pdf")["id"], record["id"])
+        self.assertTrue(Path(path).exists())
+
+    def test_delete_keeps_shared_file(self):
+        """Test that a file another quote still references is not unlinked."""
+        path = self._file("auto.pdf")
+        self.manifest.add("q1", path, "generated")
+        self.manifest.add("q2", path, "generated")
+        self.manifest.delete("q1", "auto.pdf")
+        self.assertTrue(Path(path).exists())
+        self.assertIsNotNone(self.manifest.get("q2", "auto.pdf"))
+        self.manifest.delete("q2", "auto.pdf")
+        self.assertFalse(Path(path).exists())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from app.utils.file_streaming import stream_file
+
+class TestFileStreaming(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.file_path = self.temp_dir / "quote.pdf"
+        self.content = bytes(range(256)) * 40
+        self.file_path.write_bytes(self.content)
+
+        app = FastAPI()
+
+        @app.get("/file")
+        def get_file(request: Request):
+            return stream_file(request, self.file_path, "application/pdf", "quote.pdf", chunk_size=1000)
+
+        @app.get("/named")
+        def get_named_file(request: Request):
+            return stream_file(request, self.file_path, "application/pdf", "Zoë Łukasz_auto_quote.pdf")
+
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_full_download(self):
+        """Test that the whole file streams with an ETag."""
+        response = self.client.get("/file")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, self.content)
+        self.assertEqual(response.headers["accept-ranges"], "bytes")
+        self.assertIn("etag", response.headers)
+
+    def test_non_ascii_filename(self):
+        """Test that non-latin-1 download names are RFC 5987 encoded."""
+        response = self.client.get("/named")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.headers["content-disposition"],
+            "attachment; filename=\"Zo? ?ukasz_auto_quote.pdf\"; "
+            "filename*=utf-8''Zo%C3%AB%20%C5%81ukasz_auto_quote.pdf"
+        )
+        self.assertEqual(self.client.get("/file").headers["content-disposition"], 'attachment; filename="quote.pdf"')
+
+    def test_if_none_match(self):
+        """Test that a matching ETag returns 304 with no body."""
+        etag = self.client.get("/file").headers["etag"]
+        response = self.client.get("/file", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_range_request(self):
+        """Test that byte ranges return 206 with the requested slice."""
+        response = self.client.get("/file", headers={"Range": "bytes=100-2599"})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.content, self.content[100:2600])
+        self.assertEqual(response.headers["content-range"], f"bytes 100-2599/{len(self.content)}")
+
+    def test_suffix_range(self):
+        """Test that suffix ranges return the end of the file."""
+        response = self.client.get("/file", headers={"Range": "bytes=-10"})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.content, self.content[-10:])
+
+    def test_unsatisfiable_range(self):
+        """Test that ranges past the end of the file return 416."""
+        response = self.client.get("/file", headers={"Range": f"bytes={len(self.content)}-"})
+        self.assertEqual(response.status_code, 416)
+
+    def test_invalid_range_serves_full_file(self):
+        """Test that a range whose start is after its end is ignored."""
+        response = self.client.get("/file", headers={"Range": "bytes=5-3"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, self.content)
+        self.assertNotIn("content-range", response.headers)
+
+    def test_stale_if_range_serves_full_file(self):
+        """Test that a stale If-Range ignores the Range header."""
+        response = self.client.get("/file", headers={"Range": "bytes=0-9", "If-Range": '"stale"'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.content), len(self.content))
+
+if __name__ == '__main__':
+    unittest.main()
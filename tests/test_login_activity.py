@@ -0,0 +1,75 @@
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+import lancedb
+from app.utils.login_activity import LoginActivityBuffer
+
+class TestLoginActivityBuffer(unittest.TestCase):
+    def setUp(self):
+        self.db_dir = tempfile.mkdtemp()
+        self.db = lancedb.connect(self.db_dir)
+        self.db.create_table("agents", data=[
+            {"id": "1", "email": "a@example.com", "is_active": True, "last_login": ""},
+            {"id": "2", "email": "o'neil@example.com", "is_active": True, "last_login": ""},
+            {"id": "3", "email": "c@example.com", "is_active": True, "last_login": ""}
+        ])
+        patcher = patch("app.utils.login_activity.get_table", side_effect=self.db.open_table)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.buffer = LoginActivityBuffer(flush_interval=60)
+
+    def tearDown(self):
+        shutil.rmtree(self.db_dir)
+
+    def last_logins(self):
+        return {row["email"]: row["last_login"] for row in self.db.open_table("agents").search().to_list()}
+
+    def test_logins_are_debounced_into_one_write(self):
+        """Test that many logins produce a single table version."""
+        version = self.db.open_table("agents").version
+        for minute in range(5):
+            self.buffer.record("a@example.com", f"2024-01-01T00:0{minute}:00")
+        self.buffer.record("o'neil@example.com", "2024-01-01T01:00:00")
+        self.assertEqual(self.buffer.flush(), 2)
+
+        table = self.db.open_table("agents")
+        self.assertEqual(table.version, version + 1)
+        self.assertEqual(table.count_rows(), 3)
+        self.assertEqual(self.last_logins(), {
+            "a@example.com": "2024-01-01T00:04:00",
+            "o'neil@example.com": "2024-01-01T01:00:00",
+            "c@example.com": ""
+        })
+
+    def test_flush_keeps_concurrent_agent_changes(self):
+        """Test that a flush only writes last_login, not a stale copy of the row."""
+        self.buffer.record("a@example.com", "2024-01-01T00:00:00")
+        self.db.open_table("agents").update(where="email = 'a@example.com'", values={"is_active": False})
+        self.assertEqual(self.buffer.flush(), 1)
+        agent = self.db.open_table("agents").search().where("email = 'a@example.com'").to_list()[0]
+        self.assertFalse(agent["is_active"])
+        self.assertEqual(agent["last_login"], "2024-01-01T00:00:00")
+
+    def test_unknown_agents_are_skipped(self):
+        """Test that logins for missing agents insert nothing."""
+        self.buffer.record("ghost@example.com", "2024-01-01T00:00:00")
+        self.assertEqual(self.buffer.flush(), 0)
+        self.assertEqual(self.db.open_table("agents").count_rows(), 3)
+
+    def test_empty_flush_writes_nothing(self):
+        """Test that flushing with nothing pending leaves the table alone."""
+        version = self.db.open_table("agents").version
+        self.assertEqual(self.buffer.flush(), 0)
+        self.assertEqual(self.db.open_table("agents").version, version)
+
+    def test_stop_flushes_pending(self):
+        """Test that stopping the buffer writes pending timestamps."""
+        self.buffer.start()
+        self.buffer.record("c@example.com", "2024-01-02T00:00:00")
+        self.buffer.stop()
+        self.assertEqual(self.last_logins()["c@example.com"], "2024-01-02T00:00:00")
+        self.assertEqual(self.buffer.stats()["pending"], 0)
+
+if __name__ == "__main__":
+    unittest.main()
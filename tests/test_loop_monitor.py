@@ -0,0 +1,32 @@
+import asyncio
+import time
+import unittest
+from app.utils.loop_monitor import EventLoopMonitor
+
+class TestEventLoopMonitor(unittest.TestCase):
+    def test_detects_blocking_call(self):
+        """Test that a blocking call on the loop is reported as lag."""
+        monitor = EventLoopMonitor(interval=0.01, warn_threshold=0.05)
+        samples = []
+        monitor.add_listener(samples.append)
+
+        async def scenario():
+            monitor.start()
+            await asyncio.sleep(0.05)
+            time.sleep(0.1)
+            await asyncio.sleep(0.05)
+            await monitor.stop()
+
+        with self.assertLogs("app.utils.loop_monitor", level="WARNING"):
+            asyncio.run(scenario())
+        stats = monitor.stats()
+        self.assertGreaterEqual(stats["max_ms"], 50)
+        self.assertGreaterEqual(stats["slow_ticks"], 1)
+        self.assertEqual(len(samples), stats["samples"])
+
+    def test_empty_stats(self):
+        """Test that stats are zeroed before any samples."""
+        self.assertEqual(EventLoopMonitor().stats()["samples"], 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+from fastapi.testclient import TestClient
+from app.main import app, get_current_user
+
+class TestMetricsAccess(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(app)
+        self.addCleanup(app.dependency_overrides.clear)
+
+    def as_agent(self, permissions):
+        app.dependency_overrides[get_current_user] = lambda: {
+            "email": "agent@example.com", "permissions": permissions
+        }
+
+    def test_requires_authentication(self):
+        """Test that anonymous requests are rejected."""
+        self.assertEqual(self.client.get("/api/metrics").status_code, 401)
+
+    def test_requires_admin(self):
+        """Test that agents without the admin permission are refused."""
+        self.as_agent(["basic"])
+        self.assertEqual(self.client.get("/api/metrics").status_code, 403)
+
+    def test_admin_sees_metrics(self):
+        """Test that admins get the metrics payload."""
+        self.as_agent(["admin"])
+        response = self.client.get("/api/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("db_pool", response.json())
+
+if __name__ == '__main__':
+    unittest.main()
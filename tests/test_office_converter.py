@@ -0,0 +1,119 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+from app.utils import office_converter
+from app.utils.office_converter import OfficeConverterPool, OfficeInstance
+
+class FakeProcess:
+    def __init__(self, *args, **kwargs):
+        self.returncode = None
+        self.killed = False
+
+    def poll(self):
+        return self.returncode
+
+    def wait(self, timeout=None):
+        self.returncode = self.returncode if self.returncode is not None else 0
+        return self.returncode
+
+    def kill(self):
+        self.killed = True
+        self.returncode = -9
+
+class TestOfficeConverter(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.processes = []
+
+        def popen(*args, **kwargs):
+            self.processes.append(FakeProcess())
+            return self.processes[-1]
+
+        for patcher in (
+            patch.object(office_converter, "uno", MagicMock()),
+            patch.object(office_converter, "PropertyValue", MagicMock, create=True),
+            patch("app.utils.office_converter.subprocess.Popen", side_effect=popen),
+            patch.object(OfficeInstance, "_connect", side_effect=lambda: MagicMock())
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def pool(self, **kwargs):
+        return OfficeConverterPool(size=1, profile_root=str(self.temp_dir), **kwargs)
+
+    def test_start_requires_uno_before_launching(self):
+        """Test that a missing UNO binding fails without launching soffice."""
+        with patch.object(office_converter, "uno", None):
+            with self.assertRaises(RuntimeError):
+                OfficeInstance(None, self.temp_dir / "profile").start()
+        self.assertEqual(self.processes, [])
+
+    def test_start_kills_process_on_failure(self):
+        """Test that soffice is killed when connecting to it fails."""
+        instance = OfficeInstance(None, self.temp_dir / "profile")
+        with patch.object(OfficeInstance, "_connect", side_effect=RuntimeError("no desktop")):
+            with self.assertRaises(RuntimeError):
+                instance.start()
+        self.assertTrue(self.processes[0].killed)
+        self.assertIsNone(instance.process)
+
+    def test_instances_get_distinct_ports_and_profiles(self):
+        """Test that instances pick free ports and per-process profile directories."""
+        pool = OfficeConverterPool(size=2, profile_root=str(self.temp_dir))
+        pool.warm()
+        ports = [instance.port for instance in pool._instances]
+        self.assertEqual(len(set(ports)), 2)
+        self.assertTrue(all(port > 0 for port in ports))
+        profiles = {instance.profile_dir.name for instance in pool._instances}
+        self.assertEqual(len(profiles), 2)
+        self.assertTrue(all(str(office_converter.os.getpid()) in name for name in profiles))
+        self.assertEqual(pool.stats()["running"], 2)
+
+    def test_warm_starts_instances_once(self):
+        """Test that warming starts stopped instances and leaves running ones alone."""
+        pool = self.pool()
+        pool.warm()
+        pool.warm()
+        self.assertEqual(len(self.processes), 1)
+        self.assertEqual(pool.stats()["idle"], 1)
+
+    def test_recycles_after_max_conversions(self):
+        """Test that an instance is restarted once it reaches max_conversions."""
+        pool = self.pool(max_conversions=2)
+        for _ in range(3):
+            pool.convert("in.docx", "out.pdf")
+        self.assertEqual(pool.recycled, 1)
+        self.assertEqual(len(self.processes), 2)
+        self.assertEqual(pool._instances[0].conversions, 1)
+
+    def test_unhealthy_instance_is_restarted(self):
+        """Test that an instance failing its health check is restarted before use."""
+        pool = self.pool()
+        pool.warm()
+        instance = pool._instances[0]
+        self.assertTrue(instance.is_healthy())
+        instance.desktop.getComponents.side_effect = RuntimeError("bridge disposed")
+        self.assertFalse(instance.is_healthy())
+
+        pool.convert("in.docx", "out.pdf")
+        self.assertEqual(pool.recycled, 1)
+        self.assertEqual(len(self.processes), 2)
+        self.assertTrue(instance.is_healthy())
+
+    def test_failed_conversion_recycles_instance(self):
+        """Test that a failed conversion stops the instance and returns it to the pool."""
+        pool = self.pool()
+        pool.warm()
+        pool._instances[0].desktop.loadComponentFromURL.return_value = None
+        with self.assertRaises(RuntimeError):
+            pool.convert("in.docx", "out.pdf")
+        self.assertEqual(pool.recycled, 1)
+        self.assertEqual(pool.stats(), {"size": 1, "idle": 1, "running": 0, "recycled": 1})
+
+if __name__ == '__main__':
+    unittest.main()
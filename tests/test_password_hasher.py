@@ -0,0 +1,75 @@
+import asyncio
+import threading
+import unittest
+from fastapi import HTTPException
+from passlib.context import CryptContext
+from app.utils.password_hasher import PasswordHasher, LatencyHistogram
+
+class BlockingContext:
+    """Stand-in context whose calls block until released."""
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def hash(self, password):
+        self.release.wait(5)
+        return "hashed"
+
+    def verify(self, password, hashed):
+        self.release.wait(5)
+        return True
+
+class TestPasswordHasher(unittest.TestCase):
+    def test_hash_and_verify(self):
+        """Test a bcrypt round trip through the pool."""
+        hasher = PasswordHasher(CryptContext(schemes=["bcrypt"], bcrypt__rounds=4), max_workers=1)
+        self.addCleanup(hasher.shutdown)
+
+        async def scenario():
+            hashed = await hasher.hash("secret")
+            return await hasher.verify("secret", hashed), await hasher.verify("wrong", hashed)
+
+        self.assertEqual(asyncio.run(scenario()), (True, False))
+        stats = hasher.stats()
+        self.assertEqual(stats["latency"]["hash"]["count"], 1)
+        self.assertEqual(stats["latency"]["verify"]["count"], 2)
+        self.assertEqual(stats["in_flight"], 0)
+
+    def test_queue_limit_returns_503(self):
+        """Test that calls beyond the queue limit are rejected."""
+        context = BlockingContext()
+        hasher = PasswordHasher(context, max_workers=1, max_queue=2)
+        self.addCleanup(hasher.shutdown)
+
+        async def scenario():
+            first = asyncio.ensure_future(hasher.verify("a", "x"))
+            second = asyncio.ensure_future(hasher.verify("b", "x"))
+            await asyncio.sleep(0.05)
+            try:
+                await hasher.verify("c", "x")
+            finally:
+                context.release.set()
+                await asyncio.gather(first, second)
+
+        with self.assertRaises(HTTPException) as raised:
+            asyncio.run(scenario())
+        self.assertEqual(raised.exception.status_code, 503)
+        self.assertEqual(hasher.stats()["rejected"], 1)
+
+    def test_missing_hash_is_rejected(self):
+        """Test that an empty stored hash never verifies."""
+        hasher = PasswordHasher(BlockingContext(), max_workers=1)
+        self.addCleanup(hasher.shutdown)
+        self.assertFalse(asyncio.run(hasher.verify("secret", None)))
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test that bucket counts accumulate across bounds."""
+        histogram = LatencyHistogram(buckets_ms=(10, 100))
+        for seconds in (0.005, 0.05, 0.5):
+            histogram.observe(seconds)
+        snapshot = histogram.snapshot()
+        self.assertEqual(snapshot["buckets"], {"le_10": 1, "le_100": 2, "le_inf": 3})
+        self.assertEqual(snapshot["count"], 3)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+from unittest.mock import patch
+from passlib.context import CryptContext
+from app.utils.password_policy import PasswordPolicy, tune_bcrypt_rounds, BCRYPT_ROUNDS_RANGE
+
+class TestPasswordPolicy(unittest.TestCase):
+    def test_bcrypt_rounds_follow_target(self):
+        """Test that each doubling of the target adds one round."""
+        with patch("app.utils.password_policy._time_hash", return_value=0.05):
+            self.assertEqual(tune_bcrypt_rounds(0.05), BCRYPT_ROUNDS_RANGE[0])
+            self.assertEqual(tune_bcrypt_rounds(0.2), BCRYPT_ROUNDS_RANGE[0] + 2)
+            self.assertEqual(tune_bcrypt_rounds(1000), BCRYPT_ROUNDS_RANGE[1])
+
+    def test_weaker_bcrypt_hash_needs_update(self):
+        """Test that hashes below the tuned cost are flagged for rehash."""
+        context = PasswordPolicy(scheme="bcrypt", cost=11).build_context()
+        weak = CryptContext(schemes=["bcrypt"], bcrypt__rounds=10).hash("secret")
+        self.assertTrue(context.needs_update(weak))
+        self.assertTrue(context.verify("secret", weak))
+        self.assertFalse(context.needs_update(context.hash("secret")))
+
+    def test_argon2_migrates_bcrypt(self):
+        """Test that bcrypt hashes are flagged once argon2 is preferred."""
+        policy = PasswordPolicy(scheme="argon2", cost=2, argon2_memory_cost=1024, argon2_parallelism=1)
+        if policy.scheme != "argon2":
+            self.skipTest("argon2-cffi is not installed")
+        context = policy.build_context()
+        legacy = CryptContext(schemes=["bcrypt"], bcrypt__rounds=10).hash("secret")
+        self.assertTrue(context.needs_update(legacy))
+        self.assertTrue(context.verify("secret", legacy))
+        fresh = context.hash("secret")
+        self.assertTrue(fresh.startswith("$argon2"))
+        self.assertFalse(context.needs_update(fresh))
+
+    def test_unknown_scheme(self):
+        """Test that unsupported schemes are rejected."""
+        with self.assertRaises(ValueError):
+            PasswordPolicy(scheme="md5")
+
+if __name__ == "__main__":
+    unittest.main()
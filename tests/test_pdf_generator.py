@@ -0,0 +1,77 @@
+import shutil
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from app.utils.pdf_generator import PDFGenerator
+
+class FakePool:
+    def __init__(self, fail_on=()):
+        self.fail_on = set(fail_on)
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def convert(self, docx_path, pdf_path):
+        with self._lock:
+            self.calls.append(docx_path)
+        if Path(docx_path).name in self.fail_on:
+            raise RuntimeError("corrupt document")
+        Path(pdf_path).write_bytes(b"%PDF")
+
+class TestPDFGeneratorBatch(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.generator = PDFGenerator(str(self.temp_dir / "templates"), str(self.temp_dir / "output"))
+        self.docx_paths = []
+        for line in ("auto", "home", "specialty"):
+            path = self.temp_dir / "docx" / line / f"{line}_quote.docx"
+            path.parent.mkdir(parents=True)
+            path.write_bytes(b"docx")
+            self.docx_paths.append(str(path))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _convert(self, pool, paths, **kwargs):
+        with patch("app.utils.pdf_generator.get_converter_pool", return_value=pool):
+            return self.generator.generate_pdfs_batch(paths, **kwargs)
+
+    def test_batch_converts_each_file_once(self):
+        """Test that every DOCX is converted once and reported with its timing."""
+        pool = FakePool()
+        results = self._convert(pool, self.docx_paths + self.docx_paths[:1], max_workers=2)
+        self.assertEqual(sorted(pool.calls), sorted(self.docx_paths))
+        self.assertEqual(list(results), self.docx_paths)
+        for result in results.values():
+            self.assertIsNone(result["error"])
+            self.assertTrue(Path(result["pdf_path"]).exists())
+            self.assertGreaterEqual(result["seconds"], 0)
+
+    def test_failure_does_not_sink_batch(self):
+        """Test that one failed conversion is reported while the others succeed."""
+        results = self._convert(FakePool(fail_on={"home_quote.docx"}), self.docx_paths)
+        failed = results[self.docx_paths[1]]
+        self.assertEqual((failed["pdf_path"], failed["error"]), (None, "corrupt document"))
+        self.assertIn("seconds", failed)
+        for path in (self.docx_paths[0], self.docx_paths[2]):
+            self.assertIsNone(results[path]["error"])
+            self.assertTrue(Path(results[path]["pdf_path"]).exists())
+
+    def test_empty_batch(self):
+        """Test that an empty batch converts nothing."""
+        pool = FakePool()
+        self.assertEqual(self._convert(pool, []), {})
+        self.assertEqual(pool.calls, [])
+
+    def test_quote_maps_lines_and_surfaces_failures(self):
+        """Test that the per-quote wrapper maps lines to PDFs and raises on a failed file."""
+        with patch("app.utils.pdf_generator.get_converter_pool", return_value=FakePool()):
+            pdf_paths = self.generator.generate_pdfs_for_quote({}, self.docx_paths[:2])
+        self.assertEqual(sorted(pdf_paths), ["auto", "home"])
+        with patch("app.utils.pdf_generator.get_converter_pool", return_value=FakePool(fail_on={"auto_quote.docx"})):
+            with self.assertRaises(RuntimeError):
+                self.generator.generate_pdfs_for_quote({}, self.docx_paths[:2])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+from docx import Document
+from app.utils.placeholders import substitute_text, fill_paragraph, replace_placeholders
+
+class TestPlaceholders(unittest.TestCase):
+    def test_substitute_text(self):
+        """Test single-pass substitution, including hyphenated and unknown keys."""
+        text = "{{pniname}} on {{current-date}} via {{unknown}}"
+        result = substitute_text(text, {"pniname": "John Doe", "current-date": "2024-01-01"})
+        self.assertEqual(result, "John Doe on 2024-01-01 via {{unknown}}")
+
+    def test_placeholder_split_across_runs(self):
+        """Test that placeholders split across runs are filled and formatting kept."""
+        doc = Document()
+        paragraph = doc.add_paragraph()
+        bold = paragraph.add_run("Name: ")
+        bold.bold = True
+        paragraph.add_run("{{client")
+        paragraph.add_run("_na")
+        paragraph.add_run("me}} and {{client_email}}")
+
+        filled = fill_paragraph(paragraph, {"client_name": "John Doe", "client_email": "john@example.com"})
+
+        self.assertEqual(filled, 2)
+        self.assertEqual(paragraph.text, "Name: John Doe and john@example.com")
+        self.assertTrue(paragraph.runs[0].bold)
+        self.assertEqual(paragraph.runs[0].text, "Name: ")
+
+    def test_replace_placeholders_in_tables(self):
+        """Test that table cell paragraphs are filled."""
+        doc = Document()
+        doc.add_paragraph("{{client_name}}")
+        table = doc.add_table(rows=1, cols=1)
+        table.cell(0, 0).text = "{{current_carrier}}"
+
+        filled = replace_placeholders(doc, {"client_name": "John Doe", "current_carrier": "AAA"})
+
+        self.assertEqual(filled, 2)
+        self.assertEqual(doc.paragraphs[0].text, "John Doe")
+        self.assertEqual(doc.tables[0].cell(0, 0).text, "AAA")
+
+    def test_paragraph_without_placeholders_untouched(self):
+        """Test that paragraphs without known placeholders are left alone."""
+        doc = Document()
+        paragraph = doc.add_paragraph("Plain text {{unknown}}")
+        self.assertEqual(fill_paragraph(paragraph, {"client_name": "John"}), 0)
+        self.assertEqual(paragraph.text, "Plain text {{unknown}}")
+
+if __name__ == '__main__':
+    unittest.main()
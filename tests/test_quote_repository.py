@@ -0,0 +1,186 @@
+import unittest
+import tempfile
+import shutil
+from unittest.mock import patch
+import lancedb
+from app.database import QUOTES_SCHEMA
+from app.utils.quote_repository import QuoteRepository
+
+class TestQuoteRepository(unittest.TestCase):
+    def setUp(self):
+        self.db_dir = tempfile.mkdtemp()
+        self.db = lancedb.connect(self.db_dir)
+        self.db.create_table("quotes", data=[
+            {"id": "q1", "agent_id": "a1", "status": "pending", "updated_at": "", "docx_path": ""},
+            {"id": "q2", "agent_id": "a2", "status": "pending", "updated_at": "", "docx_path": ""}
+        ])
+        patcher = patch("app.utils.quote_repository.get_table", side_effect=self.db.open_table)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.repo = QuoteRepository()
+
+    def tearDown(self):
+        shutil.rmtree(self.db_dir)
+
+    def test_ensure_indexes(self):
+        """Test that id and agent_id get scalar indexes."""
+        self.assertEqual(self.repo.ensure_indexes(), ["id", "agent_id"])
+        # Second call must not fail on existing indexes
+        self.assertEqual(self.repo.ensure_indexes(), ["id", "agent_id"])
+
+    def test_get_respects_agent(self):
+        """Test that lookups scoped to another agent return nothing."""
+        self.assertEqual(self.repo.get("q1")["agent_id"], "a1")
+        self.assertIsNone(self.repo.get("q1", agent_id="a2"))
+
+    def test_update_is_single_commit(self):
+        """Test that an update writes one version and keeps row count."""
+        version = self.repo.table.version
+        quote = self.repo.update("q1", {"status": "completed"}, agent_id="a1")
+        self.assertEqual(quote["status"], "completed")
+        self.assertNotEqual(quote["updated_at"], "")
+        self.assertEqual(self.repo.table.version, version + 1)
+        self.assertEqual(self.repo.table.count_rows(), 2)
+
+    def test_update_keeps_concurrent_column_changes(self):
+        """Test that an update only writes the changed columns."""
+        stale = self.repo.get("q1")
+        self.db.open_table("quotes").update(where="id = 'q1'", values={"docx_path": "output/auto/q1.docx"})
+        with patch.object(self.repo, "get", return_value=stale):
+            self.repo.update("q1", {"status": "completed"})
+        row = self.db.open_table("quotes").search().where("id = 'q1'").to_list()[0]
+        self.assertEqual((row["status"], row["docx_path"]), ("completed", "output/auto/q1.docx"))
+
+    def test_update_missing_quote(self):
+        """Test that updating a missing quote raises KeyError."""
+        with self.assertRaises(KeyError):
+            self.repo.update("missing", {"status": "completed"})
+
+    def test_upsert_inserts_new_rows(self):
+        """Test that upsert inserts records with unseen ids."""
+        self.repo.upsert([{"id": "q3", "agent_id": "a1", "status": "pending", "updated_at": ""}])
+        self.assertEqual(self.repo.table.count_rows(), 3)
+
+class TestQuotePagination(unittest.TestCase):
+    def setUp(self):
+        self.db_dir = tempfile.mkdtemp()
+        self.db = lancedb.connect(self.db_dir)
+        rows = [
+            {
+                "id": f"q{i:02d}",
+                "agent_id": "a1" if i % 3 else "a2",
+                "client_name": f"Client {i}",
+                "status": "completed" if i % 2 else "pending",
+                "personal_info": {"ssn": "000-00-0000"},
+                "quote_types": ["AUTO", "HOME"] if i % 4 == 0 else ["HOME"],
+                # Pairs of quotes share a timestamp to exercise the id tiebreak
+                "created_at": f"2024-01-{i // 2 + 1:02d}T00:00:00"
+            }
+            for i in range(20)
+        ]
+        self.db.create_table("quotes", data=rows)
+        patcher = patch("app.utils.quote_repository.get_table", side_effect=self.db.open_table)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.repo = QuoteRepository()
+        self.expected = sorted(
+            (row for row in rows if row["agent_id"] == "a1"),
+            key=lambda row: (row["created_at"], row["id"]),
+            reverse=True
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.db_dir)
+
+    def test_pages_cover_all_quotes_once(self):
+        """Test that following cursors returns every quote in order without repeats."""
+        seen, cursor = [], None
+        while True:
+            page, cursor = self.repo.list_page("a1", limit=4, cursor=cursor, fields=("id",))
+            seen.extend(row["id"] for row in page)
+            if cursor is None:
+                break
+        self.assertEqual(seen, [row["id"] for row in self.expected])
+
+    def test_projection(self):
+        """Test that only requested columns are returned."""
+        page, _ = self.repo.list_page("a1", limit=2, fields=("id", "status"))
+        self.assertEqual(set(page[0]), {"id", "status"})
+
+    def test_filters_and_bad_input(self):
+        """Test extra filters, unknown fields and malformed cursors."""
+        page, _ = self.repo.list_page("a1", limit=50, fields=("status",), filters=["status = 'pending'"])
+        self.assertTrue(page and all(row["status"] == "pending" for row in page))
+        with self.assertRaises(ValueError):
+            self.repo.list_page("a1", fields=("missing",))
+        with self.assertRaises(ValueError):
+            self.repo.list_page("a1", cursor="not-a-cursor", fields=("id",))
+
+    def test_quote_type_without_flag_columns(self):
+        """Test that tables without has_* columns fall back to array_has."""
+        page, _ = self.repo.list_page("a1", limit=50, fields=("quote_types",), quote_type="auto")
+        self.assertTrue(page and all("AUTO" in row["quote_types"] for row in page))
+        with self.assertRaises(ValueError):
+            self.repo.list_page("a1", fields=("id",), quote_type="boat")
+
+class TestQuoteLineFlags(unittest.TestCase):
+    def setUp(self):
+        self.db_dir = tempfile.mkdtemp()
+        self.db = lancedb.connect(self.db_dir)
+        self.db.create_table("quotes", schema=QUOTES_SCHEMA)
+        patcher = patch("app.utils.quote_repository.get_table", side_effect=self.db.open_table)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.repo = QuoteRepository()
+        self.repo.add([
+            {"id": "q1", "agent_id": "a1", "quote_types": ["AUTO"], "created_at": "2024-01-01T00:00:00"},
+            {"id": "q2", "agent_id": "a1", "quote_types": ["home", "SPECIALTY"], "created_at": "2024-01-02T00:00:00"}
+        ])
+
+    def tearDown(self):
+        shutil.rmtree(self.db_dir)
+
+    def test_flags_derived_on_write(self):
+        """Test that has_* columns follow quote_types on insert and update."""
+        self.assertEqual(
+            (self.repo.get("q2")["has_auto"], self.repo.get("q2")["has_home"], self.repo.get("q2")["has_specialty"]),
+            (False, True, True)
+        )
+        self.repo.update("q2", {"quote_types": ["AUTO"]})
+        self.assertTrue(self.repo.get("q2")["has_auto"])
+        self.assertFalse(self.repo.get("q2")["has_home"])
+
+    def test_update_list_columns(self):
+        """Test that list columns can be cleared and set through update."""
+        self.repo.ensure_indexes()
+        self.repo.update("q1", {"documents": [], "quote_types": []})
+        quote = self.repo.get("q1")
+        self.assertEqual((quote["documents"], quote["quote_types"], quote["has_auto"]), ([], [], False))
+
+        self.repo.update("q1", {"documents": ["output/q1.pdf"], "quote_types": ["HOME"]})
+        quote = self.repo.get("q1")
+        self.assertEqual((quote["documents"], quote["quote_types"]), (["output/q1.pdf"], ["HOME"]))
+        self.assertEqual(self.repo.get("q2")["quote_types"], ["home", "SPECIALTY"])
+        self.assertEqual(self.repo.table.count_rows(), 2)
+
+    def test_indexes_built_after_first_write(self):
+        """Test that a table empty at startup is indexed by its first write."""
+        empty = QuoteRepository("fresh")
+        self.db.create_table("fresh", schema=QUOTES_SCHEMA)
+        self.assertEqual(empty.ensure_indexes(), [])
+        empty.add([{"id": "q9", "agent_id": "a1", "quote_types": ["HOME"]}])
+        indexed = set()
+        for index in self.db.open_table("fresh").list_indices():
+            indexed.update(index.columns)
+        self.assertTrue({"id", "agent_id", "has_home"} <= indexed)
+
+    def test_indexed_quote_type_filter(self):
+        """Test that the type filter uses the flag columns and their bitmap indexes."""
+        indexed = self.repo.ensure_indexes()
+        self.assertIn("has_auto", indexed)
+        self.assertIn("quote_types", indexed)
+        page, _ = self.repo.list_page("a1", limit=10, fields=("id",), quote_type="HOME")
+        self.assertEqual(page, [{"id": "q2"}])
+
+if __name__ == '__main__':
+    unittest.main()
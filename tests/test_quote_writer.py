@@ -0,0 +1,71 @@
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+import lancedb
+from app.database import QUOTES_SCHEMA
+from app.utils.quote_repository import QuoteRepository
+from app.utils.quote_writer import QuoteWriteBuffer
+
+class TestQuoteWriteBuffer(unittest.TestCase):
+    def setUp(self):
+        self.db_dir = tempfile.mkdtemp()
+        self.db = lancedb.connect(self.db_dir)
+        self.db.create_table("quotes", schema=QUOTES_SCHEMA)
+        patcher = patch("app.utils.quote_repository.get_table", side_effect=self.db.open_table)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.writer = QuoteWriteBuffer(QuoteRepository(), max_batch=64, max_delay=0.05)
+        self.addCleanup(self.writer.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.db_dir)
+
+    def quote(self, i):
+        return {"id": f"q{i}", "agent_id": "a1", "quote_types": ["AUTO"], "created_at": "2024-01-01T00:00:00"}
+
+    def test_concurrent_inserts_share_commits(self):
+        """Test that concurrent submissions are committed as a few batches."""
+        threads = [threading.Thread(target=self.writer.write, args=(self.quote(i),)) for i in range(100)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        table = self.db.open_table("quotes")
+        self.assertEqual(table.count_rows(), 100)
+        stats = self.writer.stats()
+        self.assertEqual(stats["written"], 100)
+        self.assertLess(stats["batches"], 10)
+        self.assertEqual(table.stats()["fragment_stats"]["num_fragments"], stats["batches"])
+        self.assertTrue(table.search().where("id = 'q7'").to_list()[0]["has_auto"])
+
+    def test_batch_size_limit(self):
+        """Test that no commit exceeds max_batch records."""
+        self.writer.max_batch = 10
+        futures = [self.writer.submit(self.quote(i)) for i in range(35)]
+        for future in futures:
+            future.result(timeout=5)
+        self.assertLessEqual(self.writer.stats()["largest_batch"], 10)
+        self.assertGreaterEqual(self.writer.stats()["batches"], 4)
+
+    def test_failed_record_does_not_fail_its_batch(self):
+        """Test that a bad record only fails its own caller."""
+        good = self.writer.submit(self.quote(1))
+        bad = self.writer.submit({**self.quote(2), "created_at": "not a date"})
+        good.result(timeout=5)
+        with self.assertRaises(Exception):
+            bad.result(timeout=5)
+        self.assertEqual(self.db.open_table("quotes").count_rows(), 1)
+        self.assertEqual(self.writer.stats()["failed"], 1)
+
+    def test_stop_drains_queue(self):
+        """Test that queued records are committed on stop."""
+        futures = [self.writer.submit(self.quote(i)) for i in range(5)]
+        self.writer.stop()
+        self.assertTrue(all(future.done() for future in futures))
+        self.assertEqual(self.db.open_table("quotes").count_rows(), 5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import shutil
+import tempfile
+import unittest
+from datetime import timedelta
+from unittest.mock import patch
+import lancedb
+from app.database import REFRESH_TOKENS_SCHEMA
+from app.utils.refresh_tokens import RefreshTokenStore, InvalidRefreshToken
+
+class TestRefreshTokenStore(unittest.TestCase):
+    def setUp(self):
+        self.db_dir = tempfile.mkdtemp()
+        self.db = lancedb.connect(self.db_dir)
+        self.db.create_table("refresh_tokens", schema=REFRESH_TOKENS_SCHEMA)
+        patcher = patch("app.utils.refresh_tokens.get_table", side_effect=lambda name, schema=None: self.db.open_table(name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.store = RefreshTokenStore("test-secret")
+
+    def tearDown(self):
+        shutil.rmtree(self.db_dir)
+
+    def test_only_hash_is_stored(self):
+        """Test that the plaintext token never reaches the table."""
+        token = self.store.issue("a@example.com")
+        rows = self.db.open_table("refresh_tokens").search().to_list()
+        self.assertEqual(len(rows), 1)
+        self.assertNotIn(token, rows[0].values())
+
+    def test_rotation(self):
+        """Test that a token can be used once and yields a working successor."""
+        token = self.store.issue("a@example.com")
+        rotated = self.store.rotate(token)
+        self.assertEqual(rotated["agent_email"], "a@example.com")
+        self.assertNotEqual(rotated["refresh_token"], token)
+        self.assertEqual(self.store.rotate(rotated["refresh_token"])["agent_email"], "a@example.com")
+
+    def test_reuse_revokes_family(self):
+        """Test that replaying a rotated token invalidates its successor too."""
+        token = self.store.issue("a@example.com")
+        successor = self.store.rotate(token)["refresh_token"]
+        with self.assertRaises(InvalidRefreshToken):
+            self.store.rotate(token)
+        with self.assertRaises(InvalidRefreshToken):
+            self.store.rotate(successor)
+
+    def test_expired_and_unknown(self):
+        """Test that expired or unknown tokens are rejected."""
+        store = RefreshTokenStore("test-secret", ttl=timedelta(seconds=-1))
+        with self.assertRaises(InvalidRefreshToken):
+            store.rotate(store.issue("a@example.com"))
+        with self.assertRaises(InvalidRefreshToken):
+            self.store.rotate("not-a-token")
+        self.assertEqual(store.purge_expired(), 1)
+
+    def test_expiry_is_a_time_comparison(self):
+        """Test that expiry uses timestamp columns and purges only expired rows."""
+        self.assertEqual(str(REFRESH_TOKENS_SCHEMA.field("expires_at").type), "timestamp[us, tz=UTC]")
+        expired = RefreshTokenStore("test-secret", ttl=timedelta(seconds=-1))
+        expired.issue("a@example.com")
+        live = self.store.issue("a@example.com")
+        self.assertEqual(self.store.purge_expired(), 1)
+        self.assertEqual(self.store.rotate(live)["agent_email"], "a@example.com")
+        revoked = [row for row in self.db.open_table("refresh_tokens").search().to_list() if row["revoked"]]
+        self.assertIsNotNone(revoked[0]["revoked_at"])
+
+    def test_token_index_built_on_first_issue(self):
+        """Test that a fresh install gets the token_hash index without a restart."""
+        self.store.ensure_indexes()
+        self.assertEqual(self.db.open_table("refresh_tokens").list_indices(), [])
+        self.store.issue("a@example.com")
+        columns = [index.columns for index in self.db.open_table("refresh_tokens").list_indices()]
+        self.assertIn(["token_hash"], columns)
+
+    def test_revoke_agent(self):
+        """Test that disabling an agent revokes its refresh tokens."""
+        token = self.store.issue("a@example.com")
+        self.store.revoke_agent("a@example.com")
+        with self.assertRaises(InvalidRefreshToken):
+            self.store.rotate(token)
+
+if __name__ == "__main__":
+    unittest.main()
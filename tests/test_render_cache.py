@@ -0,0 +1,66 @@
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+from app.utils.render_cache import RenderCache
+
+class TestRenderCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.template = self.temp_dir / "auto_quote_template.docx"
+        self.template.write_bytes(b"template")
+        self.cache = RenderCache(max_bytes=100)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _pair(self, name, size=20):
+        docx_path = self.temp_dir / f"{name}.docx"
+        pdf_path = self.temp_dir / f"{name}.pdf"
+        docx_path.write_bytes(b"d" * size)
+        pdf_path.write_bytes(b"p" * size)
+        return str(docx_path), str(pdf_path)
+
+    def test_key_is_content_addressed(self):
+        """Test that keys depend on template, values and renderer but not dict order."""
+        key = self.cache.key(self.template, {"a": "1", "b": 2}, "docx:1")
+        self.assertEqual(key, self.cache.key(self.template, {"b": "2", "a": "1"}, "docx:1"))
+        self.assertNotEqual(key, self.cache.key(self.template, {"a": "1", "b": "3"}, "docx:1"))
+        self.assertNotEqual(key, self.cache.key(self.template, {"a": "1", "b": 2}, "xml:1"))
+
+    def test_key_ignores_values_the_template_does_not_use(self):
+        """Test that only the template's placeholders feed the key."""
+        key = self.cache.key(self.template, {"a": "1", "created_at": "12:00:00.1"}, "docx:1", placeholders=["a"])
+        self.assertEqual(key, self.cache.key(self.template, {"a": "1", "created_at": "12:00:00.2"}, "docx:1", placeholders=["a"]))
+        self.assertNotEqual(key, self.cache.key(self.template, {"a": "2"}, "docx:1", placeholders=["a"]))
+        self.assertNotEqual(key, self.cache.key(self.template, {}, "docx:1", placeholders=["a"]))
+
+    def test_hit_returns_existing_paths(self):
+        """Test that a stored pair is returned and counted as a hit."""
+        pair = self._pair("quote")
+        self.assertIsNone(self.cache.get("k"))
+        self.cache.put("k", *pair)
+        self.assertEqual(self.cache.get("k"), pair)
+        self.assertEqual(self.cache.stats()["hits"], 1)
+        self.assertEqual(self.cache.stats()["misses"], 1)
+
+    def test_missing_files_are_misses(self):
+        """Test that entries whose files were cleaned up are dropped."""
+        pair = self._pair("quote")
+        self.cache.put("k", *pair)
+        Path(pair[1]).unlink()
+        self.assertIsNone(self.cache.get("k"))
+        self.assertEqual(self.cache.stats()["entries"], 0)
+
+    def test_size_based_eviction(self):
+        """Test that least recently used entries are evicted over the byte budget."""
+        self.cache.put("a", *self._pair("a"))
+        self.cache.put("b", *self._pair("b"))
+        self.cache.get("a")
+        self.cache.put("c", *self._pair("c"))
+        self.assertIsNone(self.cache.get("b"))
+        self.assertIsNotNone(self.cache.get("a"))
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
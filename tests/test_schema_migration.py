@@ -0,0 +1,80 @@
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+import lancedb
+import pyarrow as pa
+from app.database import QUOTES_SCHEMA, AGENTS_SCHEMA, conform_records
+from app.utils.schema_migration import migrate_table
+
+class TestConformRecords(unittest.TestCase):
+    def test_types_are_coerced(self):
+        """Test ISO timestamps, dictionary labels and nested structs."""
+        table = conform_records([{
+            "id": "q1",
+            "status": "pending",
+            "created_at": "2024-03-01T12:30:00",
+            "updated_at": "2024-03-01T12:30:00+02:00",
+            "personal_info": {"first_name": "Jane", "unexpected": "dropped"},
+            "vehicles": [{"make": "Volvo", "gap_insurance": True}],
+            "extra_column": "dropped"
+        }], QUOTES_SCHEMA)
+        self.assertTrue(table.schema.equals(QUOTES_SCHEMA))
+        row = table.to_pylist()[0]
+        self.assertEqual(row["created_at"], datetime(2024, 3, 1, 12, 30))
+        self.assertEqual(row["updated_at"], datetime(2024, 3, 1, 10, 30))
+        self.assertEqual(row["personal_info"]["first_name"], "Jane")
+        self.assertNotIn("unexpected", row["personal_info"])
+        self.assertEqual(row["vehicles"][0]["make"], "Volvo")
+        self.assertIsNone(row["home_details"])
+
+    def test_legacy_string_columns_accept_datetimes(self):
+        """Test that writes into pre-migration string columns still work."""
+        legacy = pa.schema([pa.field("id", pa.string()), pa.field("created_at", pa.string())])
+        row = conform_records([{"id": "q1", "created_at": datetime(2024, 1, 1)}], legacy).to_pylist()[0]
+        self.assertEqual(row["created_at"], "2024-01-01T00:00:00")
+
+class TestSchemaMigration(unittest.TestCase):
+    def setUp(self):
+        self.db_dir = tempfile.mkdtemp()
+        self.db = lancedb.connect(self.db_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.db_dir)
+
+    def test_migrates_inferred_table(self):
+        """Test that an inferred string-typed table is rewritten to the declared schema."""
+        self.db.create_table("agents", data=[
+            {"id": "1", "email": "a@example.com", "name": "Agent A", "is_active": True,
+             "permissions": ["basic"], "created_at": "2024-01-01T00:00:00", "last_login": "", "role": "agent"}
+        ])
+        dry = migrate_table(self.db, "agents", AGENTS_SCHEMA, dry_run=True)
+        self.assertFalse(dry["migrated"])
+        self.assertFalse(self.db.open_table("agents").schema.equals(AGENTS_SCHEMA))
+
+        report = migrate_table(self.db, "agents", AGENTS_SCHEMA)
+        self.assertTrue(report["migrated"])
+        self.assertEqual(report["dropped_columns"], ["name", "role"])
+        table = self.db.open_table("agents")
+        self.assertTrue(table.schema.equals(AGENTS_SCHEMA))
+        row = table.to_arrow().to_pylist()[0]
+        self.assertEqual(row["full_name"], "Agent A")
+        self.assertEqual(row["created_at"], datetime(2024, 1, 1))
+        self.assertIsNone(row["last_login"])
+
+        # A second run finds nothing to do
+        self.assertFalse(migrate_table(self.db, "agents", AGENTS_SCHEMA)["migrated"])
+
+    def test_timestamp_range_filter(self):
+        """Test that migrated timestamps can be filtered with typed literals."""
+        self.db.create_table("quotes", data=[
+            {"id": "q1", "status": "pending", "created_at": "2024-01-01T00:00:00"},
+            {"id": "q2", "status": "completed", "created_at": "2024-02-01T00:00:00"}
+        ])
+        migrate_table(self.db, "quotes", QUOTES_SCHEMA)
+        table = self.db.open_table("quotes")
+        self.assertEqual(table.count_rows("created_at >= timestamp '2024-01-15T00:00:00'"), 1)
+        self.assertEqual(table.count_rows("status = 'completed'"), 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+import os
+import tempfile
+import shutil
+from pathlib import Path
+from docx import Document
+from app.utils.template_cache import TemplateCache
+
+class TestTemplateCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.template_path = self.temp_dir / "auto_quote_template.docx"
+        doc = Document()
+        doc.add_paragraph("Client: {{client_name}} ({{client_email}})")
+        doc.add_paragraph("No placeholders here")
+        table = doc.add_table(rows=1, cols=2)
+        table.cell(0, 1).text = "{{current_carrier}}"
+        doc.save(str(self.template_path))
+        self.cache = TemplateCache()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _render_and_reload(self, replacements):
+        output_path = self.temp_dir / "output.docx"
+        self.cache.render(self.template_path, replacements).save(str(output_path))
+        return Document(str(output_path))
+
+    def test_records_placeholder_slots(self):
+        """Test that compilation finds placeholders in paragraphs and tables."""
+        compiled = self.cache.get(self.template_path)
+        self.assertEqual(len(compiled.slots), 2)
+        self.assertEqual(compiled.placeholders, ["client_name", "client_email", "current_carrier"])
+
+    def test_render_fills_slots(self):
+        """Test that rendering fills known placeholders and leaves unknown ones."""
+        doc = self._render_and_reload({"client_name": "John Doe", "current_carrier": "AAA"})
+        self.assertEqual(doc.paragraphs[0].text, "Client: John Doe ({{client_email}})")
+        self.assertEqual(doc.tables[0].cell(0, 1).text, "AAA")
+
+    def test_render_fills_nested_table_slots(self):
+        """Test that slots are found by element position, including nested tables."""
+        doc = Document(str(self.template_path))
+        doc.tables[0].cell(0, 0).add_table(rows=1, cols=1).cell(0, 0).text = "{{vin}}"
+        doc.save(str(self.template_path))
+        self.assertIn("vin", self.cache.get(self.template_path).placeholders)
+        doc = self._render_and_reload({"vin": "1HGCM", "current_carrier": "AAA"})
+        self.assertEqual(doc.tables[0].cell(0, 0).tables[0].cell(0, 0).text, "1HGCM")
+        self.assertEqual(doc.tables[0].cell(0, 1).text, "AAA")
+
+    def test_renders_do_not_share_state(self):
+        """Test that each render starts from the unfilled template."""
+        self._render_and_reload({"client_name": "First"})
+        doc = self._render_and_reload({"client_name": "Second"})
+        self.assertIn("Second", doc.paragraphs[0].text)
+
+    def test_recompiles_on_mtime_change(self):
+        """Test that an edited template is recompiled."""
+        compiled = self.cache.get(self.template_path)
+        self.assertIs(self.cache.get(self.template_path), compiled)
+        stat = self.template_path.stat()
+        os.utime(self.template_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertIsNot(self.cache.get(self.template_path), compiled)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import asyncio
+import time
+import unittest
+from unittest.mock import patch
+from jose import JWTError
+from app.utils import auth
+from app.utils.token_cache import TokenCache, RevocationList
+
+class TestTokenCache(unittest.TestCase):
+    def test_cached_until_exp(self):
+        """Test that claims are served from cache only until exp."""
+        cache = TokenCache()
+        cache.set("h.p.sig", {"sub": "a@example.com", "exp": time.time() + 60})
+        self.assertEqual(cache.get("h.p.sig")["sub"], "a@example.com")
+        cache.set("h.p.old", {"sub": "a@example.com", "exp": time.time() - 1})
+        self.assertIsNone(cache.get("h.p.old"))
+
+    def test_signature_reuse_with_other_payload_misses(self):
+        """Test that a cached signature only matches its own token."""
+        cache = TokenCache()
+        cache.set("h.p.sig", {"sub": "a@example.com", "exp": time.time() + 60})
+        self.assertIsNone(cache.get("h.forged.sig"))
+
+    def test_lru_bound(self):
+        """Test that the cache never grows past maxsize."""
+        cache = TokenCache(maxsize=2)
+        for name in ("a", "b", "c"):
+            cache.set(f"h.p.{name}", {"exp": time.time() + 60})
+        self.assertIsNone(cache.get("h.p.a"))
+        self.assertEqual(cache.stats()["size"], 2)
+
+class TestRevocationList(unittest.TestCase):
+    def test_subject_revocation_covers_earlier_tokens(self):
+        """Test that revoking an agent rejects tokens issued before, not after."""
+        revocations = RevocationList()
+        revocations.revoke_subject("a@example.com", revoked_at=1000)
+        self.assertTrue(revocations.is_revoked({"sub": "a@example.com", "iat": 999}))
+        self.assertFalse(revocations.is_revoked({"sub": "a@example.com", "iat": 1001}))
+        self.assertFalse(revocations.is_revoked({"sub": "b@example.com", "iat": 999}))
+
+    def test_token_revocation(self):
+        """Test that a single jti can be revoked."""
+        revocations = RevocationList()
+        revocations.revoke_token("abc", time.time() + 60)
+        self.assertTrue(revocations.is_revoked({"sub": "a@example.com", "jti": "abc"}))
+
+class TestDecodeToken(unittest.TestCase):
+    def setUp(self):
+        patchers = [
+            patch.object(auth, "token_cache", TokenCache()),
+            patch.object(auth, "revocation_list", RevocationList()),
+            patch.object(auth, "EMBED_AGENT_CLAIMS", True)
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.agent = {"id": "a1", "email": "a@example.com", "permissions": ["basic"]}
+
+    def test_second_decode_is_cached(self):
+        """Test that a repeat presentation skips verification."""
+        token = auth.create_access_token(auth.access_token_claims(self.agent))
+        auth.decode_token(token)
+        with patch.object(auth.jwt, "decode", side_effect=AssertionError("decoded twice")):
+            self.assertEqual(auth.decode_token(token)["sub"], "a@example.com")
+
+    def test_embedded_claims_skip_lookup(self):
+        """Test that tokens carrying agent claims need no agent lookup."""
+        token = auth.create_access_token(auth.access_token_claims(self.agent))
+        with patch.object(auth, "get_agent_by_email_async", side_effect=AssertionError("looked up")):
+            agent = asyncio.run(auth.get_current_agent(token))
+        self.assertEqual(agent, {"id": "a1", "email": "a@example.com", "permissions": ["basic"]})
+
+    def test_revoked_agent_rejected_from_cache(self):
+        """Test that revocation applies even to cached tokens."""
+        token = auth.create_access_token(auth.access_token_claims(self.agent))
+        auth.decode_token(token)
+        with patch.object(auth, "agent_cache"):
+            auth.revoke_agent("a@example.com")
+        with self.assertRaises(JWTError):
+            auth.decode_token(token)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import asyncio
+import hashlib
+import io
+import tempfile
+import shutil
+from pathlib import Path
+from fastapi import FastAPI, File, HTTPException, UploadFile
+from fastapi.testclient import TestClient
+from app.utils.uploads import save_upload, UploadLimitMiddleware
+
+class TestUploads(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.content = b"x" * 2500
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _save(self, filename, content, **kwargs):
+        upload = UploadFile(file=io.BytesIO(content), filename=filename)
+        return asyncio.run(save_upload(upload, self.temp_dir, chunk_size=1000, **kwargs))
+
+    def test_streams_to_disk_with_hash(self):
+        """Test that uploads are written in full with their SHA-256."""
+        saved = self._save("license.pdf", self.content)
+        self.assertEqual(Path(saved["path"]).read_bytes(), self.content)
+        self.assertEqual(saved["sha256"], hashlib.sha256(self.content).hexdigest())
+        self.assertEqual(saved["size"], len(self.content))
+        self.assertFalse(saved["duplicate"])
+
+    def test_rejects_oversized_upload(self):
+        """Test that oversized uploads fail with 413 and leave no files behind."""
+        with self.assertRaises(HTTPException) as context:
+            self._save("big.pdf", self.content, max_bytes=2000)
+        self.assertEqual(context.exception.status_code, 413)
+        self.assertEqual(list(self.temp_dir.iterdir()), [])
+
+    def test_deduplicates_identical_content(self):
+        """Test that content the lookup already knows is not stored twice."""
+        first = self._save("license.pdf", self.content)
+        stored = {first["sha256"]: first["path"]}
+
+        async def find_existing(sha256):
+            return stored.get(sha256)
+
+        second = self._save("license-copy.pdf", self.content, find_existing=find_existing)
+        self.assertTrue(second["duplicate"])
+        self.assertEqual(second["path"], first["path"])
+        self.assertEqual(second["filename"], "license-copy.pdf")
+        self.assertEqual(len(list(self.temp_dir.iterdir())), 1)
+
+    def test_same_name_does_not_overwrite(self):
+        """Test that a different file with a taken name is stored under a new name."""
+        first = self._save("license.pdf", self.content)
+        second = self._save("license.pdf", b"y" * 10)
+        self.assertEqual(Path(first["path"]).read_bytes(), self.content)
+        self.assertEqual(Path(second["path"]).name, "license (1).pdf")
+        self.assertEqual(second["filename"], "license (1).pdf")
+        self.assertEqual(Path(second["path"]).read_bytes(), b"y" * 10)
+
+    def test_middleware_rejects_by_content_length(self):
+        """Test that oversized or unsized multipart bodies are refused before parsing."""
+        app = FastAPI()
+
+        @app.post("/upload")
+        async def upload(file: UploadFile = File(...)):
+            return {"name": file.filename}
+
+        client = TestClient(UploadLimitMiddleware(app, max_bytes=1000))
+        self.assertEqual(client.post("/upload", files={"file": ("a.pdf", b"x" * 100)}).status_code, 200)
+        self.assertEqual(client.post("/upload", files={"file": ("a.pdf", b"x" * 5000)}).status_code, 413)
+
+        def chunked():
+            yield b"--b\r\n"
+
+        response = client.post("/upload", content=chunked(), headers={"Content-Type": "multipart/form-data; boundary=b"})
+        self.assertEqual(response.status_code, 411)
+
+    def test_strips_directories_from_filename(self):
+        """Test that client-supplied paths cannot escape the upload directory."""
+        saved = self._save("../../etc/passwd", self.content)
+        self.assertEqual(Path(saved["path"]).parent, self.temp_dir)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+import tempfile
+import shutil
+import zipfile
+from pathlib import Path
+from docx import Document
+from app.utils.template_cache import TemplateCache
+from app.utils.xml_renderer import render_docx, template_placeholders
+
+class TestXMLRenderer(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.template_path = self.temp_dir / "home_quote_template.docx"
+        doc = Document()
+        doc.add_paragraph("Client: {{client_name}}")
+        paragraph = doc.add_paragraph("Built ")
+        paragraph.add_run("{{year_")
+        paragraph.add_run("built}}").bold = True
+        table = doc.add_table(rows=1, cols=2)
+        table.cell(0, 0).text = "Roof"
+        table.cell(0, 1).text = "{{roof_type}} / {{unknown}}"
+        doc.sections[0].header.paragraphs[0].text = "Quote for {{client_name}}"
+        doc.save(str(self.template_path))
+        self.replacements = {"client_name": "John Doe", "year_built": "1990", "roof_type": "Asphalt"}
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_template_placeholders(self):
+        """Test that split and header placeholders are listed once each."""
+        self.assertEqual(
+            sorted(template_placeholders(self.template_path)),
+            ["client_name", "roof_type", "unknown", "year_built"]
+        )
+
+    def test_matches_python_docx_renderer(self):
+        """Test that the XML renderer produces the same body text as python-docx."""
+        xml_path = self.temp_dir / "xml.docx"
+        docx_path = self.temp_dir / "docx.docx"
+        render_docx(self.template_path, xml_path, self.replacements)
+        TemplateCache().render(self.template_path, self.replacements).save(str(docx_path))
+
+        xml_doc = Document(str(xml_path))
+        docx_doc = Document(str(docx_path))
+        self.assertEqual([p.text for p in xml_doc.paragraphs], [p.text for p in docx_doc.paragraphs])
+        self.assertEqual(
+            [c.text for c in xml_doc.tables[0].rows[0].cells],
+            [c.text for c in docx_doc.tables[0].rows[0].cells]
+        )
+        self.assertEqual(xml_doc.paragraphs[1].text, "Built 1990")
+        self.assertEqual(xml_doc.tables[0].cell(0, 1).text, "Asphalt / {{unknown}}")
+
+    def test_fills_headers(self):
+        """Test that header parts are filled."""
+        output_path = self.temp_dir / "xml.docx"
+        render_docx(self.template_path, output_path, self.replacements)
+        header = Document(str(output_path)).sections[0].header
+        self.assertEqual(header.paragraphs[0].text, "Quote for John Doe")
+
+    def test_copies_other_parts_unchanged(self):
+        """Test that parts without text are copied byte-for-byte."""
+        output_path = self.temp_dir / "xml.docx"
+        render_docx(self.template_path, output_path, self.replacements)
+        with zipfile.ZipFile(self.template_path) as source, zipfile.ZipFile(output_path) as target:
+            self.assertEqual(source.namelist(), target.namelist())
+            self.assertEqual(source.read("word/styles.xml"), target.read("word/styles.xml"))
+
+if __name__ == '__main__':
+    unittest.main()